@@ -0,0 +1,43 @@
+"""co-ocorrências e recomendações de produtos
+
+Revision ID: 0a6d2c8e4b17
+Revises: f7a1c3e9d452
+Create Date: 2026-10-18 16:12:38.115402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0a6d2c8e4b17'
+down_revision: Union[str, None] = 'f7a1c3e9d452'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_cooccurrences',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('other_product_id', sa.Integer(), nullable=False),
+    sa.Column('orders', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['other_product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'other_product_id')
+    )
+    op.create_table('product_recommendations',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=False),
+    sa.Column('recommended_product_id', sa.Integer(), nullable=False),
+    sa.Column('score', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['recommended_product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'rank')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('product_recommendations')
+    op.drop_table('product_cooccurrences')
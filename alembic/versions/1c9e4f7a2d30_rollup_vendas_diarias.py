@@ -0,0 +1,53 @@
+"""rollup diário de vendas por produto
+
+Revision ID: 1c9e4f7a2d30
+Revises: 0a6d2c8e4b17
+Create Date: 2026-10-18 16:48:02.637190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c9e4f7a2d30'
+down_revision: Union[str, None] = '0a6d2c8e4b17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('product_sales_daily',
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('category_id', sa.Integer(), nullable=False),
+    sa.Column('admin_id', sa.Integer(), nullable=False),
+    sa.Column('units', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.DECIMAL(precision=12, scale=2), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('product_id', 'day')
+    )
+    op.create_index('ix_product_sales_daily_category_day', 'product_sales_daily', ['category_id', 'day'], unique=False)
+    op.create_index('ix_product_sales_daily_admin_day', 'product_sales_daily', ['admin_id', 'day'], unique=False)
+    # Carga inicial a partir dos pedidos existentes que contam como venda
+    op.execute(
+        """
+        INSERT INTO product_sales_daily (product_id, day, category_id, admin_id, units, revenue)
+        SELECT oi.product_id, CAST(o.order_date AS DATE), p.category_id, c.user_id,
+               SUM(oi.quantity), SUM(oi.quantity * oi.unit_price)
+        FROM order_items oi
+        JOIN orders o ON o.id = oi.order_id
+        JOIN products p ON p.id = oi.product_id
+        JOIN categories c ON c.id = p.category_id
+        WHERE o.status NOT IN ('CANCELLED', 'FAILED', 'REFUNDED')
+        GROUP BY oi.product_id, CAST(o.order_date AS DATE), p.category_id, c.user_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_sales_daily_admin_day', table_name='product_sales_daily')
+    op.drop_index('ix_product_sales_daily_category_day', table_name='product_sales_daily')
+    op.drop_table('product_sales_daily')
@@ -0,0 +1,45 @@
+"""item único por produto no carrinho
+
+Revision ID: 4f1a7d3c9e26
+Revises: 3e8c6f2a0b95
+Create Date: 2026-10-18 18:02:37.841265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4f1a7d3c9e26'
+down_revision: Union[str, None] = '3e8c6f2a0b95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Junta linhas repetidas do mesmo produto no mesmo carrinho na mais antiga
+    op.execute(
+        """
+        UPDATE cart_items SET quantity = (
+            SELECT SUM(dup.quantity) FROM cart_items dup
+            WHERE dup.cart_id = cart_items.cart_id AND dup.product_id = cart_items.product_id
+        )
+        WHERE id IN (
+            SELECT MIN(id) FROM cart_items GROUP BY cart_id, product_id HAVING COUNT(*) > 1
+        )
+        """
+    )
+    op.execute(
+        """
+        DELETE FROM cart_items WHERE id NOT IN (
+            SELECT MIN(id) FROM cart_items GROUP BY cart_id, product_id
+        )
+        """
+    )
+    op.create_unique_constraint('_cart_product_uc', 'cart_items', ['cart_id', 'product_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('_cart_product_uc', 'cart_items', type_='unique')
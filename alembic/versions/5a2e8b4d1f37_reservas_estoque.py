@@ -0,0 +1,40 @@
+"""reservas de estoque dos carrinhos
+
+Revision ID: 5a2e8b4d1f37
+Revises: 4f1a7d3c9e26
+Create Date: 2026-10-18 18:39:52.104633
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a2e8b4d1f37'
+down_revision: Union[str, None] = '4f1a7d3c9e26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stock_reservations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cart_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('quantity', sa.Integer(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['cart_id'], ['carts.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cart_id', 'product_id', name='_cart_product_reservation_uc')
+    )
+    op.create_index('ix_stock_reservations_product_expires', 'stock_reservations', ['product_id', 'expires_at'], unique=False, postgresql_include=['quantity', 'cart_id'])
+    op.create_index('ix_stock_reservations_expires_at', 'stock_reservations', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_stock_reservations_expires_at', table_name='stock_reservations')
+    op.drop_index('ix_stock_reservations_product_expires', table_name='stock_reservations')
+    op.drop_table('stock_reservations')
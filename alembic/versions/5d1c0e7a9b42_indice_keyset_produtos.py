@@ -0,0 +1,26 @@
+"""indice keyset para listagem de produtos
+
+Revision ID: 5d1c0e7a9b42
+Revises: 3391632d165b
+Create Date: 2026-10-18 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d1c0e7a9b42'
+down_revision: Union[str, None] = '3391632d165b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_price_id', 'products', ['price', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_price_id', table_name='products')
@@ -0,0 +1,40 @@
+"""busca textual de produtos
+
+Revision ID: 8e3f27b1c6d0
+Revises: 5d1c0e7a9b42
+Create Date: 2026-10-18 10:03:47.118932
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e3f27b1c6d0'
+down_revision: Union[str, None] = '5d1c0e7a9b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "ALTER TABLE products ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')"
+        ") STORED"
+    )
+    op.create_index(
+        'ix_products_search_vector',
+        'products',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_search_vector', table_name='products')
+    op.drop_column('products', 'search_vector')
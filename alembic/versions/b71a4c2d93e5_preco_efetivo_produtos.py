@@ -0,0 +1,45 @@
+"""preco efetivo materializado nos produtos
+
+Revision ID: b71a4c2d93e5
+Revises: 8e3f27b1c6d0
+Create Date: 2026-10-18 11:26:05.730214
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b71a4c2d93e5'
+down_revision: Union[str, None] = '8e3f27b1c6d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('effective_price', sa.DECIMAL(precision=10, scale=2), nullable=True))
+    op.execute("UPDATE products SET effective_price = price")
+    # Aplica os descontos vigentes (datas gravadas em UTC sem fuso)
+    op.execute(
+        """
+        UPDATE products AS p
+        SET effective_price = GREATEST(
+            ROUND(p.price - p.price * LEAST(d.total, 100) / 100, 2), 0
+        )
+        FROM (
+            SELECT product_id, SUM(discount_percentage) AS total
+            FROM discounts
+            WHERE start_date <= timezone('utc', now())
+              AND end_date > timezone('utc', now())
+            GROUP BY product_id
+        ) AS d
+        WHERE d.product_id = p.id
+        """
+    )
+    op.alter_column('products', 'effective_price', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('products', 'effective_price')
@@ -0,0 +1,32 @@
+"""updated_at em produtos e categorias
+
+Revision ID: c4e96d0f1a27
+Revises: b71a4c2d93e5
+Create Date: 2026-10-18 13:40:19.552806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e96d0f1a27'
+down_revision: Union[str, None] = 'b71a4c2d93e5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('products', sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text("timezone('utc', now())")))
+    op.create_index(op.f('ix_products_updated_at'), 'products', ['updated_at'], unique=False)
+    op.add_column('categories', sa.Column('updated_at', sa.DateTime(), nullable=False, server_default=sa.text("timezone('utc', now())")))
+    op.create_index(op.f('ix_categories_updated_at'), 'categories', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_categories_updated_at'), table_name='categories')
+    op.drop_column('categories', 'updated_at')
+    op.drop_index(op.f('ix_products_updated_at'), table_name='products')
+    op.drop_column('products', 'updated_at')
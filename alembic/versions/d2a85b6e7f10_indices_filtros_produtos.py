@@ -0,0 +1,28 @@
+"""indices para filtros da listagem de produtos
+
+Revision ID: d2a85b6e7f10
+Revises: c4e96d0f1a27
+Create Date: 2026-10-18 14:52:08.913406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a85b6e7f10'
+down_revision: Union[str, None] = 'c4e96d0f1a27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_products_category_price', 'products', ['category_id', 'price'], unique=False)
+    op.create_index('ix_products_stock', 'products', ['stock'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_products_stock', table_name='products')
+    op.drop_index('ix_products_category_price', table_name='products')
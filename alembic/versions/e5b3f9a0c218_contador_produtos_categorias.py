@@ -0,0 +1,36 @@
+"""product_count desnormalizado em categorias
+
+Revision ID: e5b3f9a0c218
+Revises: d2a85b6e7f10
+Create Date: 2026-10-18 15:02:44.318270
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b3f9a0c218'
+down_revision: Union[str, None] = 'd2a85b6e7f10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('categories', sa.Column('product_count', sa.Integer(), nullable=False, server_default='0'))
+    op.execute(
+        """
+        UPDATE categories
+        SET product_count = (
+            SELECT count(*) FROM products WHERE products.category_id = categories.id
+        )
+        """
+    )
+    op.create_index(op.f('ix_categories_user_id'), 'categories', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_categories_user_id'), table_name='categories')
+    op.drop_column('categories', 'product_count')
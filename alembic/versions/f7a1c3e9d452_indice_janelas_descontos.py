@@ -0,0 +1,30 @@
+"""índices das janelas de desconto
+
+Revision ID: f7a1c3e9d452
+Revises: e5b3f9a0c218
+Create Date: 2026-10-18 15:31:07.904512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a1c3e9d452'
+down_revision: Union[str, None] = 'e5b3f9a0c218'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_discounts_product_window', 'discounts', ['product_id', 'start_date', 'end_date'], unique=False)
+    op.create_index(op.f('ix_discounts_start_date'), 'discounts', ['start_date'], unique=False)
+    op.create_index(op.f('ix_discounts_end_date'), 'discounts', ['end_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_discounts_end_date'), table_name='discounts')
+    op.drop_index(op.f('ix_discounts_start_date'), table_name='discounts')
+    op.drop_index('ix_discounts_product_window', table_name='discounts')
@@ -8,6 +8,8 @@ from app.controllers.coupon_controller import router as coupon_router
 from app.controllers.product_controller import router as product_router
 from app.controllers.cart_controller import router as cart_router
 from app.controllers.order_controller import router as order_router
+from app.controllers.review_controller import router as review_router
+from app.controllers.favorite_controller import router as favorite_router
 from app.router.stripe_routes import router as stripe_router
 
 api_router = APIRouter()
@@ -21,4 +23,6 @@ api_router.include_router(discount_router, prefix="/discounts", tags=["Discounts
 api_router.include_router(coupon_router, prefix="/coupons", tags=["Coupons"])
 api_router.include_router(cart_router, prefix="/cart", tags=["Cart"])
 api_router.include_router(order_router, prefix="/orders", tags=["Orders"])
+api_router.include_router(review_router, prefix="/reviews", tags=["Reviews"])
+api_router.include_router(favorite_router, prefix="/favorites", tags=["Favorites"])
 api_router.include_router(stripe_router)
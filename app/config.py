@@ -7,5 +7,23 @@ DATABASE_URL = os.getenv("DATABASE_URL")
 SECRET_KEY = os.getenv("SECRET_KEY", "default_secret_key_change_in_production")
 CRYPT_ALGORITHM = os.getenv("CRYPT_ALGORITHM", default="HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", default=60))
-
-
+CATALOG_CACHE_TTL = int(os.getenv("CATALOG_CACHE_TTL", default=60))
+CATALOG_CACHE_MAXSIZE = int(os.getenv("CATALOG_CACHE_MAXSIZE", default=2048))
+DISCOUNT_SCHEDULER_MAX_SLEEP_SECONDS = int(os.getenv("DISCOUNT_SCHEDULER_MAX_SLEEP_SECONDS", default=300))
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", default="false").lower() in ("1", "true", "yes")
+CATALOG_SNAPSHOT_ENABLED = os.getenv("CATALOG_SNAPSHOT_ENABLED", default="false").lower() in ("1", "true", "yes")
+CATALOG_SNAPSHOT_DIR = os.getenv("CATALOG_SNAPSHOT_DIR", default="static/catalog")
+CATALOG_SNAPSHOT_DEBOUNCE_SECONDS = float(os.getenv("CATALOG_SNAPSHOT_DEBOUNCE_SECONDS", default=2))
+RECOMMENDATIONS_TOP_K = int(os.getenv("RECOMMENDATIONS_TOP_K", default=20))
+RECOMMENDATIONS_REFRESH_DEBOUNCE_SECONDS = float(os.getenv("RECOMMENDATIONS_REFRESH_DEBOUNCE_SECONDS", default=5))
+FAVORITES_CACHE_TTL = int(os.getenv("FAVORITES_CACHE_TTL", default=300))
+FAVORITES_CACHE_MAXSIZE = int(os.getenv("FAVORITES_CACHE_MAXSIZE", default=10000))
+# Carrinho write-behind: "database" (padrão, grava direto no banco), "memory" ou "redis"
+CART_STORE_BACKEND = os.getenv("CART_STORE_BACKEND", default="database").lower()
+CART_STORE_REDIS_URL = os.getenv("CART_STORE_REDIS_URL", default="redis://localhost:6379/0")
+CART_STORE_FLUSH_SECONDS = float(os.getenv("CART_STORE_FLUSH_SECONDS", default=30))
+STOCK_RESERVATION_TTL_SECONDS = int(os.getenv("STOCK_RESERVATION_TTL_SECONDS", default=900))
+STOCK_RESERVATION_SWEEP_SECONDS = float(os.getenv("STOCK_RESERVATION_SWEEP_SECONDS", default=60))
+EMAIL_OUTBOX_POLL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", default=10))
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", default=6))
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", default=30))
@@ -9,6 +9,8 @@ from app.schemas.cart_item_schema import (
     CartItemCreate,
     CartItemRemove,
     CartItemUpdate,
+    CartItemBatch,
+    MAX_BATCH_OPERATIONS,
 )
 
 router = APIRouter()
@@ -53,6 +55,28 @@ def add_item_to_cart(
     return
 
 
+@router.post(
+    "/items/batch",
+    response_model=CartItemsResponse,
+    summary="Alterar vários itens do carrinho",
+    description=(
+        f"Aplica, na ordem enviada, até {MAX_BATCH_OPERATIONS} operações `add`, `update` e "
+        "`remove` em uma única transação e retorna o carrinho atualizado. Se alguma "
+        "operação falhar (produto inexistente ou estoque insuficiente), nada é alterado."
+    ),
+    responses={
+        400: {"description": "Estoque insuficiente"},
+        404: {"description": "Carrinho ou produto não encontrado"},
+    },
+)
+def apply_cart_batch(
+    batch: CartItemBatch,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    return CartService.apply_batch(db, batch, current_user)
+
+
 @router.post(
     "/",
     response_model=CartResponse,
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.category_schema import CategoryCreate, CategoryResponse, CategoryUpdate, CategoryImageUpdate
 from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+from app.utils.http_cache import make_etag, conditional_response
 from app.models.user_model import User
 from app.dependencies.auth import is_admin, get_current_user
 from app.dependencies.category_form import category_create_form, category_update_form
@@ -15,9 +17,20 @@ router = APIRouter()
     "/",
     response_model=list[CategoryResponse],
     summary="Obter todas as categorias",
-    description="Retorna uma lista contendo todas as categorias cadastradas no sistema.",
+    description=(
+        "Retorna uma lista contendo todas as categorias cadastradas no sistema. "
+        "Suporta requisições condicionais (If-None-Match / If-Modified-Since)."
+    ),
+    responses={304: {"description": "Categorias não modificadas"}},
 )
-def get_categories(db: Session = Depends(get_db)):
+def get_categories(request: Request, response: Response, db: Session = Depends(get_db)):
+    # product_count depende dos produtos, então a versão considera os dois
+    catalog = ProductService.get_catalog_version(db)
+    etag = make_etag("categories", catalog["version"])
+    not_modified = conditional_response(request, response, etag, catalog["last_modified"])
+    if not_modified:
+        return not_modified
+
     cats = CategoryService.get_all_categories(db)
     return cats if cats is not None else []
 
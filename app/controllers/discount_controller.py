@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.discount_schema import DiscountCreate, DiscountResponse, DiscountUpdate
@@ -18,6 +19,22 @@ def get_discounts(db: Session = Depends(get_db)):
     return DiscountService.get_all_discounts(db)
 
 
+@router.get(
+    "/active",
+    response_model=list[DiscountResponse],
+    summary="Obter descontos vigentes",
+    description=(
+        "Retorna apenas os descontos cuja janela (start_date, end_date) inclui o "
+        "momento atual. Aceita `product_id` para filtrar por produto."
+    ),
+)
+def get_active_discounts(
+    product_id: Optional[int] = Query(None),
+    db: Session = Depends(get_db),
+):
+    return DiscountService.get_active_discounts(db, product_id)
+
+
 @router.get(
     "/{discount_id}",
     response_model=DiscountResponse,
@@ -1,17 +1,49 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, status, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.schemas.favorite_schema import FavoriteCreate, FavoriteResponse
+from app.schemas.favorite_schema import FavoriteCreate, FavoriteResponse, FavoriteIdsResponse
 from app.models.user_model import User
 from app.services.favorite_service import FavoriteService
 from app.core.middlewares.auth_middleware import get_current_user
 
 router = APIRouter()
 
+# Máximo de IDs aceitos em uma consulta de favoritos
+MAX_CHECK_IDS = 500
+
 @router.get("/", response_model=list[FavoriteResponse])
 def get_favorites(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return FavoriteService.get_favorites(db, current_user)
 
+@router.get(
+    "/ids",
+    response_model=FavoriteIdsResponse,
+    summary="IDs dos produtos favoritos",
+    description=(
+        "Retorna os IDs dos produtos favoritados pelo usuário. Com `ids` separados por "
+        f"vírgula (até {MAX_CHECK_IDS}), retorna só os que estão entre os favoritos, para "
+        "marcar uma listagem de produtos de uma vez."
+    ),
+    responses={400: {"description": "Lista de IDs inválida"}},
+)
+def get_favorite_ids(
+    ids: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
+    if ids is None:
+        return FavoriteIdsResponse(product_ids=sorted(FavoriteService.get_favorite_ids(db, current_user)))
+
+    try:
+        product_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="IDs devem ser números inteiros separados por vírgula")
+    if len(product_ids) > MAX_CHECK_IDS:
+        raise HTTPException(status_code=400, detail=f"Informe no máximo {MAX_CHECK_IDS} IDs")
+
+    return FavoriteIdsResponse(product_ids=FavoriteService.filter_favorited(db, current_user, product_ids))
+
 @router.post("/", response_model=FavoriteResponse, status_code=status.HTTP_201_CREATED)
 def add_favorite(data: FavoriteCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return FavoriteService.add_favorite(db, current_user, data)
@@ -1,4 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Form
+from typing import Literal, Optional, Union
+from decimal import Decimal
+from fastapi.responses import ORJSONResponse
+from fastapi import APIRouter, Depends, HTTPException, status, Form, Query, Request, Response, UploadFile, File
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.schemas.product_schema import (
@@ -6,27 +9,215 @@ from app.schemas.product_schema import (
     ProductResponse,
     ProductUpdate,
     ProductUpdateStock,
-    ProductImageUpdate
+    ProductImageUpdate,
+    ProductPageResponse,
+    ProductBatchResponse,
+    ProductSuggestion,
+    ProductFilters,
+    ProductImportResponse,
+    ProductBulkStockUpdate,
+    ProductBulkStockResponse,
 )
 from app.services.product_service import ProductService
+from app.services.product_import_service import ProductImportService
+from app.services.recommendation_service import RecommendationService
+from app.services.sales_service import SalesService
+from app.schemas.sales_schema import BestSellerResponse
+from app.config import FAST_JSON_RESPONSES, RECOMMENDATIONS_TOP_K
 from app.dependencies.auth import is_moderator, is_admin
 from app.repositories.category_repository import CategoryRepository
 from app.dependencies.product_form import product_create_form, product_update_form
 from app.models.user_model import User
 from app.core.middlewares.auth_middleware import get_current_user
 from app.models.product_model import Product
+from app.utils.http_cache import make_etag, conditional_response
 
 router = APIRouter()
 
+DEFAULT_PAGE_SIZE = 20
+MAX_BATCH_IDS = 100
+
 
 @router.get(
     "/",
-    response_model=list[ProductResponse],
+    response_model=Union[list[ProductResponse], ProductPageResponse],
     summary="Obter todos os produtos",
-    description="Retorna uma lista contendo todos os produtos cadastrados no sistema.",
+    description=(
+        "Retorna uma lista contendo todos os produtos cadastrados no sistema. "
+        "Quando `limit` ou `cursor` são informados, retorna uma página "
+        "com `items` e `next_cursor` para buscar a página seguinte. "
+        "Filtros (categoria, faixa de preço, em estoque, em promoção), ordenação e "
+        "`facets=true` (contagem por categoria e faixa de preço) também retornam página. "
+        "Suporta requisições condicionais (If-None-Match / If-Modified-Since)."
+    ),
+    responses={304: {"description": "Catálogo não modificado"}},
+)
+def get_products(
+    request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    sort: Literal["id", "price", "price_desc", "newest"] = Query("id"),
+    category_id: Optional[int] = Query(None),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    in_stock: bool = Query(False),
+    on_sale: bool = Query(False),
+    facets: bool = Query(False),
+    db: Session = Depends(get_db),
+):
+    # Responde 304 antes de montar/serializar a lista quando nada mudou
+    catalog = ProductService.get_catalog_version(db)
+    etag = make_etag("products", catalog["version"], str(request.query_params))
+    not_modified = conditional_response(request, response, etag, catalog["last_modified"])
+    if not_modified:
+        return not_modified
+
+    filters = ProductFilters(
+        category_id=category_id,
+        min_price=min_price,
+        max_price=max_price,
+        in_stock=in_stock,
+        on_sale=on_sale,
+    )
+    if (
+        limit is None
+        and cursor is None
+        and sort == "id"
+        and not facets
+        and filters == ProductFilters()
+    ):
+        if FAST_JSON_RESPONSES:
+            # Dicts já no formato final: dispensa a validação do response_model
+            return ORJSONResponse(
+                ProductService.get_product_dicts(db), headers=dict(response.headers)
+            )
+        return ProductService.get_all_products(db)
+
+    return ProductService.get_products_page(
+        db, limit or DEFAULT_PAGE_SIZE, cursor, sort, filters, facets
+    )
+
+
+@router.get(
+    "/search",
+    response_model=list[ProductResponse],
+    summary="Buscar produtos",
+    description=(
+        "Busca textual no nome e na descrição dos produtos, com casamento por prefixo "
+        "e resultados ordenados por relevância. Aceita filtros de categoria e preço."
+    ),
+)
+def search_products(
+    q: str = Query(..., min_length=1, max_length=200),
+    category_id: Optional[int] = Query(None),
+    min_price: Optional[Decimal] = Query(None, ge=0),
+    max_price: Optional[Decimal] = Query(None, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    return ProductService.search_products(
+        db, q, limit, category_id, min_price, max_price
+    )
+
+
+@router.get(
+    "/autocomplete",
+    response_model=list[ProductSuggestion],
+    summary="Sugestões de nomes de produtos",
+    description=(
+        "Sugere produtos enquanto o usuário digita: casa `q` com o início de qualquer "
+        "palavra do nome, sem diferenciar acentos e maiúsculas. Os que começam por `q` "
+        "vêm primeiro. Atendido por um índice em memória."
+    ),
+)
+def autocomplete_products(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db),
+):
+    return ProductService.autocomplete(db, q, limit)
+
+
+@router.get(
+    "/batch",
+    response_model=ProductBatchResponse,
+    summary="Obter vários produtos por ID",
+    description=(
+        f"Retorna até {MAX_BATCH_IDS} produtos de uma vez a partir de `ids` separados "
+        "por vírgula (ex.: `ids=3,1,7`), na ordem pedida. Os IDs não encontrados "
+        "vêm em `missing`."
+    ),
+    responses={400: {"description": "Lista de IDs inválida"}},
+)
+def get_products_batch(
+    ids: str = Query(..., min_length=1),
+    db: Session = Depends(get_db),
+):
+    try:
+        product_ids = [int(value) for value in ids.split(",") if value.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="IDs devem ser números inteiros separados por vírgula")
+    if not product_ids or len(product_ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"Informe entre 1 e {MAX_BATCH_IDS} IDs")
+
+    return ProductService.get_products_by_ids(db, product_ids)
+
+
+@router.get(
+    "/best-sellers/category/{category_id}",
+    response_model=list[BestSellerResponse],
+    summary="Mais vendidos da categoria",
+    description=(
+        "Ranking dos produtos mais vendidos de uma categoria nos últimos `days` dias, "
+        "por unidades ou receita. Lido do rollup diário de vendas."
+    ),
+)
+def get_best_sellers_by_category(
+    category_id: int,
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(10, ge=1, le=100),
+    order_by: Literal["units", "revenue"] = Query("units"),
+    db: Session = Depends(get_db),
+):
+    return SalesService.get_best_sellers(db, days, limit, order_by, category_id=category_id)
+
+
+@router.get(
+    "/best-sellers/admin/{admin_id}",
+    response_model=list[BestSellerResponse],
+    summary="Mais vendidos do administrador",
+    description=(
+        "Ranking dos produtos mais vendidos de um administrador (dono das categorias) "
+        "nos últimos `days` dias, por unidades ou receita. Requer privilégios de moderador."
+    ),
+    responses={
+        401: {"description": "Não autorizado"},
+        403: {"description": "Acesso negado"},
+    },
+)
+def get_best_sellers_by_admin(
+    admin_id: int,
+    days: int = Query(30, ge=1, le=365),
+    limit: int = Query(10, ge=1, le=100),
+    order_by: Literal["units", "revenue"] = Query("units"),
+    db: Session = Depends(get_db),
+    _: User = Depends(is_moderator),
+):
+    return SalesService.get_best_sellers(db, days, limit, order_by, admin_id=admin_id)
+
+
+@router.get(
+    "/cache/stats",
+    summary="Estatísticas do cache do catálogo",
+    description="Retorna acertos, erros e ocupação do cache em memória do catálogo. Requer privilégios de administrador.",
+    responses={
+        401: {"description": "Não autorizado"},
+        403: {"description": "Acesso negado"},
+    },
 )
-def get_products(db: Session = Depends(get_db)):
-    return ProductService.get_all_products(db)
+def get_cache_stats(_: User = Depends(is_admin)):
+    return ProductService.get_cache_stats()
 
 
 @router.get(
@@ -54,9 +245,48 @@ def get_products_by_user(
     description="Retorna uma lista de produtos pertencentes a uma categoria específica.",
 )
 def get_products_by_category(category_id: int, db: Session = Depends(get_db)):
+    if FAST_JSON_RESPONSES:
+        return ORJSONResponse(ProductService.get_product_dicts(db, category_id))
     return ProductService.get_product_by_category(db, category_id)
 
 
+@router.get(
+    "/{product_id}/recommendations",
+    response_model=list[ProductResponse],
+    summary="Produtos comprados juntos",
+    description=(
+        "Retorna os produtos que mais aparecem nos mesmos pedidos que o produto "
+        "informado, do mais para o menos frequente."
+    ),
+    responses={404: {"description": "Produto não encontrado"}},
+)
+def get_product_recommendations(
+    product_id: int,
+    limit: int = Query(10, ge=1, le=RECOMMENDATIONS_TOP_K),
+    db: Session = Depends(get_db),
+):
+    return RecommendationService.get_recommendations(db, product_id, limit)
+
+
+@router.post(
+    "/recommendations/rebuild",
+    summary="Reconstruir recomendações",
+    description=(
+        "Recalcula do zero as co-ocorrências de produtos e o top-K de cada produto "
+        "a partir de todos os itens de pedido. Requer privilégios de administrador."
+    ),
+    responses={
+        401: {"description": "Não autorizado"},
+        403: {"description": "Acesso negado"},
+    },
+)
+def rebuild_recommendations(
+    db: Session = Depends(get_db),
+    _: User = Depends(is_admin),
+):
+    return RecommendationService.rebuild(db)
+
+
 @router.get(
     "/{product_id}",
     response_model=ProductResponse,
@@ -94,6 +324,53 @@ def create_product(
     return ProductService.create_product(db, product_data)
 
 
+@router.post(
+    "/import",
+    response_model=ProductImportResponse,
+    summary="Importar produtos em lote",
+    description=(
+        "Importa produtos a partir de um arquivo CSV (cabeçalho com name, price, stock, "
+        "category_id, description, image_path) ou NDJSON (um objeto por linha). "
+        "O arquivo é lido em streaming e gravado em lotes; linhas inválidas são "
+        "ignoradas e listadas no relatório. Requer privilégios de administrador."
+    ),
+    responses={
+        400: {"description": "Formato de arquivo não suportado"},
+        401: {"description": "Não autorizado"},
+        403: {"description": "Acesso negado"},
+    },
+)
+def import_products(
+    file: UploadFile = File(...),
+    db: Session = Depends(get_db),
+    _: User = Depends(is_admin),
+):
+    file_format = ProductImportService.detect_format(file.filename, file.content_type)
+    return ProductImportService.import_products(db, file.file, file_format)
+
+
+@router.put(
+    "/stock",
+    response_model=ProductBulkStockResponse,
+    summary="Atualizar estoque em lote",
+    description=(
+        "Atualiza o estoque de vários produtos de uma vez a partir de um mapa "
+        "`{product_id: estoque}`, em uma única transação. Retorna os ids atualizados "
+        "e os que não foram encontrados. Requer privilégios de moderador."
+    ),
+    responses={
+        401: {"description": "Não autorizado"},
+        403: {"description": "Acesso negado"},
+    },
+)
+def bulk_update_stock(
+    data: ProductBulkStockUpdate,
+    db: Session = Depends(get_db),
+    _: dict = Depends(is_moderator),
+):
+    return ProductService.bulk_update_stock(db, data)
+
+
 @router.put(
     "/{product_id}",
     response_model=ProductResponse,
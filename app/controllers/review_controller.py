@@ -1,7 +1,14 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from typing import Optional
+from fastapi import APIRouter, Depends, status, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.database import get_db
-from app.schemas.review_schema import ReviewCreate, ReviewUpdate, ReviewResponse
+from app.schemas.review_schema import (
+    ReviewCreate,
+    ReviewUpdate,
+    ReviewResponse,
+    ProductReviewPageResponse,
+    RatingSummaryResponse,
+)
 from app.models.user_model import User
 from app.services.review_service import ReviewService
 from app.core.middlewares.auth_middleware import get_current_user
@@ -12,6 +19,33 @@ router = APIRouter()
 def get_reviews(db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return ReviewService.get_reviews(db, current_user)
 
+@router.get(
+    "/product/{product_id}",
+    response_model=ProductReviewPageResponse,
+    summary="Avaliações de um produto",
+    description=(
+        "Retorna as avaliações de um produto, das mais recentes para as mais antigas. "
+        "Use `next_cursor` como `cursor` para buscar a página seguinte."
+    ),
+    responses={400: {"description": "Cursor inválido"}},
+)
+def get_product_reviews(
+    product_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    return ReviewService.get_product_reviews(db, product_id, limit, cursor)
+
+@router.get(
+    "/product/{product_id}/summary",
+    response_model=RatingSummaryResponse,
+    summary="Resumo das avaliações de um produto",
+    description="Retorna a quantidade de avaliações, a nota média e o histograma de notas (1 a 5) do produto.",
+)
+def get_product_rating_summary(product_id: int, db: Session = Depends(get_db)):
+    return ReviewService.get_rating_summary(db, product_id)
+
 @router.post("/", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
 def add_review(data: ReviewCreate, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     return ReviewService.add_review(db, current_user, data)
@@ -0,0 +1,182 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterable, Optional
+from app.config import (
+    CATALOG_CACHE_MAXSIZE,
+    CATALOG_CACHE_TTL,
+    FAVORITES_CACHE_MAXSIZE,
+    FAVORITES_CACHE_TTL,
+)
+
+
+class TTLCache:
+    """
+    Cache LRU em memória com expiração por tempo (TTL), seguro entre threads.
+    Guarda contadores de acertos/erros para acompanhar a eficácia do cache.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._generation = 0
+        # Chaves com carregamento em andamento: [carregamentos, versão]. delete()
+        # avança a versão para que um carregamento anterior não seja guardado.
+        self._loading: dict = {}
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any):
+        with self._lock:
+            self._store(key, value)
+
+    def _store(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def _begin_load(self, keys: list) -> dict:
+        with self._lock:
+            tokens = {}
+            for key in keys:
+                entry = self._loading.setdefault(key, [0, 0])
+                entry[0] += 1
+                tokens[key] = (self._generation, entry[1])
+            return tokens
+
+    def _end_load(self, tokens: dict, values: Optional[dict]):
+        """
+        Guarda os valores carregados, exceto os de chaves que tiveram clear() ou
+        delete() durante o carregamento (podem estar desatualizados).
+        """
+        with self._lock:
+            for key, (generation, version) in tokens.items():
+                entry = self._loading[key]
+                if values is not None and (generation, version) == (self._generation, entry[1]):
+                    self._store(key, values.get(key))
+                entry[0] -= 1
+                if entry[0] == 0:
+                    del self._loading[key]
+
+    def get_or_set(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        sentinel = object()
+        value = self.get(key, sentinel)
+        if value is sentinel:
+            tokens = self._begin_load([key])
+            try:
+                value = loader()
+            except BaseException:
+                self._end_load(tokens, None)
+                raise
+            self._end_load(tokens, {key: value})
+        return value
+
+    def get_or_set_many(
+        self, keys: Iterable[Hashable], loader: Callable[[list], dict]
+    ) -> dict:
+        """
+        Versão em lote de get_or_set: `loader` recebe só as chaves ausentes e
+        devolve {chave: valor}; chaves que ele não devolver ficam com None.
+        """
+        sentinel = object()
+        found = {}
+        missing = []
+        for key in keys:
+            value = self.get(key, sentinel)
+            if value is sentinel:
+                missing.append(key)
+            else:
+                found[key] = value
+
+        if missing:
+            tokens = self._begin_load(missing)
+            try:
+                loaded = loader(missing)
+            except BaseException:
+                self._end_load(tokens, None)
+                raise
+            for key in missing:
+                found[key] = loaded.get(key)
+            self._end_load(tokens, found)
+        return found
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+            entry = self._loading.get(key)
+            if entry is not None:
+                entry[1] += 1
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+# Cache das leituras do catálogo (produtos e descontos). As escritas nos
+# repositórios chamam invalidate_catalog() logo após o commit.
+catalog_cache = TTLCache(maxsize=CATALOG_CACHE_MAXSIZE, ttl=CATALOG_CACHE_TTL)
+
+# Ids dos produtos favoritos de cada usuário (user_id -> frozenset). O
+# FavoriteRepository descarta a entrada do usuário a cada escrita.
+favorites_cache = TTLCache(maxsize=FAVORITES_CACHE_MAXSIZE, ttl=FAVORITES_CACHE_TTL)
+
+# Outros derivados do catálogo (snapshot estático, autocomplete...) se
+# registram aqui para saber quando algo mudou.
+_catalog_listeners: list[Callable[[Optional[set[int]]], None]] = []
+# Os que dependem só dos nomes e das categorias dos produtos não são
+# avisados de mudanças de estoque, preço ou desconto.
+_name_listeners: list[Callable[[Optional[set[int]]], None]] = []
+
+
+def on_catalog_change(listener: Callable[[Optional[set[int]]], None], names_only: bool = False):
+    """
+    Registra `listener(category_ids)`; category_ids=None significa "tudo".
+    Com `names_only`, só é chamado quando produtos entram, saem, são
+    renomeados ou mudam de categoria.
+    """
+    (_name_listeners if names_only else _catalog_listeners).append(listener)
+    return listener
+
+
+def invalidate_catalog(category_ids: Optional[Iterable[int]] = None, names_changed: bool = False):
+    """
+    Limpa o cache e avisa os ouvintes. `category_ids` informa as categorias
+    afetadas pela escrita, quando conhecidas; sem ele, vale o catálogo inteiro.
+    `names_changed` indica que a escrita mexeu nos nomes ou na categoria de
+    algum produto (ou criou/removeu produtos).
+    """
+    catalog_cache.clear()
+    affected = None if category_ids is None else set(category_ids)
+    listeners = _catalog_listeners
+    if names_changed or affected is None:
+        listeners = listeners + _name_listeners
+    for listener in listeners:
+        listener(affected)
@@ -0,0 +1,138 @@
+import threading
+from typing import Optional
+
+
+class KeyValueStore:
+    """
+    Interface mínima de armazenamento chave-valor usada pelo cart_store:
+    valores em bytes mais conjuntos de strings (para marcar chaves sujas).
+    """
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def put(self, key: str, value: bytes):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def delete_if_equal(self, key: str, expected: bytes) -> bool:
+        """Apaga `key` só se o valor ainda for `expected` (atômico)."""
+        raise NotImplementedError
+
+    def compare_and_set(self, key: str, expected: Optional[bytes], value: bytes) -> bool:
+        """Grava `value` só se o valor atual ainda for `expected` (None = chave ausente). Atômico."""
+        raise NotImplementedError
+
+    def add_member(self, set_name: str, member: str):
+        raise NotImplementedError
+
+    def remove_member(self, set_name: str, member: str):
+        raise NotImplementedError
+
+    def members(self, set_name: str) -> set[str]:
+        raise NotImplementedError
+
+
+class InMemoryKeyValueStore(KeyValueStore):
+    """Dicionário do próprio processo: para rodar localmente e nos testes."""
+
+    def __init__(self):
+        self._values: dict[str, bytes] = {}
+        self._sets: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            return self._values.get(key)
+
+    def put(self, key: str, value: bytes):
+        with self._lock:
+            self._values[key] = value
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def delete_if_equal(self, key: str, expected: bytes) -> bool:
+        with self._lock:
+            if self._values.get(key) != expected:
+                return False
+            del self._values[key]
+            return True
+
+    def compare_and_set(self, key: str, expected: Optional[bytes], value: bytes) -> bool:
+        with self._lock:
+            if self._values.get(key) != expected:
+                return False
+            self._values[key] = value
+            return True
+
+    def add_member(self, set_name: str, member: str):
+        with self._lock:
+            self._sets.setdefault(set_name, set()).add(member)
+
+    def remove_member(self, set_name: str, member: str):
+        with self._lock:
+            self._sets.get(set_name, set()).discard(member)
+
+    def members(self, set_name: str) -> set[str]:
+        with self._lock:
+            return set(self._sets.get(set_name, ()))
+
+
+class RedisKeyValueStore(KeyValueStore):
+    """Redis compartilhado entre os processos da API."""
+
+    DELETE_IF_EQUAL_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    # ARGV[1] = "1" quando a chave deve estar ausente
+    COMPARE_AND_SET_SCRIPT = """
+    local current = redis.call('get', KEYS[1])
+    if ARGV[1] == '1' then
+        if current then return 0 end
+    elseif current ~= ARGV[2] then
+        return 0
+    end
+    redis.call('set', KEYS[1], ARGV[3])
+    return 1
+    """
+
+    def __init__(self, url: str):
+        # Importado só aqui: quem não usa o backend redis não precisa do pacote
+        import redis
+
+        self._client = redis.Redis.from_url(url)
+        self._delete_if_equal = self._client.register_script(self.DELETE_IF_EQUAL_SCRIPT)
+        self._compare_and_set = self._client.register_script(self.COMPARE_AND_SET_SCRIPT)
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(key)
+
+    def put(self, key: str, value: bytes):
+        self._client.set(key, value)
+
+    def delete(self, key: str):
+        self._client.delete(key)
+
+    def delete_if_equal(self, key: str, expected: bytes) -> bool:
+        return bool(self._delete_if_equal(keys=[key], args=[expected]))
+
+    def compare_and_set(self, key: str, expected: Optional[bytes], value: bytes) -> bool:
+        absent = "1" if expected is None else "0"
+        return bool(self._compare_and_set(keys=[key], args=[absent, expected or b"", value]))
+
+    def add_member(self, set_name: str, member: str):
+        self._client.sadd(set_name, member)
+
+    def remove_member(self, set_name: str, member: str):
+        self._client.srem(set_name, member)
+
+    def members(self, set_name: str) -> set[str]:
+        return {member.decode() for member in self._client.smembers(set_name)}
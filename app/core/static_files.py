@@ -0,0 +1,50 @@
+import stat
+from mimetypes import guess_type
+from typing import Optional
+import anyio
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """
+    StaticFiles que, quando o cliente aceita, serve a variante pré-comprimida
+    gerada ao lado do arquivo (`arquivo.json.br`, `arquivo.json.gz`) com o
+    Content-Encoding correspondente, sem comprimir nada por requisição.
+    """
+
+    encodings = (("br", ".br"), ("gzip", ".gz"))
+
+    def cache_control(self, path: str) -> Optional[str]:
+        return None
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = None
+        if scope["method"] in ("GET", "HEAD"):
+            accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+            accepted = {value.split(";")[0].strip() for value in accept_encoding.split(",")}
+            for encoding, suffix in self.encodings:
+                if encoding not in accepted:
+                    continue
+                full_path, stat_result = await anyio.to_thread.run_sync(
+                    self.lookup_path, path + suffix
+                )
+                if stat_result and stat.S_ISREG(stat_result.st_mode):
+                    response = self.file_response(full_path, stat_result, scope)
+                    response.headers["content-encoding"] = encoding
+                    if response.status_code == 200:
+                        response.headers["content-type"] = (
+                            guess_type(path)[0] or "application/octet-stream"
+                        )
+                    break
+
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers["vary"] = "Accept-Encoding"
+        cache_control = self.cache_control(path)
+        if cache_control:
+            response.headers["cache-control"] = cache_control
+        return response
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DECIMAL
+from sqlalchemy import Column, Integer, ForeignKey, DECIMAL, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 
@@ -18,3 +18,5 @@ class CartItem(Base):
 
     cart = relationship("Cart", back_populates="cart_items")
     product = relationship("Product", back_populates="cart_items")
+
+    __table_args__ = (UniqueConstraint("cart_id", "product_id", name="_cart_product_uc"),)
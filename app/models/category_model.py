@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from app.database import Base
+from datetime import datetime
 
 
 class Category(Base):
@@ -10,8 +11,13 @@ class Category(Base):
     name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     user_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     image_path = Column(String(200), nullable=True)
+    # Contador desnormalizado, mantido pelas escritas de ProductRepository
+    product_count = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
+    )
 
     products = relationship("Product", back_populates="category", passive_deletes=True)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, DECIMAL, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -10,8 +10,13 @@ class Discount(Base):
     id = Column(Integer, primary_key=True, index=True)
     description = Column(String(200), nullable=False)
     discount_percentage = Column(DECIMAL(5, 2), nullable=False)
-    start_date = Column(DateTime, nullable=False, default=datetime.utcnow)
-    end_date = Column(DateTime, nullable=False)
+    start_date = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+    end_date = Column(DateTime, nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"))
 
     product = relationship("Product", back_populates="discounts")
+
+    __table_args__ = (
+        # Descontos vigentes de um produto: product_id = ? AND start_date <= ? AND end_date > ?
+        Index("ix_discounts_product_window", "product_id", "start_date", "end_date"),
+    )
@@ -0,0 +1,41 @@
+import enum
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey, Index
+from app.database import Base
+
+
+class EmailKind(enum.Enum):
+    PURCHASE_CONFIRMATION = "PURCHASE_CONFIRMATION"
+
+
+class EmailStatus(enum.Enum):
+    PENDING = "PENDING"
+    SENT = "SENT"
+    FAILED = "FAILED"
+
+
+class EmailOutbox(Base):
+    """
+    E-mail a enviar, gravado na mesma transação que o originou (pedido,
+    webhook) e enviado depois pelo EmailOutboxWorker. O conteúdo é montado
+    no envio, a partir do pedido.
+    """
+
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(Enum(EmailKind), nullable=False)
+    to_email = Column(String(100), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id", ondelete="CASCADE"), nullable=True)
+    status = Column(Enum(EmailStatus), nullable=False, default=EmailStatus.PENDING)
+    attempts = Column(Integer, nullable=False, default=0)
+    # Próxima tentativa; enquanto um worker envia, funciona como prazo de posse
+    next_attempt_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        # Fila: pendentes por ordem de próxima tentativa
+        Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
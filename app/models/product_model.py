@@ -1,6 +1,12 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, Text
+from sqlalchemy import Column, Integer, String, ForeignKey, DECIMAL, Text, DateTime, Index, DDL, event
 from sqlalchemy.orm import relationship
 from app.database import Base
+from datetime import datetime
+
+
+def default_effective_price(context):
+    # Sem descontos ativos, o preço efetivo é o próprio preço
+    return context.get_current_parameters()["price"]
 
 
 class Product(Base):
@@ -12,11 +18,80 @@ class Product(Base):
     )
     name = Column(String(200), nullable=False)
     price = Column(DECIMAL(10, 2), nullable=False)
+    # Preço com os descontos ativos aplicados, mantido pelo PricingService
+    effective_price = Column(DECIMAL(10, 2), nullable=False, default=default_effective_price)
     stock = Column(Integer, nullable=False)
     image_path = Column(String(200), nullable=True)
     description = Column(Text)  # e não String(500)
+    # Alimenta ETag/Last-Modified da listagem do catálogo
+    updated_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow, index=True
+    )
 
     category = relationship("Category", back_populates="products")
     cart_items = relationship("CartItem", back_populates="product", passive_deletes=True)
     order_items = relationship("OrderItem", back_populates="product", passive_deletes=True)
     discounts = relationship("Discount", back_populates="product", passive_deletes=True)
+
+    __table_args__ = (
+        # Paginação por cursor ordenada por preço (keyset em price, id)
+        Index("ix_products_price_id", "price", "id"),
+        # Filtros da listagem: categoria + faixa de preço, e somente em estoque
+        Index("ix_products_category_price", "category_id", "price"),
+        Index("ix_products_stock", "stock"),
+    )
+
+
+# Busca textual em name/description.
+# PostgreSQL: coluna tsvector gerada + índice GIN (também criada via migration).
+# SQLite (ambiente local/testes): tabela virtual FTS5 sincronizada por triggers.
+PG_SEARCH_DDL = [
+    DDL(
+        "ALTER TABLE products ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "setweight(to_tsvector('portuguese', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')"
+        ") STORED"
+    ),
+    DDL(
+        "CREATE INDEX IF NOT EXISTS ix_products_search_vector "
+        "ON products USING GIN (search_vector)"
+    ),
+]
+
+SQLITE_SEARCH_DDL = [
+    DDL(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS products_fts USING fts5("
+        "name, description, content='products', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN "
+        "INSERT INTO products_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN "
+        "INSERT INTO products_fts(products_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END"
+    ),
+    DDL(
+        "CREATE TRIGGER IF NOT EXISTS products_fts_au AFTER UPDATE OF name, description ON products BEGIN "
+        "INSERT INTO products_fts(products_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO products_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+]
+
+for ddl in PG_SEARCH_DDL:
+    event.listen(Product.__table__, "after_create", ddl.execute_if(dialect="postgresql"))
+
+for ddl in SQLITE_SEARCH_DDL:
+    event.listen(Product.__table__, "after_create", ddl.execute_if(dialect="sqlite"))
+
+event.listen(
+    Product.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS products_fts").execute_if(dialect="sqlite"),
+)
@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+
+class ProductCooccurrence(Base):
+    """Quantos pedidos contêm o par (product_id, other_product_id); guardado nos dois sentidos."""
+
+    __tablename__ = "product_cooccurrences"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    other_product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    orders = Column(Integer, nullable=False, default=0)
+
+
+class ProductRecommendation(Base):
+    """Top-K "comprados juntos" de cada produto, já ordenado (rank 0 = mais frequente)."""
+
+    __tablename__ = "product_recommendations"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    rank = Column(Integer, primary_key=True)
+    recommended_product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False
+    )
+    score = Column(Integer, nullable=False)
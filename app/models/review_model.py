@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import datetime
@@ -15,5 +15,25 @@ class Review(Base):
     user = relationship("User", back_populates="reviews")
     product = relationship("Product")
 
-# Adicione no User model:
-# reviews = relationship("Review", back_populates="user", passive_deletes=True)
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint("user_id", "product_id", name="_user_product_review_uc"),
+        # Paginação por keyset das avaliações de um produto (mais recentes primeiro)
+        Index("ix_reviews_product_id_id", "product_id", "id"),
+    )
+
+
+class ProductRatingSummary(Base):
+    """Agregado das avaliações de um produto, mantido a cada avaliação criada, alterada ou removida."""
+
+    __tablename__ = "product_rating_summaries"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, Date, DECIMAL, ForeignKey, Index
+from app.database import Base
+
+
+class ProductSalesDaily(Base):
+    """
+    Rollup de vendas por produto e dia, mantido pelo SalesService a cada
+    pedido criado ou mudança de status. category_id/admin_id são copiados do
+    produto para que os rankings leiam só esta tabela.
+    """
+
+    __tablename__ = "product_sales_daily"
+
+    product_id = Column(
+        Integer, ForeignKey("products.id", ondelete="CASCADE"), primary_key=True
+    )
+    day = Column(Date, primary_key=True)
+    category_id = Column(Integer, nullable=False)
+    admin_id = Column(Integer, nullable=False)
+    units = Column(Integer, nullable=False, default=0)
+    revenue = Column(DECIMAL(12, 2), nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_product_sales_daily_category_day", "category_id", "day"),
+        Index("ix_product_sales_daily_admin_day", "admin_id", "day"),
+    )
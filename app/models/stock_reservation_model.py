@@ -0,0 +1,31 @@
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
+from app.database import Base
+
+
+class StockReservation(Base):
+    """
+    Quantidade de um produto separada para um carrinho até `expires_at`. O
+    estoque disponível é o estoque menos as reservas ainda válidas; as
+    vencidas são apagadas em lotes pelo StockReservationSweeper.
+    """
+
+    __tablename__ = "stock_reservations"
+
+    id = Column(Integer, primary_key=True)
+    cart_id = Column(Integer, ForeignKey("carts.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    quantity = Column(Integer, nullable=False)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("cart_id", "product_id", name="_cart_product_reservation_uc"),
+        # Soma das reservas válidas de um produto sem ler a tabela
+        Index(
+            "ix_stock_reservations_product_expires",
+            "product_id",
+            "expires_at",
+            postgresql_include=["quantity", "cart_id"],
+        ),
+        # Varredura das reservas vencidas
+        Index("ix_stock_reservations_expires_at", "expires_at"),
+    )
@@ -1,6 +1,12 @@
+from typing import Optional
+from decimal import Decimal
+from sqlalchemy import Integer, literal, select
 from sqlalchemy.orm import Session
 from app.models.cart_model import Cart
 from app.models.cart_item_model import CartItem
+from app.models.product_model import Product
+from app.repositories.stock_reservation_repository import StockReservationRepository
+from app.utils.sql import dialect_insert
 
 
 class CartRepository:
@@ -8,6 +14,32 @@ class CartRepository:
     def get_cart_by_user(db: Session, user_id: int) -> Cart:
         return db.query(Cart).filter(Cart.user_id == user_id).first()
 
+    @staticmethod
+    def get_cart_item_rows(db: Session, user_id: int):
+        """
+        Carrinho do usuário com os itens e nome, imagem e preço efetivo de cada
+        produto, numa única consulta. Carrinho vazio vem como uma linha com as
+        colunas do item nulas; sem carrinho, nenhuma linha.
+        """
+        return (
+            db.query(
+                Cart.id.label("cart_id"),
+                CartItem.id,
+                CartItem.product_id,
+                CartItem.quantity,
+                CartItem.unit_price,
+                Product.name,
+                Product.image_path,
+                Product.effective_price,
+            )
+            .select_from(Cart)
+            .outerjoin(CartItem, CartItem.cart_id == Cart.id)
+            .outerjoin(Product, Product.id == CartItem.product_id)
+            .filter(Cart.user_id == user_id)
+            .order_by(CartItem.id)
+            .all()
+        )
+
     @staticmethod
     def get_cart_items(db: Session, cart_id: int) -> list[CartItem]:
         return db.query(CartItem).filter(CartItem.cart_id == cart_id).all()
@@ -19,6 +51,90 @@ class CartRepository:
         db.refresh(cart_item)
         return cart_item
 
+    @staticmethod
+    def upsert_item(db: Session, cart_id: int, product_id: int, quantity: int) -> Optional[int]:
+        """
+        Adiciona `quantity` do produto ao carrinho num único comando:
+
+            INSERT ... SELECT do produto (com estoque disponível suficiente)
+            ON CONFLICT (cart_id, product_id)
+                DO UPDATE SET quantity = quantity + excluded.quantity
+                WHERE a nova quantidade cabe no estoque disponível
+
+        Disponível = estoque menos as reservas válidas dos outros carrinhos. O
+        preço unitário vem do effective_price do produto e a reserva do item é
+        renovada na mesma transação. Retorna a nova quantidade do item, ou None
+        se nada foi gravado (produto inexistente ou estoque insuficiente).
+        """
+        available = Product.stock - StockReservationRepository.reserved_quantity(product_id, cart_id)
+        stmt = dialect_insert(db, CartItem).from_select(
+            ["cart_id", "product_id", "quantity", "unit_price"],
+            select(
+                literal(cart_id, Integer),
+                Product.id,
+                literal(quantity, Integer),
+                Product.effective_price,
+            ).where(Product.id == product_id, available >= quantity),
+        )
+        stock = select(available).where(Product.id == product_id).scalar_subquery()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["cart_id", "product_id"],
+            set_={"quantity": CartItem.quantity + stmt.excluded.quantity},
+            where=CartItem.quantity + stmt.excluded.quantity <= stock,
+        ).returning(CartItem.quantity)
+
+        new_quantity = db.execute(stmt).scalar()
+        if new_quantity is not None:
+            StockReservationRepository.reserve(db, cart_id, {product_id: new_quantity})
+        db.commit()
+        return new_quantity
+
+    @staticmethod
+    def save_items(db: Session, added: list[CartItem], removed: list[CartItem]):
+        """
+        Grava de uma vez as mudanças de um lote: itens novos, itens removidos e
+        as quantidades já alteradas nos itens carregados na sessão.
+        """
+        db.add_all(added)
+        for cart_item in removed:
+            db.delete(cart_item)
+        db.commit()
+
+    @staticmethod
+    def replace_items(db: Session, cart_id: int, items: dict[int, tuple[int, Decimal]]):
+        """
+        Deixa os itens do carrinho iguais a `items` ({product_id: (quantidade,
+        preço unitário)}): remove os que saíram e faz UPSERT dos demais.
+        Produtos apagados nesse meio tempo são ignorados.
+        """
+        db.query(CartItem).filter(
+            CartItem.cart_id == cart_id, CartItem.product_id.notin_(list(items))
+        ).delete(synchronize_session=False)
+        StockReservationRepository.release(db, cart_id)
+
+        existing = {
+            product_id
+            for (product_id,) in db.query(Product.id).filter(Product.id.in_(list(items)))
+        }
+        rows = [
+            {"cart_id": cart_id, "product_id": product_id, "quantity": quantity, "unit_price": unit_price}
+            for product_id, (quantity, unit_price) in items.items()
+            if product_id in existing
+        ]
+        if rows:
+            stmt = dialect_insert(db, CartItem)
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["cart_id", "product_id"],
+                    set_={"quantity": stmt.excluded.quantity, "unit_price": stmt.excluded.unit_price},
+                ),
+                rows,
+            )
+            StockReservationRepository.reserve(
+                db, cart_id, {row["product_id"]: row["quantity"] for row in rows}
+            )
+        db.commit()
+
     @staticmethod
     def remove_item_from_cart(db: Session, cart_id: int, product_id: int) -> CartItem:
         cart_item = (
@@ -28,6 +144,7 @@ class CartRepository:
         )
         if cart_item:
             db.delete(cart_item)
+            StockReservationRepository.release(db, cart_id, [product_id])
             db.commit()
 
     @staticmethod
@@ -39,9 +156,15 @@ class CartRepository:
 
     @staticmethod
     def clear_cart(db: Session, cart_id: int):
-        db.query(CartItem).filter(CartItem.cart_id == cart_id).delete()
+        CartRepository.delete_items(db, cart_id)
         db.commit()
 
+    @staticmethod
+    def delete_items(db: Session, cart_id: int):
+        """Esvazia o carrinho e libera suas reservas. Não faz commit."""
+        db.query(CartItem).filter(CartItem.cart_id == cart_id).delete()
+        StockReservationRepository.release(db, cart_id)
+
     @staticmethod
     def get_cart_item_by_product_id(
         db: Session, product_id: int, cart_id: int
@@ -61,6 +184,7 @@ class CartRepository:
         )
         if cart_item:
             cart_item.quantity = quantity
+            StockReservationRepository.reserve(db, cart_id, {product_id: quantity})
             db.commit()
             db.refresh(cart_item)
             return cart_item
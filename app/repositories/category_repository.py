@@ -1,5 +1,7 @@
+from sqlalchemy import func, update
 from sqlalchemy.orm import Session
 from app.models.category_model import Category
+from app.core.cache import invalidate_catalog
 
 
 class CategoryRepository:
@@ -11,6 +13,31 @@ class CategoryRepository:
     def get_all_categories_by_user(db: Session, user_id: int) -> list[Category]:
         return db.query(Category).filter(Category.user_id == user_id).all()
 
+    @staticmethod
+    def get_stats(db: Session) -> tuple:
+        return db.query(
+            func.count(Category.id), func.max(Category.id), func.max(Category.updated_at)
+        ).one()
+
+    @staticmethod
+    def get_all_category_ids(db: Session) -> set[int]:
+        return {category_id for (category_id,) in db.query(Category.id).all()}
+
+    @staticmethod
+    def adjust_product_count(db: Session, deltas: dict[int, int]):
+        """
+        Soma `deltas` ({category_id: delta}) ao product_count com UPDATE atômico.
+        Não faz commit: roda dentro da transação da escrita do produto.
+        """
+        for category_id, delta in deltas.items():
+            if delta:
+                db.execute(
+                    update(Category)
+                    .where(Category.id == category_id)
+                    .values(product_count=Category.product_count + delta)
+                    .execution_options(synchronize_session=False)
+                )
+
     @staticmethod
     def get_category_by_id(db: Session, category_id: int) -> Category:
         return db.query(Category).filter(Category.id == category_id).first()
@@ -20,6 +47,7 @@ class CategoryRepository:
         db.add(category)
         db.commit()
         db.refresh(category)
+        invalidate_catalog({category.id})
         return category
 
     @staticmethod
@@ -30,6 +58,7 @@ class CategoryRepository:
                 setattr(category, key, value)
             db.commit()
             db.refresh(category)
+            invalidate_catalog({category.id})
         return category
 
     @staticmethod
@@ -38,6 +67,8 @@ class CategoryRepository:
         if category:
             db.delete(category)
             db.commit()
+            # Os produtos da categoria saem junto
+            invalidate_catalog({category_id}, names_changed=True)
 
     @staticmethod
     def update_category_image(db: Session, category_id: int, image_path: str) -> Category:
@@ -46,4 +77,5 @@ class CategoryRepository:
             category.image_path = image_path
             db.commit()
             db.refresh(category)
+            invalidate_catalog({category.id})
         return category
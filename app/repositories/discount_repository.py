@@ -1,8 +1,36 @@
-from sqlalchemy.orm import Session
+from typing import Iterable, Optional
+from datetime import datetime
+from decimal import Decimal
+from sqlalchemy import func, or_, and_, select
+from sqlalchemy.orm import Session, with_loader_criteria
 from app.models.discount_model import Discount
+from app.core.cache import invalidate_catalog
 
 
 class DiscountRepository:
+    @staticmethod
+    def active_only(at: Optional[datetime] = None):
+        """
+        Opção de consulta que restringe qualquer carga de Discount (inclusive
+        Product.discounts via joinedload/selectinload) aos descontos vigentes.
+        """
+        at = at or datetime.utcnow()
+        return with_loader_criteria(
+            Discount, lambda cls: and_(cls.start_date <= at, cls.end_date > at)
+        )
+
+    @staticmethod
+    def get_active_discounts(
+        db: Session, product_id: Optional[int] = None, at: Optional[datetime] = None
+    ) -> list[Discount]:
+        at = at or datetime.utcnow()
+        query = db.query(Discount).filter(
+            Discount.start_date <= at, Discount.end_date > at
+        )
+        if product_id is not None:
+            query = query.filter(Discount.product_id == product_id)
+        return query.order_by(Discount.id).all()
+
     @staticmethod
     def get_all_discounts(db: Session) -> list[Discount]:
         return db.query(Discount).all()
@@ -16,21 +44,80 @@ class DiscountRepository:
         db.add(discount)
         db.commit()
         db.refresh(discount)
+        invalidate_catalog(DiscountRepository._category_ids(discount))
         return discount
 
     @staticmethod
     def update_discount(db: Session, discount_id: int, updates: dict) -> Discount:
         discount = db.query(Discount).filter(Discount.id == discount_id).first()
         if discount:
+            previous = DiscountRepository._category_ids(discount)
             for key, value in updates.items():
                 setattr(discount, key, value)
             db.commit()
             db.refresh(discount)
+            invalidate_catalog(previous | DiscountRepository._category_ids(discount))
         return discount
 
     @staticmethod
     def delete_discount(db: Session, discount_id: int):
         discount = db.query(Discount).filter(Discount.id == discount_id).first()
         if discount:
+            category_ids = DiscountRepository._category_ids(discount)
             db.delete(discount)
             db.commit()
+            invalidate_catalog(category_ids)
+
+    @staticmethod
+    def _category_ids(discount: Discount) -> set[int]:
+        # Categoria cujo catálogo embute este desconto
+        return {discount.product.category_id} if discount.product else set()
+
+    @staticmethod
+    def get_active_discount_totals(
+        db: Session, product_ids: Iterable[int], at: datetime
+    ) -> dict[int, Decimal]:
+        """Soma dos percentuais de desconto vigentes em `at`, por produto."""
+        rows = (
+            db.query(Discount.product_id, func.sum(Discount.discount_percentage))
+            .filter(
+                Discount.product_id.in_(list(product_ids)),
+                Discount.start_date <= at,
+                Discount.end_date > at,
+            )
+            .group_by(Discount.product_id)
+            .all()
+        )
+        return {product_id: Decimal(total) for product_id, total in rows}
+
+    @staticmethod
+    def get_next_window_boundary(db: Session, after: datetime) -> Optional[datetime]:
+        """Próximo instante, depois de `after`, em que algum desconto abre ou fecha."""
+        next_start, next_end = db.query(
+            select(func.min(Discount.start_date))
+            .where(Discount.start_date > after)
+            .scalar_subquery(),
+            select(func.min(Discount.end_date))
+            .where(Discount.end_date > after)
+            .scalar_subquery(),
+        ).one()
+        boundaries = [value for value in (next_start, next_end) if value is not None]
+        return min(boundaries) if boundaries else None
+
+    @staticmethod
+    def get_product_ids_with_window_change(
+        db: Session, since: Optional[datetime], until: datetime
+    ) -> set[int]:
+        """
+        Produtos com algum desconto que começou ou terminou no intervalo
+        (since, until]. Sem `since`, retorna todos os produtos com desconto.
+        """
+        query = db.query(Discount.product_id).filter(Discount.product_id.isnot(None))
+        if since is not None:
+            query = query.filter(
+                or_(
+                    Discount.start_date.between(since, until),
+                    Discount.end_date.between(since, until),
+                )
+            )
+        return {product_id for (product_id,) in query.distinct().all()}
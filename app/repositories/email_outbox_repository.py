@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.email_outbox_model import EmailOutbox, EmailKind, EmailStatus
+
+
+class EmailOutboxRepository:
+    @staticmethod
+    def enqueue(db: Session, kind: EmailKind, to_email: str, order_id: Optional[int] = None) -> EmailOutbox:
+        """Adiciona um e-mail à fila. Não faz commit: entra na transação de quem chamou."""
+        email = EmailOutbox(kind=kind, to_email=to_email, order_id=order_id)
+        db.add(email)
+        return email
+
+    @staticmethod
+    def claim_due(db: Session, now: datetime, limit: int, lease: timedelta) -> list[EmailOutbox]:
+        """
+        Reserva até `limit` e-mails pendentes e vencidos, empurrando
+        next_attempt_at para now + lease: outro worker (ou processo) não os
+        pega enquanto este envia. SKIP LOCKED no PostgreSQL evita esperar
+        linhas já travadas.
+        """
+        emails = (
+            db.query(EmailOutbox)
+            .filter(EmailOutbox.status == EmailStatus.PENDING, EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        )
+        for email in emails:
+            email.next_attempt_at = now + lease
+        db.commit()
+        return emails
+
+    @staticmethod
+    def mark_sent(db: Session, email: EmailOutbox, now: datetime):
+        email.status = EmailStatus.SENT
+        email.attempts += 1
+        email.sent_at = now
+        email.last_error = None
+        db.commit()
+
+    @staticmethod
+    def mark_failed(db: Session, email: EmailOutbox, error: str, next_attempt_at: Optional[datetime]):
+        """Registra a falha; sem `next_attempt_at`, desiste do e-mail (FAILED)."""
+        email.attempts += 1
+        email.last_error = error
+        if next_attempt_at is None:
+            email.status = EmailStatus.FAILED
+        else:
+            email.next_attempt_at = next_attempt_at
+        db.commit()
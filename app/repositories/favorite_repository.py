@@ -0,0 +1,66 @@
+from typing import Optional
+from sqlalchemy.orm import Session, joinedload
+from app.core.cache import favorites_cache
+from app.models.favorite_model import Favorite
+from app.models.product_model import Product
+from app.repositories.discount_repository import DiscountRepository
+from app.utils.sql import dialect_insert
+
+
+class FavoriteRepository:
+    @staticmethod
+    def get_favorites_by_user(db: Session, user_id: int) -> list[Favorite]:
+        return (
+            db.query(Favorite)
+            .options(
+                joinedload(Favorite.product).selectinload(Product.discounts),
+                joinedload(Favorite.product).joinedload(Product.category),
+                DiscountRepository.active_only(),
+            )
+            .filter(Favorite.user_id == user_id)
+            .order_by(Favorite.id.desc())
+            .all()
+        )
+
+    @staticmethod
+    def get_favorite_product_ids(db: Session, user_id: int) -> list[int]:
+        rows = db.query(Favorite.product_id).filter(Favorite.user_id == user_id).all()
+        return [product_id for (product_id,) in rows]
+
+    @staticmethod
+    def get_favorite_by_id(db: Session, favorite_id: int) -> Optional[Favorite]:
+        return db.query(Favorite).filter(Favorite.id == favorite_id).first()
+
+    @staticmethod
+    def get_favorite_by_user_and_product(db: Session, user_id: int, product_id: int) -> Optional[Favorite]:
+        return (
+            db.query(Favorite)
+            .options(
+                joinedload(Favorite.product).selectinload(Product.discounts),
+                joinedload(Favorite.product).joinedload(Product.category),
+                DiscountRepository.active_only(),
+            )
+            .filter(Favorite.user_id == user_id, Favorite.product_id == product_id)
+            .first()
+        )
+
+    @staticmethod
+    def add_favorite(db: Session, user_id: int, product_id: int):
+        """
+        INSERT ... ON CONFLICT DO NOTHING em (user_id, product_id): favoritar
+        de novo o mesmo produto não é erro, nem em requisições concorrentes.
+        """
+        db.execute(
+            dialect_insert(db, Favorite)
+            .values(user_id=user_id, product_id=product_id)
+            .on_conflict_do_nothing(index_elements=["user_id", "product_id"])
+        )
+        db.commit()
+        favorites_cache.delete(user_id)
+
+    @staticmethod
+    def delete_favorite(db: Session, favorite: Favorite):
+        user_id = favorite.user_id
+        db.delete(favorite)
+        db.commit()
+        favorites_cache.delete(user_id)
@@ -2,6 +2,8 @@ from typing import Optional, List
 from sqlalchemy.orm import Session, joinedload
 from app.models.order_model import Order, OrderStatus
 from app.models.order_item_model import OrderItem
+from app.repositories.sales_repository import SalesRepository
+from app.core.cache import invalidate_catalog
 
 class OrderRepository:
     @staticmethod
@@ -16,6 +18,18 @@ class OrderRepository:
         db.add_all(order_items)
         db.commit()
 
+    @staticmethod
+    def add_order_items(db: Session, order_items: list[OrderItem]):
+        """Adiciona os itens na transação do checkout. Não faz commit."""
+        db.add_all(order_items)
+
+    @staticmethod
+    def commit_order(db: Session, order: Order, category_ids: set[int]):
+        """Único commit do checkout; o estoque mudou, então invalida o catálogo."""
+        db.commit()
+        db.refresh(order)
+        invalidate_catalog(category_ids)
+
     @staticmethod
     def get_orders_by_user(db: Session, user_id: int) -> List[Order]:
         return db.query(Order).options(
@@ -55,7 +69,7 @@ class OrderRepository:
 
         # Only update if the new status is different
         if order.status != new_status:
-            order.status = new_status
+            SalesRepository.change_order_status(db, order, new_status)
             try:
                 db.add(order)
                 db.commit()
@@ -77,16 +91,19 @@ class OrderRepository:
             order.status == OrderStatus.PENDING
             or order.status == OrderStatus.PROCESSING
         ):
-            order.status = OrderStatus.CANCELLED  # Use o Enum correto (CANCELLED)
+            SalesRepository.change_order_status(db, order, OrderStatus.CANCELLED)
+            category_ids = set()
             for item in order.order_items:
                 product = item.product
                 product.stock += item.quantity
+                category_ids.add(product.category_id)
             try:
                 db.commit()
                 db.refresh(order)
             except Exception:
                 db.rollback()
                 raise
+            invalidate_catalog(category_ids)
         return order
 
     @staticmethod
@@ -1,20 +1,197 @@
-from sqlalchemy.orm import Session
+from typing import Iterable, Optional
+from decimal import Decimal
+from datetime import datetime
+from sqlalchemy import tuple_, update, insert, func, case, values, column, Integer
+from sqlalchemy.orm import Session, Query
 from app.models.product_model import Product
-from sqlalchemy.orm import joinedload
+from app.models.category_model import Category
+from app.models.discount_model import Discount
+from app.repositories.discount_repository import DiscountRepository
+from app.schemas.product_schema import ProductFilters
+from sqlalchemy.orm import joinedload, selectinload
 from fastapi import HTTPException
+from app.core.cache import invalidate_catalog
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.sales_repository import SalesRepository
+from app.repositories.stock_reservation_repository import StockReservationRepository
+from collections import Counter
+
+
+# Pares (id, estoque) por comando, para ficar abaixo do limite de parâmetros
+BULK_STOCK_BATCH_SIZE = 5000
 
 
 class ProductRepository:
     @staticmethod
     def get_all_products(db: Session) -> list[Product]:
-        return db.query(Product).options(joinedload(Product.discounts)).all()
+        return (
+            db.query(Product)
+            .options(joinedload(Product.discounts), DiscountRepository.active_only())
+            .all()
+        )
+
+    @staticmethod
+    def get_product_rows(db: Session, category_id: Optional[int] = None):
+        """
+        Linhas (sem ORM) com as colunas do produto e da categoria, para montar
+        respostas grandes sem instanciar objetos nem validar com Pydantic.
+        """
+        query = (
+            db.query(
+                Product.id,
+                Product.name,
+                Product.price,
+                Product.effective_price,
+                Product.stock,
+                Product.category_id,
+                Product.image_path,
+                Product.description,
+                Category.name.label("category_name"),
+                Category.description.label("category_description"),
+                Category.image_path.label("category_image_path"),
+                Category.user_id.label("category_user_id"),
+                Category.product_count.label("category_product_count"),
+            )
+            .join(Category, Product.category_id == Category.id)
+            .order_by(Product.id)
+        )
+        if category_id is not None:
+            query = query.filter(Product.category_id == category_id)
+        return query.all()
+
+    @staticmethod
+    def get_name_rows(db: Session, category_ids: Optional[Iterable[int]] = None):
+        """(id, name, category_id) dos produtos, de todas ou só de algumas categorias."""
+        query = db.query(Product.id, Product.name, Product.category_id)
+        if category_ids is not None:
+            query = query.filter(Product.category_id.in_(list(category_ids)))
+        return query.all()
+
+    @staticmethod
+    def get_discount_rows(db: Session, category_id: Optional[int] = None):
+        now = datetime.utcnow()
+        query = db.query(
+            Discount.id,
+            Discount.description,
+            Discount.discount_percentage,
+            Discount.start_date,
+            Discount.end_date,
+            Discount.product_id,
+        ).filter(
+            Discount.product_id.isnot(None),
+            Discount.start_date <= now,
+            Discount.end_date > now,
+        )
+        if category_id is not None:
+            query = query.join(Product, Discount.product_id == Product.id).filter(
+                Product.category_id == category_id
+            )
+        return query.order_by(Discount.id).all()
+
+    @staticmethod
+    def apply_filters(query: Query, filters: ProductFilters, skip: tuple = ()) -> Query:
+        """Aplica os filtros da listagem; `skip` ignora filtros (usado nas facetas)."""
+        if filters.category_id is not None and "category" not in skip:
+            query = query.filter(Product.category_id == filters.category_id)
+        if "price" not in skip:
+            if filters.min_price is not None:
+                query = query.filter(Product.price >= filters.min_price)
+            if filters.max_price is not None:
+                query = query.filter(Product.price <= filters.max_price)
+        if filters.in_stock:
+            query = query.filter(Product.stock > 0)
+        if filters.on_sale:
+            # effective_price já reflete os descontos vigentes
+            query = query.filter(Product.effective_price < Product.price)
+        return query
+
+    @staticmethod
+    def get_products_page(
+        db: Session,
+        limit: int,
+        sort: str = "id",
+        after: Optional[dict] = None,
+        filters: Optional[ProductFilters] = None,
+    ) -> list[Product]:
+        """
+        Busca uma página de produtos por keyset: em vez de OFFSET, filtra a partir
+        do último item da página anterior, usando a PK ou o índice (price, id).
+        """
+        query = db.query(Product).options(
+            selectinload(Product.discounts),
+            joinedload(Product.category),
+            DiscountRepository.active_only(),
+        )
+        if filters:
+            query = ProductRepository.apply_filters(query, filters)
+
+        if sort == "price":
+            if after:
+                query = query.filter(
+                    tuple_(Product.price, Product.id)
+                    > (Decimal(after["price"]), after["id"])
+                )
+            query = query.order_by(Product.price, Product.id)
+        elif sort == "price_desc":
+            if after:
+                query = query.filter(
+                    tuple_(Product.price, Product.id)
+                    < (Decimal(after["price"]), after["id"])
+                )
+            query = query.order_by(Product.price.desc(), Product.id.desc())
+        elif sort == "newest":
+            if after:
+                query = query.filter(Product.id < after["id"])
+            query = query.order_by(Product.id.desc())
+        else:
+            if after:
+                query = query.filter(Product.id > after["id"])
+            query = query.order_by(Product.id)
+
+        return query.limit(limit).all()
+
+    @staticmethod
+    def count_by_category(db: Session, filters: ProductFilters) -> list[tuple]:
+        # A faceta de categoria ignora o próprio filtro de categoria
+        query = db.query(Category.id, Category.name, func.count(Product.id)).join(
+            Product, Product.category_id == Category.id
+        )
+        query = ProductRepository.apply_filters(query, filters, skip=("category",))
+        return query.group_by(Category.id, Category.name).order_by(Category.name).all()
+
+    @staticmethod
+    def count_by_price_range(
+        db: Session, filters: ProductFilters, boundaries: list[Decimal]
+    ) -> dict[int, int]:
+        """Contagem por faixa de preço; a chave é o índice da faixa em `boundaries`."""
+        bucket = case(
+            *[
+                (Product.price < upper, index)
+                for index, upper in enumerate(boundaries[1:])
+            ],
+            else_=len(boundaries) - 1,
+        )
+        query = db.query(bucket.label("bucket"), func.count(Product.id))
+        query = ProductRepository.apply_filters(query, filters, skip=("price",))
+        return dict(query.group_by("bucket").all())
+
+    @staticmethod
+    def get_catalog_stats(db: Session) -> tuple:
+        """(quantidade, maior id, última alteração) dos produtos; usado como versão do catálogo."""
+        return db.query(
+            func.count(Product.id), func.max(Product.id), func.max(Product.updated_at)
+        ).one()
 
     @staticmethod
     def get_all_products_by_user(db: Session, user_id: int) -> list[Product]:
         return (
             db.query(Product)
             .join(Product.category)
-            .options(joinedload(Product.discounts), joinedload(Product.category))
+            .options(
+                joinedload(Product.discounts),
+                joinedload(Product.category),
+                DiscountRepository.active_only(),
+            )
             .filter(Product.category.has(user_id=user_id))
             .all()
         )
@@ -23,16 +200,30 @@ class ProductRepository:
     def get_product_by_category(db: Session, category_id: int) -> list[Product]:
         return (
             db.query(Product)
-            .options(joinedload(Product.discounts))
+            .options(joinedload(Product.discounts), DiscountRepository.active_only())
             .filter(Product.category_id == category_id)
             .all()
         )
 
+    @staticmethod
+    def get_products_by_ids(db: Session, product_ids: list[int]) -> list[Product]:
+        # Um IN para os produtos e um IN (selectinload) para os descontos
+        return (
+            db.query(Product)
+            .options(
+                selectinload(Product.discounts),
+                joinedload(Product.category),
+                DiscountRepository.active_only(),
+            )
+            .filter(Product.id.in_(product_ids))
+            .all()
+        )
+
     @staticmethod
     def get_product_by_id(db: Session, product_id: int) -> Product:
         return (
             db.query(Product)
-            .options(joinedload(Product.discounts))
+            .options(joinedload(Product.discounts), DiscountRepository.active_only())
             .filter(Product.id == product_id)
             .first()
         )
@@ -40,10 +231,24 @@ class ProductRepository:
     @staticmethod
     def create_product(db: Session, product: Product) -> Product:
         db.add(product)
+        CategoryRepository.adjust_product_count(db, {product.category_id: 1})
         db.commit()
         db.refresh(product)
+        invalidate_catalog({product.category_id}, names_changed=True)
         return product
 
+    @staticmethod
+    def bulk_insert_products(db: Session, rows: list[dict]) -> int:
+        # INSERT em lote (executemany); defaults como effective_price valem por linha
+        if not rows:
+            return 0
+        db.execute(insert(Product), rows)
+        counts = Counter(row["category_id"] for row in rows)
+        CategoryRepository.adjust_product_count(db, counts)
+        db.commit()
+        invalidate_catalog(counts, names_changed=True)
+        return len(rows)
+
     @staticmethod
     def update_stock(db: Session, product_id: int, new_stock: int) -> Product:
         product = db.query(Product).filter(Product.id == product_id).first()
@@ -51,16 +256,93 @@ class ProductRepository:
             product.stock = new_stock
             db.commit()
             db.refresh(product)
+            invalidate_catalog({product.category_id})
         return product
 
+    @staticmethod
+    def bulk_update_stock(db: Session, stocks: dict[int, int]) -> list[int]:
+        """
+        Atualiza o estoque de vários produtos numa única transação, com
+        UPDATE ... FROM (VALUES ...) RETURNING. Retorna os ids atualizados.
+        """
+        updated = []
+        category_ids = set()
+        items = list(stocks.items())
+        for start in range(0, len(items), BULK_STOCK_BATCH_SIZE):
+            new_stocks = (
+                values(column("id", Integer), column("stock", Integer), name="new_stocks")
+                .data(items[start:start + BULK_STOCK_BATCH_SIZE])
+                .cte("new_stocks")
+            )
+            result = db.execute(
+                update(Product)
+                .where(Product.id == new_stocks.c.id)
+                .values(stock=new_stocks.c.stock)
+                .returning(Product.id, Product.category_id)
+                .execution_options(synchronize_session=False)
+            )
+            for product_id, category_id in result:
+                updated.append(product_id)
+                category_ids.add(category_id)
+        db.commit()
+        invalidate_catalog(category_ids)
+        return updated
+
+    @staticmethod
+    def decrement_stock(
+        db: Session, quantities: dict[int, int], exclude_cart_id: Optional[int] = None
+    ) -> dict[int, int]:
+        """
+        Baixa o estoque de vários produtos num único comando, só onde ainda há
+        estoque disponível (descontadas as reservas de outros carrinhos):
+
+            WITH quantities AS (VALUES (id, qty), ...)
+            UPDATE products SET stock = stock - quantities.qty FROM quantities
+            WHERE products.id = quantities.id AND disponível >= quantities.qty
+            RETURNING products.id, products.category_id
+
+        Retorna {product_id: category_id} das linhas baixadas; um produto
+        ausente no retorno não tinha estoque. Não faz commit: roda na transação
+        do pedido, que invalida o cache do catálogo depois do commit.
+        """
+        if not quantities:
+            return {}
+        requested = (
+            values(column("id", Integer), column("qty", Integer), name="quantities")
+            .data(list(quantities.items()))
+            .cte("quantities")
+        )
+        available = Product.stock - StockReservationRepository.reserved_quantity(
+            Product.id, exclude_cart_id
+        )
+        result = db.execute(
+            update(Product)
+            .where(Product.id == requested.c.id, available >= requested.c.qty)
+            .values(stock=Product.stock - requested.c.qty)
+            .returning(Product.id, Product.category_id)
+            .execution_options(synchronize_session=False)
+        )
+        return {product_id: category_id for product_id, category_id in result}
+
     @staticmethod
     def update_product(db: Session, product_id: int, updates: dict) -> Product:
         product = db.query(Product).filter(Product.id == product_id).first()
         if product:
+            old_category_id = product.category_id
             for key, value in updates.items():
                 setattr(product, key, value)
+            if product.category_id != old_category_id:
+                CategoryRepository.adjust_product_count(
+                    db, {old_category_id: -1, product.category_id: 1}
+                )
+                category = CategoryRepository.get_category_by_id(db, product.category_id)
+                SalesRepository.move_product(db, product.id, category.id, category.user_id)
             db.commit()
             db.refresh(product)
+            invalidate_catalog(
+                {old_category_id, product.category_id},
+                names_changed="name" in updates or product.category_id != old_category_id,
+            )
         return product
 
     @staticmethod
@@ -72,7 +354,9 @@ class ProductRepository:
 
         if product:
             db.delete(product)
+            CategoryRepository.adjust_product_count(db, {product.category_id: -1})
             db.commit()
+            invalidate_catalog({product.category_id}, names_changed=True)
 
     @staticmethod
     def update_product_image(db: Session, product_id: int, image_path: str) -> Product:
@@ -81,8 +365,76 @@ class ProductRepository:
             product.image_path = image_path
             db.commit()
             db.refresh(product)
+            invalidate_catalog({product.category_id})
         return product
 
+    @staticmethod
+    def get_display_rows(db: Session, product_ids: list[int]) -> dict:
+        """{product_id: linha com name, image_path e effective_price}, numa consulta."""
+        rows = (
+            db.query(Product.id, Product.name, Product.image_path, Product.effective_price)
+            .filter(Product.id.in_(product_ids))
+            .all()
+        )
+        return {row.id: row for row in rows}
+
+    @staticmethod
+    def get_stock_rows(
+        db: Session, product_ids: list[int], exclude_cart_id: Optional[int] = None
+    ) -> dict[int, tuple[int, Decimal]]:
+        """
+        {product_id: (estoque disponível, preço efetivo)} dos produtos existentes,
+        numa consulta. Disponível = estoque menos as reservas válidas de outros
+        carrinhos (as de `exclude_cart_id` não contam).
+        """
+        reserved = StockReservationRepository.reserved_by_product(product_ids, exclude_cart_id)
+        rows = (
+            db.query(
+                Product.id,
+                Product.stock - func.coalesce(reserved.c.quantity, 0),
+                Product.effective_price,
+            )
+            .outerjoin(reserved, reserved.c.product_id == Product.id)
+            .filter(Product.id.in_(product_ids))
+            .all()
+        )
+        return {product_id: (stock, price) for product_id, stock, price in rows}
+
+    @staticmethod
+    def get_prices(db: Session, product_ids: list[int]) -> dict[int, Decimal]:
+        rows = (
+            db.query(Product.id, Product.price)
+            .filter(Product.id.in_(product_ids))
+            .all()
+        )
+        return {product_id: price for product_id, price in rows}
+
+    @staticmethod
+    def update_effective_prices(db: Session, prices: dict[int, Decimal]):
+        if not prices:
+            return
+        category_ids = ProductRepository.get_category_ids(db, list(prices))
+        # UPDATE em lote pela chave primária (executemany)
+        db.execute(
+            update(Product),
+            [
+                {"id": product_id, "effective_price": price}
+                for product_id, price in prices.items()
+            ],
+        )
+        db.commit()
+        invalidate_catalog(category_ids)
+
+    @staticmethod
+    def get_category_ids(db: Session, product_ids: list[int]) -> set[int]:
+        rows = (
+            db.query(Product.category_id)
+            .filter(Product.id.in_(product_ids))
+            .distinct()
+            .all()
+        )
+        return {category_id for (category_id,) in rows}
+
     @staticmethod
     def get_admin_id_by_product_id(db: Session, product_id: int) -> int:
         product = db.query(Product).filter(Product.id == product_id).first()
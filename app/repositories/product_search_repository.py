@@ -0,0 +1,66 @@
+import re
+from typing import Optional
+from decimal import Decimal
+from sqlalchemy import func, literal_column, table, column, text
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.models.product_model import Product
+from app.repositories.discount_repository import DiscountRepository
+
+MAX_SEARCH_TERMS = 8
+
+products_fts = table("products_fts", column("rowid"))
+
+
+class ProductSearchRepository:
+    @staticmethod
+    def tokenize(query: str) -> list[str]:
+        # Só caracteres de palavra: evita injetar operadores de tsquery/FTS5
+        return re.findall(r"\w+", query.lower())[:MAX_SEARCH_TERMS]
+
+    @staticmethod
+    def search_products(
+        db: Session,
+        terms: list[str],
+        limit: int,
+        category_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+    ) -> list[Product]:
+        """
+        Busca produtos por texto com casamento por prefixo em cada termo,
+        ordenados por relevância (ts_rank_cd no PostgreSQL, bm25 no SQLite).
+        """
+        if not terms:
+            return []
+
+        query = db.query(Product).options(
+            selectinload(Product.discounts),
+            joinedload(Product.category),
+            DiscountRepository.active_only(),
+        )
+
+        if db.get_bind().dialect.name == "postgresql":
+            ts_query = func.to_tsquery(
+                "portuguese", " & ".join(f"{term}:*" for term in terms)
+            )
+            search_vector = literal_column("products.search_vector")
+            query = query.filter(search_vector.op("@@")(ts_query)).order_by(
+                func.ts_rank_cd(search_vector, ts_query).desc(), Product.id
+            )
+        else:
+            match = " ".join(f'"{term}"*' for term in terms)
+            query = (
+                query.join(products_fts, products_fts.c.rowid == Product.id)
+                .filter(text("products_fts MATCH :match").bindparams(match=match))
+                # Nome pesa mais que a descrição; bm25 menor = mais relevante
+                .order_by(func.bm25(literal_column("products_fts"), 10.0, 1.0), Product.id)
+            )
+
+        if category_id is not None:
+            query = query.filter(Product.category_id == category_id)
+        if min_price is not None:
+            query = query.filter(Product.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Product.price <= max_price)
+
+        return query.limit(limit).all()
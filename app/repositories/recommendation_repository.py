@@ -0,0 +1,136 @@
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.orm import Session
+from app.models.order_item_model import OrderItem
+from app.models.recommendation_model import ProductCooccurrence, ProductRecommendation
+from app.utils.sql import dialect_insert
+
+INSERT_BATCH_SIZE = 5000
+
+
+class RecommendationRepository:
+    @staticmethod
+    def get_recommended_ids(db: Session, product_id: int, limit: int) -> list[int]:
+        rows = (
+            db.query(ProductRecommendation.recommended_product_id)
+            .filter(ProductRecommendation.product_id == product_id)
+            .order_by(ProductRecommendation.rank)
+            .limit(limit)
+            .all()
+        )
+        return [recommended_id for (recommended_id,) in rows]
+
+    @staticmethod
+    def get_order_product_pairs(db: Session, after_order_id: int, limit: int) -> list[tuple[int, int]]:
+        """(order_id, product_id) distintos de um lote de pedidos, ordenados por pedido."""
+        order_ids = (
+            select(OrderItem.order_id)
+            .where(OrderItem.order_id > after_order_id)
+            .distinct()
+            .order_by(OrderItem.order_id)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        return (
+            db.query(OrderItem.order_id, OrderItem.product_id)
+            .filter(OrderItem.order_id.in_(order_ids))
+            .distinct()
+            .order_by(OrderItem.order_id)
+            .all()
+        )
+
+    @staticmethod
+    def increment_cooccurrences(db: Session, product_ids: list[int]):
+        """
+        Soma 1 a cada par ordenado de `product_ids` (um pedido novo) com
+        INSERT ... ON CONFLICT DO UPDATE. Não faz commit.
+        """
+        rows = [
+            {"product_id": product_id, "other_product_id": other_id, "orders": 1}
+            for product_id in product_ids
+            for other_id in product_ids
+            if product_id != other_id
+        ]
+        if not rows:
+            return
+        stmt = dialect_insert(db, ProductCooccurrence)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["product_id", "other_product_id"],
+                set_={"orders": ProductCooccurrence.orders + stmt.excluded.orders},
+            ),
+            rows,
+        )
+
+    @staticmethod
+    def refresh_top_k(db: Session, product_ids: list[int], k: int):
+        """
+        Recalcula o top-K de `product_ids` a partir das co-ocorrências: UPSERT
+        por (product_id, rank) e remoção das posições que sobraram, para que
+        duas atualizações simultâneas do mesmo produto não colidam na chave.
+        """
+        ranked = (
+            select(
+                ProductCooccurrence.product_id,
+                ProductCooccurrence.other_product_id,
+                ProductCooccurrence.orders,
+                (
+                    func.row_number().over(
+                        partition_by=ProductCooccurrence.product_id,
+                        order_by=(
+                            ProductCooccurrence.orders.desc(),
+                            ProductCooccurrence.other_product_id,
+                        ),
+                    )
+                    - 1
+                ).label("rank"),
+            )
+            .where(ProductCooccurrence.product_id.in_(product_ids))
+            .subquery()
+        )
+        rows = db.execute(select(ranked).where(ranked.c.rank < k)).all()
+
+        if rows:
+            stmt = dialect_insert(db, ProductRecommendation)
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["product_id", "rank"],
+                    set_={
+                        "recommended_product_id": stmt.excluded.recommended_product_id,
+                        "score": stmt.excluded.score,
+                    },
+                ),
+                [
+                    {
+                        "product_id": product_id,
+                        "rank": rank,
+                        "recommended_product_id": other_id,
+                        "score": orders,
+                    }
+                    for product_id, other_id, orders, rank in rows
+                ],
+            )
+
+        stale = delete(ProductRecommendation).where(
+            ProductRecommendation.product_id.in_(product_ids)
+        )
+        if rows:
+            stale = stale.where(
+                tuple_(ProductRecommendation.product_id, ProductRecommendation.rank).notin_(
+                    [(product_id, rank) for product_id, _, _, rank in rows]
+                )
+            )
+        db.execute(stale)
+        db.commit()
+
+    @staticmethod
+    def replace_all(db: Session, cooccurrences: list[dict], recommendations: list[dict]):
+        """Troca o conteúdo das duas tabelas numa única transação (reconstrução completa)."""
+        db.execute(delete(ProductRecommendation))
+        db.execute(delete(ProductCooccurrence))
+        for model, rows in (
+            (ProductCooccurrence, cooccurrences),
+            (ProductRecommendation, recommendations),
+        ):
+            for start in range(0, len(rows), INSERT_BATCH_SIZE):
+                db.execute(insert(model), rows[start:start + INSERT_BATCH_SIZE])
+        db.commit()
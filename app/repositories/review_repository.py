@@ -0,0 +1,108 @@
+from typing import Optional
+from sqlalchemy.orm import Session, joinedload
+from app.models.product_model import Product
+from app.models.review_model import Review, ProductRatingSummary
+from app.repositories.discount_repository import DiscountRepository
+from app.utils.sql import dialect_insert
+
+summary_table = ProductRatingSummary.__table__
+RATING_COLUMNS = {rating: f"rating_{rating}" for rating in range(1, 6)}
+
+
+class ReviewRepository:
+    @staticmethod
+    def get_reviews_by_user(db: Session, user_id: int) -> list[Review]:
+        return (
+            db.query(Review)
+            .options(
+                joinedload(Review.product).selectinload(Product.discounts),
+                joinedload(Review.product).joinedload(Product.category),
+                DiscountRepository.active_only(),
+            )
+            .filter(Review.user_id == user_id)
+            .order_by(Review.id.desc())
+            .all()
+        )
+
+    @staticmethod
+    def get_review_by_id(db: Session, review_id: int) -> Optional[Review]:
+        return db.query(Review).filter(Review.id == review_id).first()
+
+    @staticmethod
+    def get_review_by_user_and_product(db: Session, user_id: int, product_id: int) -> Optional[Review]:
+        return (
+            db.query(Review)
+            .filter(Review.user_id == user_id, Review.product_id == product_id)
+            .first()
+        )
+
+    @staticmethod
+    def get_product_reviews_page(
+        db: Session, product_id: int, limit: int, before_id: Optional[int] = None
+    ) -> list[Review]:
+        """Avaliações mais recentes primeiro, por keyset em (product_id, id)."""
+        query = db.query(Review).filter(Review.product_id == product_id)
+        if before_id is not None:
+            query = query.filter(Review.id < before_id)
+        return query.order_by(Review.id.desc()).limit(limit).all()
+
+    @staticmethod
+    def get_rating_summary(db: Session, product_id: int) -> Optional[ProductRatingSummary]:
+        return db.get(ProductRatingSummary, product_id)
+
+    @staticmethod
+    def apply_rating_change(
+        db: Session, product_id: int, removed: Optional[int] = None, added: Optional[int] = None
+    ):
+        """
+        Atualiza o agregado do produto: tira a nota `removed` e soma a nota
+        `added` num único UPSERT. Não faz commit; roda na transação da avaliação.
+        """
+        delta = {"review_count": 0, "rating_sum": 0}
+        delta.update({column: 0 for column in RATING_COLUMNS.values()})
+        if removed is not None:
+            delta["review_count"] -= 1
+            delta["rating_sum"] -= removed
+            delta[RATING_COLUMNS[removed]] -= 1
+        if added is not None:
+            delta["review_count"] += 1
+            delta["rating_sum"] += added
+            delta[RATING_COLUMNS[added]] += 1
+
+        stmt = dialect_insert(db, summary_table).values(product_id=product_id, **delta)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["product_id"],
+                set_={
+                    column: summary_table.c[column] + stmt.excluded[column]
+                    for column in delta
+                },
+            )
+        )
+
+    @staticmethod
+    def create_review(db: Session, review: Review) -> Review:
+        db.add(review)
+        ReviewRepository.apply_rating_change(db, review.product_id, added=review.rating)
+        db.commit()
+        db.refresh(review)
+        return review
+
+    @staticmethod
+    def update_review(db: Session, review: Review, updates: dict) -> Review:
+        previous_rating = review.rating
+        for key, value in updates.items():
+            setattr(review, key, value)
+        if review.rating != previous_rating:
+            ReviewRepository.apply_rating_change(
+                db, review.product_id, removed=previous_rating, added=review.rating
+            )
+        db.commit()
+        db.refresh(review)
+        return review
+
+    @staticmethod
+    def delete_review(db: Session, review: Review):
+        db.delete(review)
+        ReviewRepository.apply_rating_change(db, review.product_id, removed=review.rating)
+        db.commit()
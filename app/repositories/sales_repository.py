@@ -0,0 +1,136 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+from typing import Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from app.models.category_model import Category
+from app.models.order_model import Order, OrderStatus, get_brazil_datetime
+from app.models.order_item_model import OrderItem
+from app.models.product_model import Product
+from app.models.sales_model import ProductSalesDaily
+from app.utils.sql import dialect_insert
+
+sales_table = ProductSalesDaily.__table__
+
+# Pedidos nesses status não contam como venda
+NOT_SOLD_STATUSES = {OrderStatus.CANCELLED, OrderStatus.FAILED, OrderStatus.REFUNDED}
+
+
+def is_sold(status: Optional[OrderStatus]) -> bool:
+    return status is not None and status not in NOT_SOLD_STATUSES
+
+
+class SalesRepository:
+    @staticmethod
+    def get_product_owners(db: Session, product_ids: set[int]) -> dict[int, tuple[int, int]]:
+        """{product_id: (category_id, admin_id)}; o admin é o dono da categoria."""
+        rows = db.execute(
+            select(Product.id, Product.category_id, Category.user_id)
+            .join(Category, Product.category_id == Category.id)
+            .where(Product.id.in_(product_ids))
+        ).all()
+        return {product_id: (category_id, admin_id) for product_id, category_id, admin_id in rows}
+
+    @staticmethod
+    def add_sales(db: Session, rows: list[dict]):
+        """Soma units/revenue ao rollup com INSERT ... ON CONFLICT DO UPDATE. Não faz commit."""
+        stmt = dialect_insert(db, sales_table)
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["product_id", "day"],
+                set_={
+                    "units": sales_table.c.units + stmt.excluded.units,
+                    "revenue": sales_table.c.revenue + stmt.excluded.revenue,
+                },
+            ),
+            rows,
+        )
+
+    @staticmethod
+    def add_order_sales(db: Session, order: Order, items: list[OrderItem], sign: int = 1):
+        """
+        Soma (sign=1) ou subtrai (sign=-1) os itens do pedido nas vendas do dia
+        do pedido. Não faz commit; roda na transação que grava o pedido.
+        """
+        totals = defaultdict(lambda: [0, Decimal(0)])
+        for item in items:
+            total = totals[item.product_id]
+            total[0] += sign * item.quantity
+            total[1] += sign * item.quantity * Decimal(item.unit_price)
+        if not totals:
+            return
+
+        day = (order.order_date or get_brazil_datetime()).date()
+        owners = SalesRepository.get_product_owners(db, set(totals))
+        rows = [
+            {
+                "product_id": product_id,
+                "day": day,
+                "category_id": owners[product_id][0],
+                "admin_id": owners[product_id][1],
+                "units": units,
+                "revenue": revenue,
+            }
+            for product_id, (units, revenue) in totals.items()
+            if product_id in owners
+        ]
+        if rows:
+            SalesRepository.add_sales(db, rows)
+
+    @staticmethod
+    def change_order_status(db: Session, order: Order, status: OrderStatus):
+        """
+        Troca o status do pedido acompanhando o rollup: se o pedido passa a
+        contar como venda (ou deixa de contar), seus itens são somados (ou
+        subtraídos). Não faz commit.
+        """
+        sign = int(is_sold(status)) - int(is_sold(order.status))
+        if sign:
+            SalesRepository.add_order_sales(db, order, order.order_items, sign)
+        order.status = status
+
+    @staticmethod
+    def move_product(db: Session, product_id: int, category_id: int, admin_id: int):
+        """Acompanha a troca de categoria do produto. Não faz commit."""
+        db.execute(
+            update(ProductSalesDaily)
+            .where(ProductSalesDaily.product_id == product_id)
+            .values(category_id=category_id, admin_id=admin_id)
+        )
+
+    @staticmethod
+    def get_best_sellers(
+        db: Session,
+        since: date,
+        limit: int,
+        order_by: str = "units",
+        category_id: Optional[int] = None,
+        admin_id: Optional[int] = None,
+    ) -> list:
+        units = func.sum(ProductSalesDaily.units).label("units")
+        revenue = func.sum(ProductSalesDaily.revenue).label("revenue")
+        ranking = (
+            select(ProductSalesDaily.product_id, units, revenue)
+            .where(ProductSalesDaily.day >= since)
+            .group_by(ProductSalesDaily.product_id)
+        )
+        if category_id is not None:
+            ranking = ranking.where(ProductSalesDaily.category_id == category_id)
+        if admin_id is not None:
+            ranking = ranking.where(ProductSalesDaily.admin_id == admin_id)
+        primary = revenue if order_by == "revenue" else units
+        ranking = (
+            ranking.having(units > 0)
+            .order_by(primary.desc(), ProductSalesDaily.product_id)
+            .limit(limit)
+            .subquery()
+        )
+
+        primary = ranking.c.revenue if order_by == "revenue" else ranking.c.units
+        return (
+            db.query(ranking.c.product_id, Product.name, ranking.c.units, ranking.c.revenue)
+            .join(Product, Product.id == ranking.c.product_id)
+            .order_by(primary.desc(), ranking.c.product_id)
+            .all()
+        )
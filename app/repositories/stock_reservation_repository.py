@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+from typing import Iterable, Optional
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+from app.config import STOCK_RESERVATION_TTL_SECONDS
+from app.models.stock_reservation_model import StockReservation
+from app.utils.sql import dialect_insert
+
+
+class StockReservationRepository:
+    @staticmethod
+    def reserved_quantity(product_id, exclude_cart_id: Optional[int] = None):
+        """
+        Subconsulta escalar: soma das reservas válidas do produto, fora as do
+        carrinho informado. `product_id` pode ser um id ou a coluna Product.id
+        (correlacionada com a consulta externa).
+        """
+        query = select(func.coalesce(func.sum(StockReservation.quantity), 0)).where(
+            StockReservation.product_id == product_id,
+            StockReservation.expires_at > datetime.utcnow(),
+        )
+        if exclude_cart_id is not None:
+            query = query.where(StockReservation.cart_id != exclude_cart_id)
+        return query.scalar_subquery()
+
+    @staticmethod
+    def reserved_by_product(product_ids: Iterable[int], exclude_cart_id: Optional[int] = None):
+        """Subconsulta (product_id, quantity) com as reservas válidas somadas por produto."""
+        query = (
+            select(
+                StockReservation.product_id,
+                func.sum(StockReservation.quantity).label("quantity"),
+            )
+            .where(
+                StockReservation.product_id.in_(list(product_ids)),
+                StockReservation.expires_at > datetime.utcnow(),
+            )
+            .group_by(StockReservation.product_id)
+        )
+        if exclude_cart_id is not None:
+            query = query.where(StockReservation.cart_id != exclude_cart_id)
+        return query.subquery()
+
+    @staticmethod
+    def reserve(db: Session, cart_id: int, quantities: dict[int, int]):
+        """
+        Ajusta as reservas do carrinho para {product_id: quantidade} e renova
+        o prazo; quantidade 0 libera a reserva. Não faz commit.
+        """
+        released = [product_id for product_id, quantity in quantities.items() if quantity <= 0]
+        if released:
+            StockReservationRepository.release(db, cart_id, released)
+
+        expires_at = datetime.utcnow() + timedelta(seconds=STOCK_RESERVATION_TTL_SECONDS)
+        rows = [
+            {"cart_id": cart_id, "product_id": product_id, "quantity": quantity, "expires_at": expires_at}
+            for product_id, quantity in quantities.items()
+            if quantity > 0
+        ]
+        if rows:
+            stmt = dialect_insert(db, StockReservation)
+            db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=["cart_id", "product_id"],
+                    set_={"quantity": stmt.excluded.quantity, "expires_at": stmt.excluded.expires_at},
+                ),
+                rows,
+            )
+
+    @staticmethod
+    def release(db: Session, cart_id: int, product_ids: Optional[Iterable[int]] = None):
+        """Apaga as reservas do carrinho (todas, ou só as de `product_ids`). Não faz commit."""
+        stmt = delete(StockReservation).where(StockReservation.cart_id == cart_id)
+        if product_ids is not None:
+            stmt = stmt.where(StockReservation.product_id.in_(list(product_ids)))
+        db.execute(stmt)
+
+    @staticmethod
+    def delete_expired(db: Session, now: datetime, limit: int) -> int:
+        """Apaga até `limit` reservas vencidas e retorna quantas apagou."""
+        expired = (
+            select(StockReservation.id)
+            .where(StockReservation.expires_at <= now)
+            .limit(limit)
+            .scalar_subquery()
+        )
+        result = db.execute(delete(StockReservation).where(StockReservation.id.in_(expired)))
+        db.commit()
+        return result.rowcount
@@ -4,9 +4,10 @@ from pydantic import BaseModel, HttpUrl
 from typing import List, Optional
 import stripe
 from dotenv import load_dotenv
-from app.utils.email_utils import send_purchase_email
+from app.services.email_outbox_service import EmailOutboxService, email_outbox_worker
 from app.models.order_model import Order, OrderStatus
 from app.repositories.order_repository import OrderRepository
+from app.repositories.sales_repository import SalesRepository
 from app.models.user_model import User
 from sqlalchemy.orm import Session
 from app.database import get_db
@@ -118,20 +119,18 @@ async def stripe_webhook(request: Request):
             if order:
                 pm_types = session.get("payment_method_types", [])
                 if "boleto" in pm_types:
-                    order.status = OrderStatus.PENDING  # boleto precisa confirmação assíncrona
+                    SalesRepository.change_order_status(db, order, OrderStatus.PENDING)  # boleto precisa confirmação assíncrona
                     _safe_set(order, "payment_method", "boleto")
                 else:
-                    order.status = OrderStatus.PAID
+                    SalesRepository.change_order_status(db, order, OrderStatus.PAID)
                     _safe_set(order, "payment_method", "card")
                 if stripe_pi:
                     _safe_set(order, "stripe_payment_intent", stripe_pi)
                 _safe_set(order, "stripe_session_id", session.get("id"))
+                # E-mail de confirmação/instruções vai para a fila, na mesma transação
+                EmailOutboxService.enqueue_purchase_email(db, user_email or order.user.email, order.id)
                 db.commit()
-                try:
-                    # Envia e-mail de confirmação/instruções (no boleto você pode enviar com instruções)
-                    send_purchase_email(user_email, order)
-                except Exception as e:
-                    print("Erro ao enviar email:", e)
+                email_outbox_worker.notify()
 
     # --- 2) Eventos de pagamento assíncrono do Checkout (ex.: boleto) ---
     elif event_type == "checkout.session.async_payment_succeeded":
@@ -143,15 +142,13 @@ async def stripe_webhook(request: Request):
         if order_id:
             order = OrderRepository.get_order_by_id(db, int(order_id))
             if order and order.status != OrderStatus.PAID:
-                order.status = OrderStatus.PAID
+                SalesRepository.change_order_status(db, order, OrderStatus.PAID)
                 _safe_set(order, "payment_method", getattr(order, "payment_method", "boleto") or "boleto")
                 if stripe_pi:
                     _safe_set(order, "stripe_payment_intent", stripe_pi)
+                EmailOutboxService.enqueue_purchase_email(db, order.user.email, order.id)
                 db.commit()
-                try:
-                    send_purchase_email(order.user.email, order)
-                except Exception as e:
-                    print("Erro ao enviar email:", e)
+                email_outbox_worker.notify()
 
     elif event_type == "checkout.session.async_payment_failed":
         session = data
@@ -162,13 +159,13 @@ async def stripe_webhook(request: Request):
             if order:
                 # Marque como failed/cancelled conforme seu modelo (aqui uso FAILED quando existir)
                 try:
-                    order.status = OrderStatus.FAILED
+                    SalesRepository.change_order_status(db, order, OrderStatus.FAILED)
                 except Exception:
                     # se não existir o enum/valor, tenta CANCELLED
                     try:
-                        order.status = OrderStatus.CANCELLED
+                        SalesRepository.change_order_status(db, order, OrderStatus.CANCELLED)
                     except Exception:
-                        order.status = OrderStatus.PENDING
+                        SalesRepository.change_order_status(db, order, OrderStatus.PENDING)
                 db.commit()
 
     # --- 3) Fallback: PaymentIntent.succeeded (muitas vezes é emitido quando o pagamento é confirmado) ---
@@ -212,7 +209,7 @@ async def stripe_webhook(request: Request):
         if order_id:
             order = OrderRepository.get_order_by_id(db, int(order_id))
             if order and order.status != OrderStatus.PAID:
-                order.status = OrderStatus.PAID
+                SalesRepository.change_order_status(db, order, OrderStatus.PAID)
                 # Se já existir payment_method no pedido, não sobrescrever; caso contrário, usa o inferido ou 'card' por padrão
                 current_pm = getattr(order, "payment_method", None)
                 if current_pm:
@@ -220,11 +217,9 @@ async def stripe_webhook(request: Request):
                 else:
                     _safe_set(order, "payment_method", inferred_method or "card")
                 _safe_set(order, "stripe_payment_intent", payment_intent_id)
+                EmailOutboxService.enqueue_purchase_email(db, order.user.email, order.id)
                 db.commit()
-                try:
-                    send_purchase_email(order.user.email, order)
-                except Exception as e:
-                    print("Erro ao enviar email:", e)
+                email_outbox_worker.notify()
 
     # --- 4) Outras notificações úteis ---
     elif event_type == "charge.refunded":
@@ -236,9 +231,9 @@ async def stripe_webhook(request: Request):
                 order = OrderRepository.get_order_by_id(db, int(order_id))
                 if order:
                     try:
-                        order.status = OrderStatus.REFUNDED
+                        SalesRepository.change_order_status(db, order, OrderStatus.REFUNDED)
                     except Exception:
-                        order.status = OrderStatus.PENDING
+                        SalesRepository.change_order_status(db, order, OrderStatus.PENDING)
                     db.commit()
         except Exception as e:
             print("Erro ao processar refund webhook:", e)
@@ -337,21 +332,19 @@ async def confirm_payment_manual(payload: ConfirmPaymentPayload):
         raise HTTPException(status_code=404, detail="Pedido não encontrado")
 
     try:
-        order.status = OrderStatus.PAID
+        SalesRepository.change_order_status(db, order, OrderStatus.PAID)
         # grava method e payment intent se colunas existirem
         if hasattr(order, "payment_method"):
             order.payment_method = (payload.method or "card").lower()
         if hasattr(order, "stripe_payment_intent") and payload.payment_intent_id:
             order.stripe_payment_intent = payload.payment_intent_id
+        # e-mail de confirmação entra na fila junto com o pagamento
+        EmailOutboxService.enqueue_purchase_email(db, order.user.email, order.id)
         db.commit()
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Erro ao atualizar pedido: {e}")
 
-    try:
-        # opcional: enviar email de confirmação
-        send_purchase_email(order.user.email, order)
-    except Exception:
-        pass
+    email_outbox_worker.notify()
 
     return {"status": "ok", "order_id": order.id}
\ No newline at end of file
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import Literal, Optional
 from app.schemas.product_schema import ProductResponse
 
 class CartItemBase(BaseModel):
@@ -9,7 +9,7 @@ class CartItemBase(BaseModel):
 
 
 class CartItemCreate(CartItemBase):
-    pass
+    quantity: int = Field(gt=0)
 
 
 class CartItemRemove(BaseModel):
@@ -18,14 +18,37 @@ class CartItemRemove(BaseModel):
 
 class CartItemUpdate(BaseModel):
     product_id: int
-    quantity: int
+    quantity: int = Field(gt=0)
 
 
 class CartItemResponse(CartItemBase):
-    id: int
+    # None para itens do carrinho write-behind ainda não gravados no banco
+    id: Optional[int] = None
     cart_id: int
     image_path: Optional[str]
     name: str
+    # Preço atual do produto (unit_price é o preço no momento em que foi adicionado)
+    effective_price: Optional[float] = None
 
     class Config:
         model_config = {"from_attributes": True}
+
+
+# Máximo de operações aceitas em um único lote
+MAX_BATCH_OPERATIONS = 100
+
+
+class CartItemOperation(BaseModel):
+    op: Literal["add", "update", "remove"]
+    product_id: int
+    quantity: Optional[int] = Field(None, gt=0)
+
+    @model_validator(mode="after")
+    def check_quantity(self):
+        if self.op != "remove" and self.quantity is None:
+            raise ValueError("quantity is required for add and update")
+        return self
+
+
+class CartItemBatch(BaseModel):
+    operations: list[CartItemOperation] = Field(min_length=1, max_length=MAX_BATCH_OPERATIONS)
@@ -28,7 +28,7 @@ class CategoryResponse(BaseModel):
     description: Optional[str] = None
     image_path: Optional[str] = None
     user_id: int
-    product_count: int = 0  # Novo campo
+    product_count: int = 0
     
     class Config:
         orm_mode = True
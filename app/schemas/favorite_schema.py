@@ -12,4 +12,7 @@ class FavoriteResponse(FavoriteBase):
     product: ProductResponse
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class FavoriteIdsResponse(BaseModel):
+    product_ids: list[int]
@@ -29,7 +29,7 @@ class OrderItemBase(BaseModel):
 
 class OrderItemCreate(BaseModel):
     product_id: int
-    quantity: int
+    quantity: int = Field(gt=0)
     unit_price: Annotated[Decimal, Field(max_digits=10, decimal_places=2)]
 
 class OrderBase(BaseModel):
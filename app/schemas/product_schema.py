@@ -31,12 +31,75 @@ class ProductUpdateStock(BaseModel):
     stock: Optional[int] = None
 
 
+class ProductBulkStockUpdate(BaseModel):
+    stocks: dict[int, Annotated[int, Field(ge=0)]] = Field(max_length=20000)
+
+
+class ProductBulkStockResponse(BaseModel):
+    updated: list[int]
+    missing: list[int]
+
+
 class ProductImageUpdate(BaseModel):
     image_path: Optional[str] = None
 
 class ProductResponse(ProductBase):
     id: int
+    effective_price: Optional[Annotated[Decimal, Field(max_digits=10, decimal_places=2)]] = None
     category: CategoryResponse
     discounts: list[DiscountResponse]
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class ProductSuggestion(BaseModel):
+    id: int
+    name: str
+    category_id: int
+
+
+class ProductBatchResponse(BaseModel):
+    items: list[ProductResponse]
+    missing: list[int]
+
+
+class ProductImportError(BaseModel):
+    line: int
+    error: str
+
+
+class ProductImportResponse(BaseModel):
+    inserted: int
+    failed: int
+    errors: list[ProductImportError]
+
+
+class ProductFilters(BaseModel):
+    category_id: Optional[int] = None
+    min_price: Optional[Decimal] = None
+    max_price: Optional[Decimal] = None
+    in_stock: bool = False
+    on_sale: bool = False
+
+
+class CategoryFacet(BaseModel):
+    category_id: int
+    name: str
+    count: int
+
+
+class PriceRangeFacet(BaseModel):
+    min_price: Decimal
+    max_price: Optional[Decimal] = None
+    count: int
+
+
+class ProductFacets(BaseModel):
+    categories: list[CategoryFacet]
+    price_ranges: list[PriceRangeFacet]
+
+
+class ProductPageResponse(BaseModel):
+    items: list[ProductResponse]
+    next_cursor: Optional[str] = None
+    facets: Optional[ProductFacets] = None
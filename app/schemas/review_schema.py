@@ -1,19 +1,19 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from app.schemas.product_schema import ProductResponse
 
 class ReviewBase(BaseModel):
     product_id: int
-    rating: int
-    comment: Optional[str] = None
+    rating: int = Field(ge=1, le=5)
+    comment: Optional[str] = Field(None, max_length=500)
 
 class ReviewCreate(ReviewBase):
     pass
 
 class ReviewUpdate(BaseModel):
-    rating: Optional[int] = None
-    comment: Optional[str] = None
+    rating: Optional[int] = Field(None, ge=1, le=5)
+    comment: Optional[str] = Field(None, max_length=500)
 
 class ReviewResponse(ReviewBase):
     id: int
@@ -21,4 +21,22 @@ class ReviewResponse(ReviewBase):
     product: ProductResponse
 
     class Config:
-        orm_mode = True
\ No newline at end of file
+        orm_mode = True
+
+class ProductReviewResponse(ReviewBase):
+    id: int
+    user_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class ProductReviewPageResponse(BaseModel):
+    items: list[ProductReviewResponse]
+    next_cursor: Optional[str] = None
+
+class RatingSummaryResponse(BaseModel):
+    product_id: int
+    review_count: int
+    average_rating: Optional[float] = None
+    histogram: dict[int, int]
@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+from decimal import Decimal
+
+
+class BestSellerResponse(BaseModel):
+    product_id: int
+    name: str
+    units: int
+    revenue: Annotated[Decimal, Field(max_digits=12, decimal_places=2)]
@@ -0,0 +1,157 @@
+import bisect
+import re
+import threading
+import unicodedata
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.core.cache import on_catalog_change
+from app.repositories.product_repository import ProductRepository
+
+# Maior ponto de código: (prefixo + MAX_CHAR) limita o intervalo de um prefixo
+MAX_CHAR = "\U0010ffff"
+# Acima disso, reordenar a lista inteira sai mais barato que inserir um a um
+INCREMENTAL_MAX_CHANGES = 512
+
+
+def normalize(text: str) -> str:
+    """Minúsculas, sem acentos e com espaços simples: "Câmera  HD" -> "camera hd"."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(re.findall(r"\w+", stripped.casefold()))
+
+
+class ProductAutocompleteIndex:
+    """
+    Índice de prefixos em memória sobre os nomes dos produtos, em duas listas
+    ordenadas de (chave, product_id):
+
+    - nomes: o nome normalizado inteiro ("mouse gamer rgb");
+    - palavras: o nome a partir de cada palavra seguinte ("gamer rgb", "rgb").
+
+    Um prefixo vira um intervalo achado com bisect em cada lista; quem casa no
+    início do nome vem antes. As escritas que mudam nomes ou categorias de
+    produtos só marcam as categorias afetadas (via on_catalog_change, com
+    names_only) e a consulta seguinte relê os nomes dessas categorias,
+    atualizando o índice aos poucos. Estoque, preço e descontos não contam.
+    """
+
+    def __init__(self):
+        # _lock protege as listas; _refresh_lock serializa as releituras, que
+        # consultam o banco sem segurar _lock
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._names: list[tuple[str, int]] = []
+        self._words: list[tuple[str, int]] = []
+        # product_id -> (nome, category_id)
+        self._products: dict[int, tuple[str, int]] = {}
+        # None = o índice inteiro precisa ser (re)carregado
+        self._dirty: Optional[set[int]] = None
+
+    def mark_dirty(self, category_ids: Optional[set[int]]):
+        with self._lock:
+            if category_ids is None or self._dirty is None:
+                self._dirty = None
+            else:
+                self._dirty |= category_ids
+
+    @staticmethod
+    def entries_for(product_id: int, name: str) -> tuple[list, list]:
+        words = normalize(name).split(" ")
+        suffixes = [(" ".join(words[position:]), product_id) for position in range(len(words))]
+        return suffixes[:1], suffixes[1:]
+
+    @staticmethod
+    def apply_changes(entries: list, removed: list, added: list) -> list:
+        if len(removed) + len(added) > INCREMENTAL_MAX_CHANGES:
+            removed = set(removed)
+            return sorted([entry for entry in entries if entry not in removed] + added)
+        for entry in removed:
+            index = bisect.bisect_left(entries, entry)
+            if index < len(entries) and entries[index] == entry:
+                del entries[index]
+        for entry in added:
+            bisect.insort(entries, entry)
+        return entries
+
+    def _take_dirty(self) -> Optional[set[int]]:
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return dirty
+
+    def _refresh(self, db: Session):
+        with self._refresh_lock:
+            dirty = self._take_dirty()
+            if dirty is not None and not dirty:
+                return
+            try:
+                rows = ProductRepository.get_name_rows(db, dirty)
+            except Exception:
+                self.mark_dirty(dirty)
+                raise
+            with self._lock:
+                self._apply(dirty, rows)
+
+    def _apply(self, dirty: Optional[set[int]], rows: list):
+        # Chamado com o lock adquirido
+        if dirty is None:
+            stale = list(self._products)
+            self._names, self._words = [], []
+        else:
+            stale = [
+                product_id
+                for product_id, (_, category_id) in self._products.items()
+                if category_id in dirty
+            ]
+
+        removed_names, removed_words = [], []
+        for product_id in stale:
+            name, _ = self._products.pop(product_id)
+            names, words = self.entries_for(product_id, name)
+            removed_names += names
+            removed_words += words
+
+        added_names, added_words = [], []
+        for product_id, name, category_id in rows:
+            self._products[product_id] = (name, category_id)
+            names, words = self.entries_for(product_id, name)
+            added_names += names
+            added_words += words
+
+        if dirty is None:
+            removed_names, removed_words = [], []
+        self._names = self.apply_changes(self._names, removed_names, added_names)
+        self._words = self.apply_changes(self._words, removed_words, added_words)
+
+    def suggest(self, db: Session, query: str, limit: int) -> list[dict]:
+        """
+        Produtos com alguma palavra do nome começando por `query`, sem
+        diferenciar acentos e maiúsculas: primeiro os que casam no início do
+        nome, depois os demais, cada grupo em ordem alfabética.
+        """
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        self._refresh(db)
+        with self._lock:
+            found: list[int] = []
+            for entries in (self._names, self._words):
+                index = bisect.bisect_left(entries, (prefix,))
+                end = bisect.bisect_left(entries, (prefix + MAX_CHAR,))
+                while index < end and len(found) < limit:
+                    product_id = entries[index][1]
+                    if product_id not in found:
+                        found.append(product_id)
+                    index += 1
+            return [
+                {
+                    "id": product_id,
+                    "name": self._products[product_id][0],
+                    "category_id": self._products[product_id][1],
+                }
+                for product_id in found
+            ]
+
+
+product_autocomplete = ProductAutocompleteIndex()
+on_catalog_change(product_autocomplete.mark_dirty, names_only=True)
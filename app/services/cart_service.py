@@ -1,3 +1,4 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.cart_repository import CartRepository
@@ -8,13 +9,20 @@ from app.schemas.cart_item_schema import (
     CartItemRemove,
     CartItemUpdate,
     CartItemResponse,
+    CartItemBatch,
+    CartItemOperation,
 )
 from app.schemas.cart_schema import CartItemsResponse
 from app.models.cart_item_model import CartItem
-from app.services.product_service import ProductService
+from app.repositories.product_repository import ProductRepository
+from app.repositories.stock_reservation_repository import StockReservationRepository
+from app.services.cart_store_service import WriteBehindCartStore, cart_store
 
 
 class CartService:
+    # Backend write-behind opcional (CART_STORE_BACKEND); None = direto no banco
+    store: Optional[WriteBehindCartStore] = cart_store
+
     @staticmethod
     def get_cart_by_user(db: Session, user: User) -> Cart:
         cart = CartRepository.get_cart_by_user(db, user.id)
@@ -24,20 +32,56 @@ class CartService:
 
     @staticmethod
     def get_cart_items(db: Session, user: User) -> CartItemsResponse:
-        cart = CartRepository.get_cart_by_user(db, user.id)
-        if not cart:
+        return CartService.get_cart_items_by_user_id(db, user.id)
+
+    @staticmethod
+    def get_cart_items_by_user_id(db: Session, user_id: int) -> CartItemsResponse:
+        if CartService.store is not None:
+            return CartService.get_store_cart_items(db, user_id)
+
+        rows = CartRepository.get_cart_item_rows(db, user_id)
+        if not rows:
             raise HTTPException(status_code=404, detail="Cart not found")
 
         total = 0
         items = []
 
-        for item in cart.cart_items:
-            total += item.quantity * item.unit_price
-            item.image_path = ProductService.get_product_image_path(db, item.product_id)
-            item.name = item.product.name
-            items.append(CartItemResponse.model_validate(item.__dict__))
+        for row in rows:
+            if row.id is None:
+                continue
+            total += row.quantity * row.unit_price
+            items.append(CartItemResponse.model_validate(row._mapping))
+
+        return CartItemsResponse(cart_id=rows[0].cart_id, items=items, total_amount=total)
+
+    @staticmethod
+    def get_store_cart_items(db: Session, user_id: int) -> CartItemsResponse:
+        state = CartService.store.load(db, user_id)
+        if state is None:
+            raise HTTPException(status_code=404, detail="Cart not found")
+
+        products = ProductRepository.get_display_rows(db, list(state["items"]))
+        total = 0
+        items = []
+        for product_id, item in state["items"].items():
+            product = products.get(product_id)
+            if product is None:
+                continue
+            total += item["quantity"] * item["unit_price"]
+            items.append(
+                CartItemResponse(
+                    id=item["id"],
+                    cart_id=state["cart_id"],
+                    product_id=product_id,
+                    quantity=item["quantity"],
+                    unit_price=item["unit_price"],
+                    name=product.name,
+                    image_path=product.image_path,
+                    effective_price=product.effective_price,
+                )
+            )
 
-        return CartItemsResponse(cart_id=cart.id, items=items, total_amount=total)
+        return CartItemsResponse(cart_id=state["cart_id"], items=items, total_amount=total)
 
     @staticmethod
     def create_cart(db: Session, user: User) -> Cart:
@@ -48,30 +92,148 @@ class CartService:
         return cart
 
     @staticmethod
-    def add_item_to_cart(db: Session, cart_item: CartItemCreate, user: User) -> Cart:
+    def add_item_to_cart(db: Session, cart_item: CartItemCreate, user: User):
+        if CartService.store is not None:
+            CartService.apply_to_store(db, user.id, [
+                CartItemOperation(op="add", product_id=cart_item.product_id, quantity=cart_item.quantity)
+            ])
+            return
+
         cart = CartRepository.get_cart_by_user(db, user.id)
         if not cart:
             raise HTTPException(status_code=404, detail="Cart not found")
 
-        product = ProductService.get_product_by_id(db, cart_item.product_id)
-        if not product:
-            raise HTTPException(status_code=404, detail="Product not found")
-
-        if product.stock < cart_item.quantity or product.stock == 0:
+        # Produto já no carrinho: a quantidade é somada à existente
+        quantity = CartRepository.upsert_item(
+            db, cart.id, cart_item.product_id, cart_item.quantity
+        )
+        if quantity is None:
+            # Só no caminho de erro: descobre por que nada foi gravado
+            if not ProductRepository.get_product_by_id(db, cart_item.product_id):
+                raise HTTPException(status_code=404, detail="Product not found")
             raise HTTPException(status_code=400, detail="Not enough stock")
 
-        cart_item = CartItem(
-            **cart_item.model_dump(exclude={"unit_price"}),
-            unit_price=product.price,
-            cart_id=cart.id
+    @staticmethod
+    def resolve_operations(
+        current: dict[int, int], products: dict, operations: list[CartItemOperation]
+    ) -> dict[int, int]:
+        """
+        Quantidade final de cada produto tocado pelas operações (0 = fora do
+        carrinho), a partir das quantidades atuais e de {product_id: (estoque,
+        preço)}. Valida existência e estoque antes de qualquer escrita.
+        """
+        quantities = {}
+        for operation in operations:
+            product_id = operation.product_id
+            if product_id not in quantities:
+                quantities[product_id] = current.get(product_id, 0)
+            if operation.op == "remove":
+                quantities[product_id] = 0
+                continue
+            if product_id not in products:
+                raise HTTPException(status_code=404, detail=f"Product {product_id} not found")
+            if operation.op == "add":
+                quantities[product_id] += operation.quantity
+            else:
+                quantities[product_id] = operation.quantity
+
+        for product_id, quantity in quantities.items():
+            if quantity > 0 and quantity > products[product_id][0]:
+                raise HTTPException(status_code=400, detail=f"Not enough stock for product {product_id}")
+        return quantities
+
+    @staticmethod
+    def apply_batch(db: Session, batch: CartItemBatch, user: User) -> CartItemsResponse:
+        """
+        Aplica, em ordem, uma lista de operações add/update/remove no carrinho
+        com uma leitura do carrinho, uma dos itens, uma dos produtos e um único
+        commit. Se alguma operação for inválida, nenhuma é gravada.
+        """
+        # O commit expira os objetos da sessão; guarda o id para a leitura final
+        user_id = user.id
+        if CartService.store is not None:
+            CartService.apply_to_store(db, user_id, batch.operations)
+            return CartService.get_cart_items_by_user_id(db, user_id)
+
+        cart = CartRepository.get_cart_by_user(db, user_id)
+        if not cart:
+            raise HTTPException(status_code=404, detail="Cart not found")
+
+        items = {item.product_id: item for item in CartRepository.get_cart_items(db, cart.id)}
+        products = ProductRepository.get_stock_rows(
+            db, list({operation.product_id for operation in batch.operations}), cart.id
+        )
+        quantities = CartService.resolve_operations(
+            {product_id: item.quantity for product_id, item in items.items()},
+            products,
+            batch.operations,
         )
 
-        CartRepository.add_item_to_cart(db, cart_item)
+        added, removed = [], []
+        for product_id, quantity in quantities.items():
+            item = items.get(product_id)
+            if quantity == 0:
+                if item:
+                    removed.append(item)
+                continue
+            if item:
+                item.quantity = quantity
+            else:
+                added.append(
+                    CartItem(
+                        cart_id=cart.id,
+                        product_id=product_id,
+                        quantity=quantity,
+                        unit_price=products[product_id][1],
+                    )
+                )
 
-        return cart
+        StockReservationRepository.reserve(db, cart.id, quantities)
+        CartRepository.save_items(db, added, removed)
+        return CartService.get_cart_items_by_user_id(db, user_id)
+
+    @staticmethod
+    def apply_to_store(db: Session, user_id: int, operations: list[CartItemOperation]):
+        """Versão write-behind do apply_batch: altera só o carrinho no store, sem commit."""
+        product_ids = list({operation.product_id for operation in operations})
+
+        def change(state: dict):
+            items = state["items"]
+            products = ProductRepository.get_stock_rows(db, product_ids, state["cart_id"])
+            quantities = CartService.resolve_operations(
+                {product_id: item["quantity"] for product_id, item in items.items()},
+                products,
+                operations,
+            )
+            for product_id, quantity in quantities.items():
+                if quantity == 0:
+                    items.pop(product_id, None)
+                elif product_id in items:
+                    items[product_id]["quantity"] = quantity
+                else:
+                    items[product_id] = {
+                        "id": None,
+                        "quantity": quantity,
+                        "unit_price": products[product_id][1],
+                    }
+
+        if CartService.store.update(db, user_id, change) is None:
+            raise HTTPException(status_code=404, detail="Cart not found")
+
+    @staticmethod
+    def flush_cart(db: Session, user: User):
+        """Grava no banco o carrinho pendente no store write-behind, se houver."""
+        if CartService.store is not None:
+            CartService.store.flush(db, user.id)
 
     @staticmethod
     def remove_item_from_cart(db: Session, cart_item: CartItemRemove, user: User):
+        if CartService.store is not None:
+            CartService.apply_to_store(db, user.id, [
+                CartItemOperation(op="remove", product_id=cart_item.product_id)
+            ])
+            return
+
         cart = CartRepository.get_cart_by_user(db, user.id)
         if not cart:
             raise HTTPException(status_code=404, detail="Cart not found")
@@ -81,16 +243,50 @@ class CartService:
 
     @staticmethod
     def clear_cart(db: Session, user: User):
+        if CartService.store is not None:
+            if CartService.store.update(db, user.id, lambda state: state["items"].clear()) is not None:
+                CartService.store.flush(db, user.id)
+            return
+
         cart = CartRepository.get_cart_by_user(db, user.id)
         if cart:
             CartRepository.clear_cart(db, cart.id)
 
+    @staticmethod
+    def clear_cart_for_checkout(db: Session, user: User) -> Optional[int]:
+        """
+        Esvazia o carrinho dentro da transação do pedido e retorna o id dele.
+        Não faz commit; no modo write-behind, chame discard_store_cart após o
+        commit.
+        """
+        cart = CartRepository.get_cart_by_user(db, user.id)
+        if not cart:
+            return None
+        CartRepository.delete_items(db, cart.id)
+        return cart.id
+
+    @staticmethod
+    def discard_store_cart(user_id: int):
+        if CartService.store is not None:
+            CartService.store.discard(user_id)
+
     @staticmethod
     def update_item_quantity(db: Session, cart_item: CartItemUpdate, user: User):
+        operation = CartItemOperation(
+            op="update", product_id=cart_item.product_id, quantity=cart_item.quantity
+        )
+        if CartService.store is not None:
+            CartService.apply_to_store(db, user.id, [operation])
+            return
+
         cart = CartRepository.get_cart_by_user(db, user.id)
         if not cart:
             raise HTTPException(status_code=404, detail="Cart not found")
 
+        # Mesma validação do lote: a nova quantidade precisa caber no estoque
+        # disponível (sem contar a reserva deste carrinho)
+        products = ProductRepository.get_stock_rows(db, [cart_item.product_id], cart.id)
+        CartService.resolve_operations({}, products, [operation])
         CartRepository.update_item_quantity(
             db, cart.id, cart_item.product_id, cart_item.quantity
         )
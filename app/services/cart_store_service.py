@@ -0,0 +1,162 @@
+import asyncio
+import logging
+from decimal import Decimal
+from typing import Callable, Optional
+import orjson
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.config import CART_STORE_BACKEND, CART_STORE_REDIS_URL, CART_STORE_FLUSH_SECONDS
+from app.core.kv_store import KeyValueStore, InMemoryKeyValueStore, RedisKeyValueStore
+from app.database import SessionLocal
+from app.repositories.cart_repository import CartRepository
+
+logger = logging.getLogger(__name__)
+
+# Conjunto com os ids dos usuários cujo carrinho ainda não foi gravado no banco
+DIRTY_CARTS = "carts:dirty"
+# Tentativas de update() quando outra requisição altera o mesmo carrinho
+UPDATE_ATTEMPTS = 5
+
+
+class WriteBehindCartStore:
+    """
+    Carrinhos ativos guardados num KeyValueStore, com gravação adiada em
+    carts/cart_items. Cada carrinho é um JSON:
+
+        {"cart_id": 1, "version": 3, "items": {"<product_id>": {"id": ..., "quantity": 2, "unit_price": "10.00"}}}
+
+    Só carrinhos com alterações pendentes ficam no store: update() grava o
+    JSON (compare-and-set, sem perder alterações concorrentes) e marca o
+    usuário em DIRTY_CARTS; flush() grava no banco no checkout ou pelo timer
+    (run) e tira o carrinho do store, que volta a ser lido do banco.
+    """
+
+    def __init__(self, store: KeyValueStore, flush_interval: float = CART_STORE_FLUSH_SECONDS):
+        self.store = store
+        self.flush_interval = flush_interval
+
+    @staticmethod
+    def key(user_id: int) -> str:
+        return f"cart:{user_id}"
+
+    @staticmethod
+    def decode(raw: bytes) -> dict:
+        state = orjson.loads(raw)
+        state["items"] = {
+            int(product_id): {**item, "unit_price": Decimal(item["unit_price"])}
+            for product_id, item in state["items"].items()
+        }
+        return state
+
+    @staticmethod
+    def encode(state: dict) -> bytes:
+        return orjson.dumps(
+            {
+                **state,
+                "items": {
+                    str(product_id): {**item, "unit_price": str(item["unit_price"])}
+                    for product_id, item in state["items"].items()
+                },
+            }
+        )
+
+    def read(self, db: Session, user_id: int) -> tuple[Optional[dict], Optional[bytes]]:
+        """(carrinho, JSON atual no store); carrinhos sem alterações pendentes vêm do banco."""
+        raw = self.store.get(self.key(user_id))
+        if raw is not None:
+            return self.decode(raw), raw
+
+        cart = CartRepository.get_cart_by_user(db, user_id)
+        if not cart:
+            return None, None
+        state = {
+            "cart_id": cart.id,
+            "version": 0,
+            "items": {
+                item.product_id: {"id": item.id, "quantity": item.quantity, "unit_price": item.unit_price}
+                for item in CartRepository.get_cart_items(db, cart.id)
+            },
+        }
+        return state, None
+
+    def load(self, db: Session, user_id: int) -> Optional[dict]:
+        """Carrinho do usuário (do store ou do banco). None se ele não tiver carrinho."""
+        return self.read(db, user_id)[0]
+
+    def update(self, db: Session, user_id: int, change: Callable[[dict], None]) -> Optional[dict]:
+        """
+        Aplica `change(state)` ao carrinho e grava com compare-and-set: se outra
+        requisição gravou o carrinho nesse meio tempo, relê e aplica de novo.
+        Retorna o carrinho gravado, ou None se o usuário não tiver carrinho.
+        """
+        key = self.key(user_id)
+        for _ in range(UPDATE_ATTEMPTS):
+            state, raw = self.read(db, user_id)
+            if state is None:
+                return None
+            change(state)
+            state["version"] += 1
+            if self.store.compare_and_set(key, raw, self.encode(state)):
+                self.store.add_member(DIRTY_CARTS, str(user_id))
+                return state
+        raise HTTPException(status_code=409, detail="Cart was modified concurrently, try again")
+
+    def flush(self, db: Session, user_id: int):
+        """Grava o carrinho do usuário no banco, se houver alterações pendentes."""
+        key = self.key(user_id)
+        raw = self.store.get(key)
+        if raw is None:
+            self.store.remove_member(DIRTY_CARTS, str(user_id))
+            return
+
+        state = self.decode(raw)
+        CartRepository.replace_items(
+            db,
+            state["cart_id"],
+            {product_id: (item["quantity"], item["unit_price"]) for product_id, item in state["items"].items()},
+        )
+        # Desmarca antes de remover: se o carrinho mudou durante a gravação,
+        # a remoção falha e ele volta a ficar sujo para o próximo flush
+        self.store.remove_member(DIRTY_CARTS, str(user_id))
+        if not self.store.delete_if_equal(key, raw):
+            self.store.add_member(DIRTY_CARTS, str(user_id))
+
+    def discard(self, user_id: int):
+        """Esquece o carrinho do usuário no store (o banco já está em dia, ex.: após o checkout)."""
+        self.store.remove_member(DIRTY_CARTS, str(user_id))
+        self.store.delete(self.key(user_id))
+
+    def flush_all(self, db: Optional[Session] = None) -> int:
+        session = db or SessionLocal()
+        flushed = 0
+        try:
+            for member in self.store.members(DIRTY_CARTS):
+                try:
+                    self.flush(session, int(member))
+                    flushed += 1
+                except Exception:
+                    session.rollback()
+                    logger.exception("Erro ao gravar o carrinho do usuário %s", member)
+        finally:
+            if db is None:
+                session.close()
+        return flushed
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await asyncio.to_thread(self.flush_all)
+
+
+def create_cart_store() -> Optional[WriteBehindCartStore]:
+    if CART_STORE_BACKEND == "memory":
+        return WriteBehindCartStore(InMemoryKeyValueStore())
+    if CART_STORE_BACKEND == "redis":
+        return WriteBehindCartStore(RedisKeyValueStore(CART_STORE_REDIS_URL))
+    if CART_STORE_BACKEND != "database":
+        raise ValueError(f"CART_STORE_BACKEND inválido: {CART_STORE_BACKEND}")
+    return None
+
+
+# None = carrinho gravado direto no banco (comportamento padrão)
+cart_store = create_cart_store()
@@ -0,0 +1,226 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime
+from typing import Iterable, Optional
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+from app.config import CATALOG_SNAPSHOT_DIR, CATALOG_SNAPSHOT_DEBOUNCE_SECONDS
+from app.core.cache import on_catalog_change
+from app.core.static_files import PrecompressedStaticFiles
+from app.database import SessionLocal
+from app.repositories.category_repository import CategoryRepository
+from app.schemas.category_schema import CategoryResponse
+from app.services.product_service import ProductService
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional: sem ele, só as variantes .gz
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+categories_adapter = TypeAdapter(list[CategoryResponse])
+
+
+class CatalogSnapshotService:
+    """
+    Exporta o catálogo para arquivos JSON estáticos:
+
+    - `manifest.json`: versão e nomes atuais dos shards (não deve ser cacheado);
+    - `categories.<hash>.json`: todas as categorias;
+    - `products-<category_id>.<hash>.json`: produtos de uma categoria, no
+      formato de ProductResponse.
+
+    Os shards têm o hash do conteúdo no nome (podem ser cacheados para sempre)
+    e são gravados também em .gz/.br para o PrecompressedStaticFiles.
+    """
+
+    @staticmethod
+    def write_file(directory: str, name: str, data: bytes):
+        variants = {name: data, name + ".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[name + ".br"] = brotli.compress(data)
+
+        for file_name, content in variants.items():
+            # Grava em arquivo temporário e troca atomicamente: quem lê nunca
+            # vê um arquivo pela metade
+            fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+            with os.fdopen(fd, "wb") as temp_file:
+                temp_file.write(content)
+            os.chmod(temp_path, 0o644)
+            os.replace(temp_path, os.path.join(directory, file_name))
+
+    @staticmethod
+    def write_shard(directory: str, prefix: str, data: bytes) -> str:
+        name = f"{prefix}.{hashlib.sha256(data).hexdigest()[:16]}.json"
+        # Mesmo nome = mesmo conteúdo: shards inalterados não são regravados
+        if not os.path.exists(os.path.join(directory, name)):
+            CatalogSnapshotService.write_file(directory, name, data)
+        return name
+
+    @staticmethod
+    def read_manifest(directory: str) -> Optional[dict]:
+        try:
+            with open(os.path.join(directory, MANIFEST_NAME), "rb") as manifest_file:
+                return orjson.loads(manifest_file.read())
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            return None
+
+    @staticmethod
+    def build(
+        db: Session,
+        category_ids: Optional[Iterable[int]] = None,
+        directory: str = CATALOG_SNAPSHOT_DIR,
+    ) -> dict:
+        """
+        Gera os shards das categorias em `category_ids` (todas, se None ou se
+        ainda não houver manifesto) e publica um novo manifesto.
+        """
+        os.makedirs(directory, exist_ok=True)
+        previous = CatalogSnapshotService.read_manifest(directory)
+
+        categories = CategoryRepository.get_all_categories(db)
+        existing = {category.id for category in categories}
+
+        if previous is None or category_ids is None:
+            shards = {}
+            targets = existing
+        else:
+            shards = {
+                int(category_id): name
+                for category_id, name in previous["products"].items()
+                if int(category_id) in existing
+            }
+            targets = existing & set(category_ids)
+
+        for category_id in sorted(targets):
+            data = orjson.dumps(ProductService.get_product_dicts(db, category_id))
+            shards[category_id] = CatalogSnapshotService.write_shard(
+                directory, f"products-{category_id}", data
+            )
+
+        categories_data = categories_adapter.dump_json(
+            categories_adapter.validate_python(categories, from_attributes=True)
+        )
+        manifest = {
+            "version": previous["version"] + 1 if previous else 1,
+            "generated_at": datetime.utcnow().isoformat(),
+            "categories": CatalogSnapshotService.write_shard(
+                directory, "categories", categories_data
+            ),
+            "products": {str(category_id): shards[category_id] for category_id in sorted(shards)},
+        }
+        CatalogSnapshotService.write_file(directory, MANIFEST_NAME, orjson.dumps(manifest))
+        CatalogSnapshotService.prune(directory, [previous, manifest])
+        return manifest
+
+    @staticmethod
+    def prune(directory: str, manifests: list[Optional[dict]]):
+        """
+        Remove shards que não aparecem em nenhum dos manifestos informados. O
+        manifesto anterior é mantido para quem ainda o tem em mãos.
+        """
+        keep = {MANIFEST_NAME}
+        for manifest in manifests:
+            if manifest:
+                keep.add(manifest["categories"])
+                keep.update(manifest["products"].values())
+
+        for file_name in os.listdir(directory):
+            base_name = file_name
+            for suffix in COMPRESSED_SUFFIXES:
+                if base_name.endswith(suffix):
+                    base_name = base_name[: -len(suffix)]
+            if base_name not in keep and not file_name.startswith(".tmp-"):
+                os.remove(os.path.join(directory, file_name))
+
+
+class CatalogSnapshotWorker:
+    """
+    Tarefa de fundo que mantém o snapshot em dia: as escritas no catálogo
+    marcam categorias como sujas (via on_catalog_change) e o worker, após um
+    pequeno intervalo para agrupar rajadas, regenera só esses shards.
+    """
+
+    def __init__(
+        self,
+        directory: str = CATALOG_SNAPSHOT_DIR,
+        debounce: float = CATALOG_SNAPSHOT_DEBOUNCE_SECONDS,
+    ):
+        self.directory = directory
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        # None = catálogo inteiro; a primeira passada sempre gera tudo
+        self._dirty: Optional[set[int]] = None
+        self._pending = True
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def mark_dirty(self, category_ids: Optional[set[int]]):
+        with self._lock:
+            self._pending = True
+            if category_ids is None or self._dirty is None:
+                self._dirty = None
+            else:
+                self._dirty |= category_ids
+        # As escritas rodam no threadpool das rotas síncronas
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_dirty(self) -> tuple[bool, Optional[set[int]]]:
+        with self._lock:
+            pending, dirty = self._pending, self._dirty
+            self._pending, self._dirty = False, set()
+            return pending, dirty
+
+    def regenerate(self, category_ids: Optional[set[int]]) -> dict:
+        db = SessionLocal()
+        try:
+            return CatalogSnapshotService.build(db, category_ids, self.directory)
+        finally:
+            db.close()
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        on_catalog_change(self.mark_dirty)
+        while True:
+            self._wakeup.clear()
+            pending, dirty = self._take_dirty()
+            if pending:
+                try:
+                    await asyncio.to_thread(self.regenerate, dirty)
+                except Exception:
+                    logger.exception("Erro ao gerar o snapshot do catálogo")
+                    # Tenta de novo na próxima passada
+                    self.mark_dirty(dirty)
+
+            await self._wakeup.wait()
+            # Agrupa uma rajada de escritas em uma única regeneração
+            await asyncio.sleep(self.debounce)
+
+
+class CatalogStaticFiles(PrecompressedStaticFiles):
+    def cache_control(self, path: str) -> Optional[str]:
+        if os.path.basename(path) == MANIFEST_NAME:
+            return "no-cache"
+        # Shards têm o hash do conteúdo no nome
+        return "public, max-age=31536000, immutable"
+
+
+catalog_snapshot_worker = CatalogSnapshotWorker()
+
+
+if __name__ == "__main__":
+    # Geração completa avulsa: python -m app.services.catalog_snapshot_service
+    manifest = catalog_snapshot_worker.regenerate(None)
+    print(f"Snapshot v{manifest['version']}: {len(manifest['products'])} categorias")
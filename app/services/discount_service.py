@@ -1,9 +1,11 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.discount_repository import DiscountRepository
 from app.models.discount_model import Discount
 from app.schemas.discount_schema import DiscountCreate, DiscountUpdate
 from app.repositories.product_repository import ProductRepository
+from app.services.pricing_service import PricingService, discount_window_scheduler
 
 
 class DiscountService:
@@ -11,6 +13,10 @@ class DiscountService:
     def get_all_discounts(db: Session) -> list[Discount]:
         return DiscountRepository.get_all_discounts(db)
 
+    @staticmethod
+    def get_active_discounts(db: Session, product_id: Optional[int] = None) -> list[Discount]:
+        return DiscountRepository.get_active_discounts(db, product_id)
+
     @staticmethod
     def get_discount_by_id(db: Session, discount_id: int) -> list[Discount]:
         return DiscountRepository.get_discount_by_id(db, discount_id)
@@ -22,7 +28,10 @@ class DiscountService:
             raise HTTPException(status_code=404, detail="Product not found")
 
         discount = Discount(**discount_data.model_dump())
-        return DiscountRepository.create_discount(db, discount)
+        discount = DiscountRepository.create_discount(db, discount)
+        PricingService.refresh_effective_prices(db, [discount.product_id])
+        discount_window_scheduler.reschedule()
+        return discount
 
     @staticmethod
     def update_discount(
@@ -34,12 +43,28 @@ class DiscountService:
 
         updates = discount_data.model_dump(exclude_unset=True)
 
+        current = DiscountRepository.get_discount_by_id(db, discount_id)
+        if not current:
+            raise HTTPException(status_code=404, detail="Discount not found")
+        previous_product_id = current.product_id
+
         discount = DiscountRepository.update_discount(db, discount_id, updates)
         if not discount:
             raise HTTPException(status_code=404, detail="Discount not found")
-        
+
+        # O desconto pode ter mudado de produto: recalcula o antigo e o novo
+        PricingService.refresh_effective_prices(
+            db, [previous_product_id, discount.product_id]
+        )
+        discount_window_scheduler.reschedule()
         return discount
 
     @staticmethod
     def delete_discount(db: Session, discount_id: int):
+        discount = DiscountRepository.get_discount_by_id(db, discount_id)
+        if not discount:
+            return
+        product_id = discount.product_id
         DiscountRepository.delete_discount(db, discount_id)
+        PricingService.refresh_effective_prices(db, [product_id])
+        discount_window_scheduler.reschedule()
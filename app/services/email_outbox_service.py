@@ -0,0 +1,131 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.config import (
+    EMAIL_OUTBOX_POLL_SECONDS,
+    EMAIL_OUTBOX_MAX_ATTEMPTS,
+    EMAIL_OUTBOX_RETRY_BASE_SECONDS,
+)
+from app.database import SessionLocal
+from app.models.email_outbox_model import EmailOutbox, EmailKind
+from app.repositories.email_outbox_repository import EmailOutboxRepository
+from app.repositories.order_repository import OrderRepository
+from app.utils import email_utils
+
+logger = logging.getLogger(__name__)
+
+# E-mails enviados por conexão SMTP
+SEND_BATCH_SIZE = 20
+# Tempo que um worker tem para enviar os e-mails que reservou
+CLAIM_LEASE = timedelta(minutes=5)
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+
+class EmailOutboxService:
+    @staticmethod
+    def enqueue_purchase_email(db: Session, to_email: str, order_id: int) -> EmailOutbox:
+        """Agenda a confirmação do pedido. Não faz commit: vale junto com a transação do pedido."""
+        return EmailOutboxRepository.enqueue(db, EmailKind.PURCHASE_CONFIRMATION, to_email, order_id)
+
+    @staticmethod
+    def retry_delay(attempts: int) -> timedelta:
+        """Backoff exponencial: base, 2x base, 4x base... até MAX_RETRY_DELAY."""
+        seconds = EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+        return timedelta(seconds=min(seconds, MAX_RETRY_DELAY.total_seconds()))
+
+    @staticmethod
+    def render(db: Session, email: EmailOutbox) -> tuple[str, str]:
+        if email.kind == EmailKind.PURCHASE_CONFIRMATION:
+            order = OrderRepository.get_order_by_id(db, email.order_id)
+            if not order:
+                raise ValueError(f"Pedido {email.order_id} não encontrado")
+            return email_utils.build_purchase_email(order)
+        raise ValueError(f"Tipo de e-mail desconhecido: {email.kind}")
+
+    @staticmethod
+    def fail(db: Session, email: EmailOutbox, error: Exception):
+        attempts = email.attempts + 1
+        next_attempt_at = None
+        if attempts < EMAIL_OUTBOX_MAX_ATTEMPTS:
+            next_attempt_at = datetime.utcnow() + EmailOutboxService.retry_delay(attempts)
+        EmailOutboxRepository.mark_failed(db, email, str(error), next_attempt_at)
+        logger.warning("Falha ao enviar e-mail %s (tentativa %s): %s", email.id, attempts, error)
+
+    @staticmethod
+    def process_due(db: Session, limit: int = SEND_BATCH_SIZE) -> int:
+        """
+        Envia um lote de e-mails vencidos por uma única conexão SMTP. Falhas
+        voltam para a fila com backoff. Retorna quantos e-mails foram tratados.
+        """
+        emails = EmailOutboxRepository.claim_due(db, datetime.utcnow(), limit, CLAIM_LEASE)
+        if not emails:
+            return 0
+
+        pending = list(emails)
+        try:
+            with email_utils.smtp_connection() as server:
+                while pending:
+                    email = pending[0]
+                    try:
+                        subject, body = EmailOutboxService.render(db, email)
+                        email_utils.send_email(email.to_email, subject, body, server=server)
+                        EmailOutboxRepository.mark_sent(db, email, datetime.utcnow())
+                    except Exception as error:
+                        db.rollback()
+                        EmailOutboxService.fail(db, email, error)
+                    pending.pop(0)
+        except Exception as error:
+            # Não conectou (ou a conexão caiu): o resto do lote volta para a fila
+            db.rollback()
+            for email in pending:
+                EmailOutboxService.fail(db, email, error)
+        return len(emails)
+
+
+class EmailOutboxWorker:
+    """
+    Tarefa de fundo que esvazia a fila de e-mails. Acorda a cada
+    EMAIL_OUTBOX_POLL_SECONDS ou quando notify() é chamado após um commit
+    que enfileirou e-mails.
+    """
+
+    def __init__(self, poll_interval: float = EMAIL_OUTBOX_POLL_SECONDS):
+        self.poll_interval = poll_interval
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def notify(self):
+        # Chamado das rotas síncronas, no threadpool
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def drain(self) -> int:
+        db = SessionLocal()
+        try:
+            total = 0
+            while True:
+                processed = EmailOutboxService.process_due(db)
+                total += processed
+                if processed < SEND_BATCH_SIZE:
+                    return total
+        finally:
+            db.close()
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            self._wakeup.clear()
+            try:
+                await asyncio.to_thread(self.drain)
+            except Exception:
+                logger.exception("Erro ao processar a fila de e-mails")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+email_outbox_worker = EmailOutboxWorker()
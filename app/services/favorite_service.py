@@ -0,0 +1,44 @@
+from typing import Iterable
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.core.cache import favorites_cache
+from app.models.favorite_model import Favorite
+from app.models.user_model import User
+from app.repositories.favorite_repository import FavoriteRepository
+from app.repositories.product_repository import ProductRepository
+from app.schemas.favorite_schema import FavoriteCreate
+
+
+class FavoriteService:
+    @staticmethod
+    def get_favorites(db: Session, user: User) -> list[Favorite]:
+        return FavoriteRepository.get_favorites_by_user(db, user.id)
+
+    @staticmethod
+    def get_favorite_ids(db: Session, user: User) -> frozenset[int]:
+        """Ids dos produtos favoritos do usuário, guardados em favorites_cache."""
+        return favorites_cache.get_or_set(
+            user.id,
+            lambda: frozenset(FavoriteRepository.get_favorite_product_ids(db, user.id)),
+        )
+
+    @staticmethod
+    def filter_favorited(db: Session, user: User, product_ids: Iterable[int]) -> list[int]:
+        """Quais de `product_ids` o usuário favoritou, sem uma consulta por produto."""
+        favorite_ids = FavoriteService.get_favorite_ids(db, user)
+        return [product_id for product_id in product_ids if product_id in favorite_ids]
+
+    @staticmethod
+    def add_favorite(db: Session, user: User, data: FavoriteCreate) -> Favorite:
+        if not ProductRepository.get_product_by_id(db, data.product_id):
+            raise HTTPException(status_code=404, detail="Product not found")
+
+        FavoriteRepository.add_favorite(db, user.id, data.product_id)
+        return FavoriteRepository.get_favorite_by_user_and_product(db, user.id, data.product_id)
+
+    @staticmethod
+    def remove_favorite(db: Session, user: User, favorite_id: int):
+        favorite = FavoriteRepository.get_favorite_by_id(db, favorite_id)
+        if not favorite or favorite.user_id != user.id:
+            raise HTTPException(status_code=404, detail="Favorite not found")
+        FavoriteRepository.delete_favorite(db, favorite)
@@ -1,8 +1,10 @@
+import logging
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from decimal import Decimal
 from sqlalchemy.exc import IntegrityError
+from collections import Counter
 
 from app.repositories.order_repository import OrderRepository
 from app.models.order_model import Order, OrderStatus
@@ -17,38 +19,55 @@ from app.models.cart_item_model import CartItem
 from app.services.coupon_service import CouponService
 from app.services.address_service import AddressService
 from app.services.product_service import ProductService
+from app.repositories.product_repository import ProductRepository
+from app.repositories.sales_repository import SalesRepository
+from app.services.recommendation_service import RecommendationService, recommendation_refresher
 from app.schemas.product_schema import ProductBase
-from app.utils.email_utils import send_purchase_email  # novo import
+from app.services.email_outbox_service import EmailOutboxService, email_outbox_worker
+
+logger = logging.getLogger(__name__)
 
 
 class OrderService:
     @staticmethod
     def create_order(db: Session, order_data: OrderCreate, user: User) -> Order:
-        print("DEBUG: Entrou em create_order")
-        print("OrderCreate recebido:", order_data)
-        print("Itens recebidos:", getattr(order_data, "items", None))
-
         if not order_data.items or len(order_data.items) == 0:
-            print("DEBUG: Nenhum item recebido no pedido")
             raise HTTPException(status_code=400, detail="Cart is empty")
 
         try:
             admin_id = ProductService.get_admin_id_by_product_id(db, order_data.items[0].product_id)
             total_amount = order_data.total_amount
 
+            # Com o carrinho write-behind ativo, o checkout grava o carrinho no banco
+            CartService.flush_cart(db, user)
+            user_id = user.id
+
+            # Pedido, carrinho, baixa de estoque e itens numa única transação
             order = OrderService.create_order_entry(db, order_data, user, total_amount, admin_id)
-            OrderService.create_order_items_from_payload(db, order, order_data.items)
-            CartService.clear_cart(db, user)
-            # Popule endereço e itens no objeto order para o e-mail
+            cart_id = CartService.clear_cart_for_checkout(db, user)
+            category_ids = OrderService.create_order_items_from_payload(
+                db, order, order_data.items, cart_id
+            )
+            # O e-mail de confirmação vai para a fila na mesma transação do pedido
+            EmailOutboxService.enqueue_purchase_email(db, user.email, order.id)
+            OrderRepository.commit_order(db, order, category_ids)
+            CartService.discard_store_cart(user_id)
+            email_outbox_worker.notify()
+            # Top-K "comprados juntos" é recalculado fora da transação do pedido
+            recommendation_refresher.mark_dirty(item.product_id for item in order_data.items)
+
+            # Popule endereço e itens no objeto order para a resposta
             order.address = AddressService.get_address_any_user(db, order.address_id)
             order.order_items = OrderRepository.get_order_items_by_order_id(db, order.id)
-            # Se tiver método de pagamento, adicione: order.payment_method = ...
-            send_purchase_email(user.email, order)  # Enviar e-mail ao usuário
-            print("DEBUG: Pedido criado com sucesso")
+            logger.info("Pedido %s criado para o usuário %s", order.id, user_id)
             return order
-        except Exception as e:
-            print("ERRO em create_order:", e)
-            raise HTTPException(status_code=500, detail=f"Erro interno ao criar pedido: {e}")
+        except HTTPException:
+            db.rollback()
+            raise
+        except Exception:
+            db.rollback()
+            logger.exception("Erro ao criar pedido")
+            raise HTTPException(status_code=500, detail="Erro interno ao criar pedido")
 
     @staticmethod
     def create_order_entry(
@@ -71,34 +90,47 @@ class OrderService:
             address_id=order_data.address_id,
             coupon_id=order_data.coupon_id,
         )
+        # Só flush: o commit é feito uma única vez, no fim do checkout
         try:
             db.add(order)
-            db.commit()
-            db.refresh(order)
+            db.flush()
         except IntegrityError:
             db.rollback()
             raise HTTPException(status_code=400, detail="Error creating order")
         return order
 
     @staticmethod
-    def create_order_items_from_payload(db: Session, order: Order, items: list):
-        order_items = []
+    def create_order_items_from_payload(
+        db: Session, order: Order, items: list, cart_id: Optional[int] = None
+    ) -> set[int]:
+        """
+        Baixa o estoque de todos os itens num único UPDATE condicional e
+        adiciona os itens do pedido. Se faltar estoque para qualquer produto,
+        levanta 400 e quem chamou desfaz a transação inteira. Não faz commit;
+        retorna as categorias afetadas, para invalidar o catálogo.
+        """
+        quantities = Counter()
         for item in items:
-            # Trate possíveis erros de estoque
-            try:
-                ProductService.decrease_stock(db, item.product_id, item.quantity)
-            except Exception as e:
-                print(f"Erro ao baixar estoque do produto {item.product_id}: {e}")
-                raise HTTPException(status_code=400, detail=f"Erro ao baixar estoque do produto {item.product_id}")
-            order_items.append(
-                OrderItem(
-                    order_id=order.id,
-                    product_id=item.product_id,
-                    quantity=item.quantity,
-                    unit_price=item.unit_price,
-                )
+            quantities[item.product_id] += item.quantity
+
+        decremented = ProductRepository.decrement_stock(db, dict(quantities), cart_id)
+        oversold = sorted(set(quantities) - set(decremented))
+        if oversold:
+            raise HTTPException(status_code=400, detail=f"Not enough stock for products {oversold}")
+
+        order_items = [
+            OrderItem(
+                order_id=order.id,
+                product_id=item.product_id,
+                quantity=item.quantity,
+                unit_price=item.unit_price,
             )
-        OrderRepository.create_order_items(db, order_items)
+            for item in items
+        ]
+        RecommendationService.record_order(db, list(quantities))
+        SalesRepository.add_order_sales(db, order, order_items)
+        OrderRepository.add_order_items(db, order_items)
+        return set(decremented.values())
 
     @staticmethod
     def _build_products_with_quantity(order) -> List[Dict[str, Any]]:
@@ -256,7 +288,7 @@ class OrderService:
             raise HTTPException(status_code=400, detail="Somente pedidos pendentes ou em processamento podem ser cancelados")
 
         try:
-            order.status = OrderStatus.CANCELLED  # Atualiza o status para CANCELLED
+            SalesRepository.change_order_status(db, order, OrderStatus.CANCELLED)
             db.add(order)
             db.commit()
             db.refresh(order)
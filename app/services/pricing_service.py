@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from typing import Iterable, Optional
+from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
+from sqlalchemy.orm import Session
+from app.config import DISCOUNT_SCHEDULER_MAX_SLEEP_SECONDS
+from app.database import SessionLocal
+from app.repositories.discount_repository import DiscountRepository
+from app.repositories.product_repository import ProductRepository
+
+logger = logging.getLogger(__name__)
+
+
+class PricingService:
+    @staticmethod
+    def compute_effective_price(price: Decimal, total_discount: Decimal) -> Decimal:
+        total_discount = min(total_discount, Decimal(100))
+        discounted_price = price - (price * total_discount / 100)
+        return max(
+            discounted_price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP),
+            Decimal("0.00"),
+        )
+
+    @staticmethod
+    def refresh_effective_prices(
+        db: Session, product_ids: Iterable[int], at: Optional[datetime] = None
+    ):
+        """
+        Recalcula products.effective_price a partir dos descontos vigentes.
+        Deve ser chamado sempre que um desconto ou o preço de um produto mudar.
+        """
+        product_ids = [product_id for product_id in set(product_ids) if product_id is not None]
+        if not product_ids:
+            return
+
+        at = at or datetime.utcnow()
+        prices = ProductRepository.get_prices(db, product_ids)
+        totals = DiscountRepository.get_active_discount_totals(db, product_ids, at)
+
+        ProductRepository.update_effective_prices(
+            db,
+            {
+                product_id: PricingService.compute_effective_price(
+                    price, totals.get(product_id, Decimal(0))
+                )
+                for product_id, price in prices.items()
+            },
+        )
+
+    @staticmethod
+    def refresh_window_changes(since: Optional[datetime], until: datetime) -> Optional[datetime]:
+        """
+        Atualiza os produtos cujos descontos abriram ou fecharam em (since, until]
+        e retorna o próximo instante em que alguma janela abre ou fecha.
+        """
+        db = SessionLocal()
+        try:
+            product_ids = DiscountRepository.get_product_ids_with_window_change(
+                db, since, until
+            )
+            PricingService.refresh_effective_prices(db, product_ids, until)
+            return DiscountRepository.get_next_window_boundary(db, until)
+        finally:
+            db.close()
+
+
+class DiscountWindowScheduler:
+    """
+    Tarefa de fundo que dorme até o próximo início/fim de janela de desconto e
+    então recalcula o preço efetivo (o que também invalida o cache do catálogo).
+    A primeira passada recalcula todos os produtos com desconto, cobrindo o
+    período em que a aplicação esteve parada.
+    """
+
+    def __init__(self, max_sleep: float = DISCOUNT_SCHEDULER_MAX_SLEEP_SECONDS):
+        self.max_sleep = max_sleep
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def reschedule(self):
+        """
+        Acorda o agendador para recalcular a próxima fronteira (um desconto novo
+        pode abrir antes da que ele está esperando). Pode ser chamado de qualquer
+        thread: as rotas síncronas rodam no threadpool.
+        """
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        since = None
+        while True:
+            # Limpa antes da passada para não perder um reschedule() feito durante ela
+            self._wakeup.clear()
+            until = datetime.utcnow()
+            delay = self.max_sleep
+            try:
+                next_boundary = await asyncio.to_thread(
+                    PricingService.refresh_window_changes, since, until
+                )
+                since = until
+                if next_boundary is not None:
+                    seconds = (next_boundary - datetime.utcnow()).total_seconds()
+                    delay = min(delay, max(seconds, 0))
+            except Exception:
+                logger.exception("Erro ao atualizar preços das janelas de desconto")
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+
+discount_window_scheduler = DiscountWindowScheduler()
@@ -0,0 +1,119 @@
+import csv
+import io
+import json
+from typing import BinaryIO, Iterator, Optional
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from app.repositories.category_repository import CategoryRepository
+from app.repositories.product_repository import ProductRepository
+from app.schemas.product_schema import ProductCreate
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+CSV_TYPES = ("text/csv", "application/csv", "application/vnd.ms-excel")
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+
+
+class ProductImportService:
+    @staticmethod
+    def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+        extension = (filename or "").rsplit(".", 1)[-1].lower()
+        if extension == "csv" or content_type in CSV_TYPES:
+            return "csv"
+        if extension in ("ndjson", "jsonl") or content_type in NDJSON_TYPES:
+            return "ndjson"
+        raise HTTPException(
+            status_code=400, detail="Formato não suportado. Envie um arquivo CSV ou NDJSON."
+        )
+
+    @staticmethod
+    def iter_rows(file: BinaryIO, file_format: str) -> Iterator[tuple[int, object]]:
+        """
+        Lê o arquivo linha a linha, sem carregar tudo em memória.
+        Gera (número da linha, dados da linha ou exceção de leitura). Arquivo
+        fora de UTF-8 ou CSV malformado geram a exceção e encerram a leitura.
+        """
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        line_number = 0
+        try:
+            if file_format == "csv":
+                reader = csv.DictReader(text)
+                for row in reader:
+                    line_number = reader.line_num
+                    # Campos vazios no CSV viram None (ex.: description opcional)
+                    yield line_number, {
+                        key: (value if value != "" else None)
+                        for key, value in row.items()
+                        if key is not None
+                    }
+            else:
+                for line_number, line in enumerate(text, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield line_number, json.loads(line)
+                    except ValueError as exc:
+                        yield line_number, exc
+        except (UnicodeDecodeError, csv.Error) as exc:
+            yield line_number + 1, exc
+        finally:
+            text.detach()
+
+    @staticmethod
+    def import_products(db: Session, file: BinaryIO, file_format: str) -> dict:
+        category_ids = CategoryRepository.get_all_category_ids(db)
+        report = {"inserted": 0, "failed": 0, "errors": []}
+
+        def fail(line: int, error: str):
+            report["failed"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"line": line, "error": error})
+
+        def flush(chunk: list[tuple[int, dict]]):
+            try:
+                report["inserted"] += ProductRepository.bulk_insert_products(
+                    db, [row for _, row in chunk]
+                )
+            except SQLAlchemyError as exc:
+                db.rollback()
+                for line, _ in chunk:
+                    fail(line, f"Erro ao gravar lote: {exc.__class__.__name__}")
+
+        chunk: list[tuple[int, dict]] = []
+        for line, data in ProductImportService.iter_rows(file, file_format):
+            if isinstance(data, UnicodeDecodeError):
+                fail(line, "Arquivo deve estar em UTF-8; leitura interrompida")
+                break
+            if isinstance(data, csv.Error):
+                fail(line, f"CSV inválido: {data}; leitura interrompida")
+                break
+            if isinstance(data, Exception):
+                fail(line, f"JSON inválido: {data}")
+                continue
+            if not isinstance(data, dict):
+                fail(line, "Linha deve ser um objeto")
+                continue
+
+            try:
+                product = ProductCreate(**data)
+            except ValidationError as exc:
+                fail(line, "; ".join(
+                    f"{'.'.join(str(loc) for loc in error['loc'])}: {error['msg']}"
+                    for error in exc.errors()
+                ))
+                continue
+
+            if product.category_id not in category_ids:
+                fail(line, f"category_id: categoria {product.category_id} não encontrada")
+                continue
+
+            chunk.append((line, product.model_dump()))
+            if len(chunk) >= IMPORT_CHUNK_SIZE:
+                flush(chunk)
+                chunk = []
+
+        flush(chunk)
+        return report
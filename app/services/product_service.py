@@ -1,48 +1,291 @@
+from typing import Optional
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.repositories.product_repository import ProductRepository
+from app.repositories.product_search_repository import ProductSearchRepository
 from app.models.product_model import Product
 from app.schemas.product_schema import (
     ProductCreate,
     ProductUpdate,
     ProductImageUpdate,
     ProductUpdateStock,
+    ProductBulkStockUpdate,
+    ProductResponse,
+    ProductPageResponse,
+    ProductBatchResponse,
+    ProductFilters,
+    ProductFacets,
+    CategoryFacet,
+    PriceRangeFacet,
 )
 from app.repositories.category_repository import CategoryRepository
-from decimal import Decimal, ROUND_HALF_UP
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.core.cache import catalog_cache
+from app.services.pricing_service import PricingService
+from app.services.autocomplete_service import product_autocomplete
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+
+
+# Limites inferiores das faixas de preço da faceta (a última é aberta)
+PRICE_RANGE_BOUNDARIES = [
+    Decimal(value) for value in ("0", "100", "250", "500", "1000", "2500", "5000")
+]
+
+# (versão do catálogo, quando este processo a viu pela primeira vez). Exclusões
+# não avançam max(updated_at), então o Last-Modified também usa esse instante
+_catalog_version_seen: tuple = (None, None)
 
 
 class ProductService:
+    # As leituras do catálogo ficam em catalog_cache já convertidas para
+    # ProductResponse, desacopladas da sessão que as carregou.
+
+    @staticmethod
+    def get_all_products(db: Session) -> list[ProductResponse]:
+        return catalog_cache.get_or_set(
+            ("products",),
+            lambda: [
+                ProductResponse.model_validate(product, from_attributes=True)
+                for product in ProductRepository.get_all_products(db)
+            ],
+        )
+
+    @staticmethod
+    def get_product_dicts(db: Session, category_id: Optional[int] = None) -> list[dict]:
+        """
+        Mesma forma de ProductResponse, mas montada direto de consultas por
+        coluna. Decimais viram string como no Pydantic, então o resultado pode
+        ir direto para o ORJSONResponse, sem passar pelo response_model.
+        """
+        def load() -> list[dict]:
+            discounts: dict[int, list[dict]] = {}
+            for row in ProductRepository.get_discount_rows(db, category_id):
+                discounts.setdefault(row.product_id, []).append(
+                    {
+                        "description": row.description,
+                        "discount_percentage": str(row.discount_percentage),
+                        "start_date": row.start_date,
+                        "end_date": row.end_date,
+                        "product_id": row.product_id,
+                        "id": row.id,
+                    }
+                )
+
+            return [
+                {
+                    "name": row.name,
+                    "price": str(row.price),
+                    "stock": row.stock,
+                    "category_id": row.category_id,
+                    "image_path": row.image_path,
+                    "description": row.description,
+                    "id": row.id,
+                    "effective_price": str(row.effective_price),
+                    "category": {
+                        "id": row.category_id,
+                        "name": row.category_name,
+                        "description": row.category_description,
+                        "image_path": row.category_image_path,
+                        "user_id": row.category_user_id,
+                        "product_count": row.category_product_count,
+                    },
+                    "discounts": discounts.get(row.id, []),
+                }
+                for row in ProductRepository.get_product_rows(db, category_id)
+            ]
+
+        return catalog_cache.get_or_set(("product_dicts", category_id), load)
+
+    @staticmethod
+    def get_products_page(
+        db: Session,
+        limit: int,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        filters: Optional[ProductFilters] = None,
+        include_facets: bool = False,
+    ) -> ProductPageResponse:
+        filters = filters or ProductFilters()
+        price_sort = sort in ("price", "price_desc")
+
+        after = decode_cursor(cursor)
+        if after and (
+            after.get("sort") != sort
+            or not isinstance(after.get("id"), int)
+            or isinstance(after["id"], bool)
+        ):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if after and price_sort:
+            after["price"] = ProductService._parse_cursor_price(after.get("price"))
+
+        def load() -> ProductPageResponse:
+            # Busca um item a mais só para saber se existe próxima página
+            products = ProductRepository.get_products_page(
+                db, limit + 1, sort, after, filters
+            )
+
+            next_cursor = None
+            if len(products) > limit:
+                products = products[:limit]
+                last = products[-1]
+                position = {"sort": sort, "id": last.id}
+                if price_sort:
+                    position["price"] = str(last.price)
+                next_cursor = encode_cursor(position)
+
+            return ProductPageResponse(
+                items=[
+                    ProductResponse.model_validate(product, from_attributes=True)
+                    for product in products
+                ],
+                next_cursor=next_cursor,
+                facets=ProductService.get_facets(db, filters) if include_facets else None,
+            )
+
+        key = ("page", sort, limit, cursor, include_facets, filters.model_dump_json())
+        return catalog_cache.get_or_set(key, load)
+
     @staticmethod
-    def get_all_products(db: Session) -> list[Product]:
-        return ProductRepository.get_all_products(db)
+    def _parse_cursor_price(value) -> Decimal:
+        if not isinstance(value, str):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        try:
+            price = Decimal(value)
+        except InvalidOperation:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        if not price.is_finite():
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return price
+
+    @staticmethod
+    def get_facets(db: Session, filters: ProductFilters) -> ProductFacets:
+        categories = ProductRepository.count_by_category(db, filters)
+        buckets = ProductRepository.count_by_price_range(
+            db, filters, PRICE_RANGE_BOUNDARIES
+        )
+
+        price_ranges = []
+        for index, lower in enumerate(PRICE_RANGE_BOUNDARIES):
+            upper = (
+                PRICE_RANGE_BOUNDARIES[index + 1]
+                if index + 1 < len(PRICE_RANGE_BOUNDARIES)
+                else None
+            )
+            price_ranges.append(
+                PriceRangeFacet(min_price=lower, max_price=upper, count=buckets.get(index, 0))
+            )
+
+        return ProductFacets(
+            categories=[
+                CategoryFacet(category_id=category_id, name=name, count=count)
+                for category_id, name, count in categories
+            ],
+            price_ranges=price_ranges,
+        )
+
+    @staticmethod
+    def search_products(
+        db: Session,
+        query: str,
+        limit: int,
+        category_id: Optional[int] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+    ) -> list[Product]:
+        terms = ProductSearchRepository.tokenize(query)
+        return ProductSearchRepository.search_products(
+            db, terms, limit, category_id, min_price, max_price
+        )
+
+    @staticmethod
+    def autocomplete(db: Session, query: str, limit: int) -> list[dict]:
+        return product_autocomplete.suggest(db, query, limit)
 
     @staticmethod
     def get_all_products_by_user(db: Session, user_id: int) -> list[Product]:
         return ProductRepository.get_all_products_by_user(db, user_id)
 
     @staticmethod
-    def get_product_by_category(db: Session, category_id: int) -> list[Product]:
-        return ProductRepository.get_product_by_category(db, category_id)
+    def get_product_by_category(db: Session, category_id: int) -> list[ProductResponse]:
+        return catalog_cache.get_or_set(
+            ("category", category_id),
+            lambda: [
+                ProductResponse.model_validate(product, from_attributes=True)
+                for product in ProductRepository.get_product_by_category(db, category_id)
+            ],
+        )
 
     @staticmethod
-    def get_product_by_id(db: Session, product_id: int) -> Product:
-        product = ProductRepository.get_product_by_id(db, product_id)
+    def get_product_by_id(db: Session, product_id: int) -> ProductResponse:
+        def load() -> Optional[ProductResponse]:
+            product = ProductRepository.get_product_by_id(db, product_id)
+            if not product:
+                return None
+            return ProductResponse.model_validate(product, from_attributes=True)
+
+        product = catalog_cache.get_or_set(("product", product_id), load)
 
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
 
-        total_discount = sum(
-            discount.discount_percentage for discount in product.discounts
-        )
+        return product
+
+    @staticmethod
+    def get_products_by_ids(db: Session, product_ids: list[int]) -> ProductBatchResponse:
+        """
+        Resolve vários produtos de uma vez, na ordem pedida. Usa as mesmas
+        entradas ("product", id) de get_product_by_id e só vai ao banco, numa
+        única consulta, pelos ids que não estão no cache.
+        """
+        product_ids = list(dict.fromkeys(product_ids))
 
-        discounted_price = product.price - (product.price * total_discount / 100)
-        product.price = max(
-            discounted_price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP), 
-            Decimal("0.00")
+        def load(keys: list) -> dict:
+            products = ProductRepository.get_products_by_ids(
+                db, [product_id for _, product_id in keys]
+            )
+            return {
+                ("product", product.id): ProductResponse.model_validate(
+                    product, from_attributes=True
+                )
+                for product in products
+            }
+
+        found = catalog_cache.get_or_set_many(
+            [("product", product_id) for product_id in product_ids], load
         )
 
-        return product
+        items, missing = [], []
+        for product_id in product_ids:
+            product = found[("product", product_id)]
+            if product:
+                items.append(product)
+            else:
+                missing.append(product_id)
+        return ProductBatchResponse(items=items, missing=missing)
+
+    @staticmethod
+    def get_catalog_version(db: Session) -> dict:
+        """
+        Versão atual do catálogo (produtos + categorias, que vêm embutidas nas
+        respostas). Muda a cada escrita e serve de base para ETag/Last-Modified.
+        """
+        def load() -> dict:
+            global _catalog_version_seen
+            products = ProductRepository.get_catalog_stats(db)
+            categories = CategoryRepository.get_stats(db)
+            version = (tuple(products), tuple(categories))
+            seen = _catalog_version_seen
+            if seen[0] != version:
+                seen = _catalog_version_seen = (version, datetime.utcnow())
+            modified = [value for value in (products[2], categories[2], seen[1]) if value]
+            return {"version": version, "last_modified": max(modified)}
+
+        return catalog_cache.get_or_set(("version",), load)
+
+    @staticmethod
+    def get_cache_stats() -> dict:
+        return catalog_cache.stats()
 
     @staticmethod
     def create_product(db: Session, product_data: ProductCreate) -> Product:
@@ -64,6 +307,10 @@ class ProductService:
         if not product:
             raise HTTPException(status_code=404, detail="Product not found")
 
+        if "price" in updates:
+            PricingService.refresh_effective_prices(db, [product_id])
+            db.refresh(product)
+
         return product
 
     @staticmethod
@@ -77,6 +324,15 @@ class ProductService:
 
         return product
 
+    @staticmethod
+    def bulk_update_stock(db: Session, data: ProductBulkStockUpdate) -> dict:
+        updated = ProductRepository.bulk_update_stock(db, data.stocks)
+        updated_ids = set(updated)
+        return {
+            "updated": sorted(updated_ids),
+            "missing": sorted(set(data.stocks) - updated_ids),
+        }
+
     @staticmethod
     def delete_product(db: Session, product_id: int):
         ProductRepository.delete_product(db, product_id)
@@ -92,22 +348,6 @@ class ProductService:
     def update_product_image(db: Session, product_id: int, product_image: ProductImageUpdate) -> Product:
         return ProductRepository.update_product_image(db, product_id, product_image.image_path)
 
-    @staticmethod
-    def decrease_stock(db: Session, product_id: int, quantity: int) -> Product:
-        product = ProductRepository.get_product_by_id(db, product_id)
-        
-        if not product:
-            raise HTTPException(status_code=404, detail="Product not found")
-        
-        if product.stock < quantity:
-            raise HTTPException(status_code=400, detail="Not enough stock")
-        
-        new_stock = product.stock - quantity
-       
-        ProductRepository.update_stock(db, product_id, new_stock)
- 
-        return product
-    
     @staticmethod
     def get_admin_id_by_product_id(db: Session, product_id: int) -> int:
         return ProductRepository.get_admin_id_by_product_id(db, product_id)
\ No newline at end of file
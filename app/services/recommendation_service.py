@@ -0,0 +1,193 @@
+import asyncio
+import logging
+import threading
+from typing import Iterable, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.config import RECOMMENDATIONS_TOP_K, RECOMMENDATIONS_REFRESH_DEBOUNCE_SECONDS
+from app.database import SessionLocal
+from app.repositories.recommendation_repository import RecommendationRepository
+from app.schemas.product_schema import ProductResponse
+from app.services.product_service import ProductService
+
+try:
+    import numpy as np
+except ImportError:  # só a reconstrução completa precisa do NumPy
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Pedidos lidos por lote na reconstrução completa
+REBUILD_ORDER_BATCH_SIZE = 2000
+# Par (a, b) codificado num único int64: a * 2^31 + b
+PAIR_KEY_SHIFT = 31
+PAIR_KEY_MASK = (1 << PAIR_KEY_SHIFT) - 1
+
+
+class RecommendationService:
+    @staticmethod
+    def get_recommendations(db: Session, product_id: int, limit: int) -> list[ProductResponse]:
+        """Produtos mais comprados junto com `product_id`, do mais para o menos frequente."""
+        ProductService.get_product_by_id(db, product_id)
+        recommended_ids = RecommendationRepository.get_recommended_ids(db, product_id, limit)
+        if not recommended_ids:
+            return []
+        return ProductService.get_products_by_ids(db, recommended_ids).items
+
+    @staticmethod
+    def record_order(db: Session, product_ids: Iterable[int]):
+        """
+        Atualização incremental para um pedido novo: só soma os pares do pedido.
+        Não faz commit; roda na transação de quem grava os itens do pedido. O
+        top-K dos produtos é recalculado depois do commit, pelo
+        RecommendationRefresher.
+        """
+        product_ids = sorted(set(product_ids))
+        if len(product_ids) < 2:
+            return
+        RecommendationRepository.increment_cooccurrences(db, product_ids)
+
+    @staticmethod
+    def refresh_top_k(db: Session, product_ids: Iterable[int], k: int = RECOMMENDATIONS_TOP_K):
+        product_ids = sorted(set(product_ids))
+        if product_ids:
+            RecommendationRepository.refresh_top_k(db, product_ids, k)
+
+    @staticmethod
+    def count_pairs(order_ids, product_ids):
+        """
+        Conta, de forma vetorizada, em quantos pedidos cada par ordenado de
+        produtos aparece. Recebe arrays (order_id, product_id) ordenados por
+        pedido e sem repetição dentro do pedido; retorna (chaves, contagens).
+        """
+        if len(order_ids) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(order_ids)) + 1))
+        sizes = np.diff(np.concatenate((starts, [len(order_ids)])))
+
+        # Cada item é combinado com todos os itens do seu pedido
+        item_start = np.repeat(starts, sizes)
+        item_size = np.repeat(sizes, sizes)
+        left = np.repeat(np.arange(len(order_ids)), item_size)
+        block_start = np.repeat(np.cumsum(item_size) - item_size, item_size)
+        right = np.repeat(item_start, item_size) + (np.arange(item_size.sum()) - block_start)
+
+        distinct = left != right
+        keys = (product_ids[left[distinct]] << PAIR_KEY_SHIFT) | product_ids[right[distinct]]
+        return np.unique(keys, return_counts=True)
+
+    @staticmethod
+    def top_k(keys, counts, k: int):
+        """Os k pares de maior contagem por produto (desempate pelo menor id)."""
+        products = keys >> PAIR_KEY_SHIFT
+        others = keys & PAIR_KEY_MASK
+        order = np.lexsort((others, -counts, products))
+        products, others, counts = products[order], others[order], counts[order]
+
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(products)) + 1))
+        sizes = np.diff(np.concatenate((starts, [len(products)])))
+        ranks = np.arange(len(products)) - np.repeat(starts, sizes)
+        keep = ranks < k
+        return products[keep], ranks[keep], others[keep], counts[keep]
+
+    @staticmethod
+    def rebuild(db: Session, k: int = RECOMMENDATIONS_TOP_K) -> dict:
+        """
+        Reconstrói co-ocorrências e top-K a partir de todo o order_items, em
+        lotes de pedidos, com as contagens feitas em NumPy.
+        """
+        if np is None:
+            raise HTTPException(status_code=500, detail="NumPy is required to rebuild recommendations")
+
+        batch_keys, batch_counts = [], []
+        last_order_id = 0
+        while True:
+            rows = RecommendationRepository.get_order_product_pairs(
+                db, last_order_id, REBUILD_ORDER_BATCH_SIZE
+            )
+            if not rows:
+                break
+            pairs = np.array(rows, dtype=np.int64)
+            keys, counts = RecommendationService.count_pairs(pairs[:, 0], pairs[:, 1])
+            batch_keys.append(keys)
+            batch_counts.append(counts)
+            last_order_id = int(pairs[-1, 0])
+
+        if batch_keys:
+            keys, inverse = np.unique(np.concatenate(batch_keys), return_inverse=True)
+            counts = np.bincount(inverse, weights=np.concatenate(batch_counts)).astype(np.int64)
+        else:
+            keys = counts = np.empty(0, dtype=np.int64)
+
+        cooccurrences = [
+            {"product_id": product_id, "other_product_id": other_id, "orders": count}
+            for product_id, other_id, count in zip(
+                (keys >> PAIR_KEY_SHIFT).tolist(),
+                (keys & PAIR_KEY_MASK).tolist(),
+                counts.tolist(),
+            )
+        ]
+        recommendations = [
+            {"product_id": product_id, "rank": rank, "recommended_product_id": other_id, "score": count}
+            for product_id, rank, other_id, count in zip(
+                *(array.tolist() for array in RecommendationService.top_k(keys, counts, k))
+            )
+        ]
+        RecommendationRepository.replace_all(db, cooccurrences, recommendations)
+        return {"pairs": len(cooccurrences), "recommendations": len(recommendations)}
+
+
+class RecommendationRefresher:
+    """
+    Tarefa de fundo que recalcula o top-K fora do checkout: os pedidos marcam
+    seus produtos como sujos após o commit e o worker, após um pequeno
+    intervalo para agrupar rajadas, recalcula todos de uma vez.
+    """
+
+    def __init__(self, debounce: float = RECOMMENDATIONS_REFRESH_DEBOUNCE_SECONDS):
+        self.debounce = debounce
+        self._lock = threading.Lock()
+        self._dirty: set[int] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def mark_dirty(self, product_ids: Iterable[int]):
+        with self._lock:
+            self._dirty.update(product_ids)
+        # Os pedidos rodam no threadpool das rotas síncronas
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _take_dirty(self) -> set[int]:
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return dirty
+
+    def refresh(self, product_ids: set[int]):
+        db = SessionLocal()
+        try:
+            RecommendationService.refresh_top_k(db, product_ids)
+        finally:
+            db.close()
+
+    async def run(self):
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        while True:
+            self._wakeup.clear()
+            dirty = self._take_dirty()
+            if dirty:
+                try:
+                    await asyncio.to_thread(self.refresh, dirty)
+                except Exception:
+                    logger.exception("Erro ao recalcular as recomendações")
+                    # Tenta de novo na próxima passada
+                    self.mark_dirty(dirty)
+
+            await self._wakeup.wait()
+            # Agrupa uma rajada de pedidos em um único recálculo
+            await asyncio.sleep(self.debounce)
+
+
+recommendation_refresher = RecommendationRefresher()
@@ -0,0 +1,101 @@
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.models.review_model import Review
+from app.models.user_model import User
+from app.repositories.product_repository import ProductRepository
+from app.repositories.review_repository import ReviewRepository, RATING_COLUMNS
+from app.schemas.review_schema import (
+    ReviewCreate,
+    ReviewUpdate,
+    ProductReviewResponse,
+    ProductReviewPageResponse,
+    RatingSummaryResponse,
+)
+from app.utils.pagination import encode_cursor, decode_cursor
+
+
+class ReviewService:
+    @staticmethod
+    def get_reviews(db: Session, user: User) -> list[Review]:
+        return ReviewRepository.get_reviews_by_user(db, user.id)
+
+    @staticmethod
+    def get_product_reviews(
+        db: Session, product_id: int, limit: int, cursor: Optional[str] = None
+    ) -> ProductReviewPageResponse:
+        after = decode_cursor(cursor)
+        if after and (
+            not isinstance(after.get("id"), int) or isinstance(after["id"], bool)
+        ):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        reviews = ReviewRepository.get_product_reviews_page(
+            db, product_id, limit + 1, after["id"] if after else None
+        )
+        next_cursor = None
+        if len(reviews) > limit:
+            reviews = reviews[:limit]
+            next_cursor = encode_cursor({"id": reviews[-1].id})
+
+        return ProductReviewPageResponse(
+            items=[
+                ProductReviewResponse.model_validate(review, from_attributes=True)
+                for review in reviews
+            ],
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def get_rating_summary(db: Session, product_id: int) -> RatingSummaryResponse:
+        summary = ReviewRepository.get_rating_summary(db, product_id)
+        if not summary or not summary.review_count:
+            return RatingSummaryResponse(
+                product_id=product_id,
+                review_count=0,
+                average_rating=None,
+                histogram={rating: 0 for rating in RATING_COLUMNS},
+            )
+        return RatingSummaryResponse(
+            product_id=product_id,
+            review_count=summary.review_count,
+            average_rating=round(summary.rating_sum / summary.review_count, 2),
+            histogram={
+                rating: getattr(summary, column) for rating, column in RATING_COLUMNS.items()
+            },
+        )
+
+    @staticmethod
+    def add_review(db: Session, user: User, data: ReviewCreate) -> Review:
+        if not ProductRepository.get_product_by_id(db, data.product_id):
+            raise HTTPException(status_code=404, detail="Product not found")
+        if ReviewRepository.get_review_by_user_and_product(db, user.id, data.product_id):
+            raise HTTPException(status_code=400, detail="Product already reviewed")
+
+        review = Review(**data.model_dump(), user_id=user.id)
+        try:
+            return ReviewRepository.create_review(db, review)
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=400, detail="Product already reviewed")
+
+    @staticmethod
+    def get_own_review(db: Session, user: User, review_id: int) -> Review:
+        review = ReviewRepository.get_review_by_id(db, review_id)
+        if not review or review.user_id != user.id:
+            raise HTTPException(status_code=404, detail="Review not found")
+        return review
+
+    @staticmethod
+    def update_review(db: Session, user: User, review_id: int, data: ReviewUpdate) -> Review:
+        review = ReviewService.get_own_review(db, user, review_id)
+        updates = data.model_dump(exclude_unset=True)
+        if updates.get("rating") is None:
+            updates.pop("rating", None)
+        return ReviewRepository.update_review(db, review, updates)
+
+    @staticmethod
+    def delete_review(db: Session, user: User, review_id: int):
+        review = ReviewService.get_own_review(db, user, review_id)
+        ReviewRepository.delete_review(db, review)
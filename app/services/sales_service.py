@@ -0,0 +1,25 @@
+from datetime import timedelta
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.models.order_model import get_brazil_datetime
+from app.repositories.sales_repository import SalesRepository
+
+
+class SalesService:
+    @staticmethod
+    def get_best_sellers(
+        db: Session,
+        days: int,
+        limit: int,
+        order_by: str = "units",
+        category_id: Optional[int] = None,
+        admin_id: Optional[int] = None,
+    ) -> list[dict]:
+        since = get_brazil_datetime().date() - timedelta(days=days - 1)
+        rows = SalesRepository.get_best_sellers(
+            db, since, limit, order_by, category_id, admin_id
+        )
+        return [
+            {"product_id": product_id, "name": name, "units": units, "revenue": revenue}
+            for product_id, name, units, revenue in rows
+        ]
@@ -0,0 +1,56 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Session
+from app.config import STOCK_RESERVATION_SWEEP_SECONDS
+from app.database import SessionLocal
+from app.repositories.stock_reservation_repository import StockReservationRepository
+
+logger = logging.getLogger(__name__)
+
+# Reservas vencidas apagadas por comando (e por commit)
+SWEEP_BATCH_SIZE = 1000
+
+
+class StockReservationSweeper:
+    """
+    Tarefa de fundo que apaga as reservas de estoque vencidas em lotes. As
+    consultas de estoque disponível já ignoram reservas vencidas; a varredura
+    só evita que a tabela (e o índice) cresça sem limite.
+    """
+
+    def __init__(
+        self,
+        interval: float = STOCK_RESERVATION_SWEEP_SECONDS,
+        batch_size: int = SWEEP_BATCH_SIZE,
+    ):
+        self.interval = interval
+        self.batch_size = batch_size
+
+    def sweep(self, db: Optional[Session] = None) -> int:
+        session = db or SessionLocal()
+        try:
+            now = datetime.utcnow()
+            total = 0
+            while True:
+                deleted = StockReservationRepository.delete_expired(session, now, self.batch_size)
+                total += deleted
+                if deleted < self.batch_size:
+                    return total
+        finally:
+            if db is None:
+                session.close()
+
+    async def run(self):
+        while True:
+            try:
+                released = await asyncio.to_thread(self.sweep)
+                if released:
+                    logger.info("%s reservas de estoque vencidas liberadas", released)
+            except Exception:
+                logger.exception("Erro ao liberar reservas de estoque vencidas")
+            await asyncio.sleep(self.interval)
+
+
+stock_reservation_sweeper = StockReservationSweeper()
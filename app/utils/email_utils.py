@@ -1,4 +1,5 @@
 import smtplib
+from contextlib import contextmanager
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import os
@@ -13,7 +14,8 @@ SMTP_USER = os.getenv("SMTP_USER")
 SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SMTP_FROM = os.getenv("SMTP_FROM", SMTP_USER)
 
-def send_purchase_email(to_email, order):
+def build_purchase_email(order) -> tuple[str, str]:
+    """Assunto e corpo HTML do e-mail de confirmação do pedido."""
     loja_nome = "GGTECH - Computadores e Periféricos"
     loja_email = SMTP_FROM
     loja_site = "https://ggtech.com.br"  # ou o domínio que planeja usar
@@ -130,20 +132,40 @@ def send_purchase_email(to_email, order):
     </html>
     """
 
-    # Monta e envia o e-mail
+    return subject, body
+
+
+@contextmanager
+def smtp_connection():
+    """Conexão SMTP autenticada, para enviar vários e-mails sem reconectar."""
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
+        server.ehlo()
+        server.starttls()
+        server.login(SMTP_USER, SMTP_PASSWORD)
+        yield server
+
+
+def send_email(to_email, subject, body, server=None):
+    """Envia um e-mail HTML; levanta exceção se falhar. `server` reaproveita uma conexão aberta."""
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
-    msg["From"] = loja_email
+    msg["From"] = SMTP_FROM
     msg["To"] = to_email
 
     msg.attach(MIMEText(body, "html"))
 
+    if server is not None:
+        server.sendmail(msg["From"], [msg["To"]], msg.as_string())
+        return
+    with smtp_connection() as server:
+        server.sendmail(msg["From"], [msg["To"]], msg.as_string())
+
+
+def send_purchase_email(to_email, order):
+    """Envio síncrono (abre conexão na hora). O checkout usa o EmailOutboxService."""
+    subject, body = build_purchase_email(order)
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.ehlo()
-            server.starttls()
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.sendmail(msg["From"], [msg["To"]], msg.as_string())
+        send_email(to_email, subject, body)
         print(f"[GGTECH] E-mail de confirmação enviado para {to_email}")
     except Exception as e:
         print(f"[GGTECH] Erro ao enviar e-mail: {e}")
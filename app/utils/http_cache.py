@@ -0,0 +1,40 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from fastapi import Request, Response
+
+
+def make_etag(*parts) -> str:
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    etag: str,
+    last_modified: Optional[datetime] = None,
+) -> Optional[Response]:
+    """
+    Define ETag/Last-Modified na resposta e, se o cliente já tiver a versão
+    atual (If-None-Match), retorna uma resposta 304 vazia.
+
+    O If-Modified-Since é ignorado: o Last-Modified tem resolução de segundos
+    e uma escrita no mesmo segundo da resposta anterior não o move. Como o
+    ETag muda a cada escrita, só ele decide o 304.
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None:
+        # Datas do banco são UTC sem fuso
+        last_modified = last_modified.replace(tzinfo=timezone.utc, microsecond=0)
+        headers["Last-Modified"] = format_datetime(last_modified, usegmt=True)
+    response.headers.update(headers)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        if "*" in tags or etag in tags:
+            return Response(status_code=304, headers=headers)
+
+    return None
@@ -0,0 +1,12 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session, model):
+    """
+    insert() do dialeto em uso, com suporte a on_conflict_do_nothing /
+    on_conflict_do_update (PostgreSQL em produção, SQLite nos testes).
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -0,0 +1,110 @@
+"""
+Compara o tempo de GET /products/ com 10 mil produtos nos dois modos de
+resposta: o padrão (objetos ORM validados por ProductResponse) e o rápido
+(FAST_JSON_RESPONSES: dicts montados de consultas por coluna + orjson).
+
+Uso: python -m benchmarks.product_list_serialization [--products 10000] [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+# O engine é criado na importação de app.database: o banco do benchmark
+# precisa estar definido antes.
+DB_PATH = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.controllers import product_controller  # noqa: E402
+from app.core.cache import catalog_cache  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.category_model import Category  # noqa: E402
+from app.models.discount_model import Discount  # noqa: E402
+from app.models.product_model import Product  # noqa: E402
+from app.models.user_model import User, UserRole  # noqa: E402
+from main import app  # noqa: E402
+
+
+def seed(total: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        admin = User(name="Admin", email="bench@example.com", password="x", role=UserRole.ADMIN)
+        db.add(admin)
+        db.commit()
+
+        categories = [Category(name=f"Categoria {i}", user_id=admin.id) for i in range(20)]
+        db.add_all(categories)
+        db.commit()
+
+        db.add_all(
+            Product(
+                name=f"Produto {i}",
+                description=f"Descrição do produto {i}",
+                price=Decimal(10 + i % 500) + Decimal("0.90"),
+                stock=i % 50,
+                category_id=categories[i % len(categories)].id,
+            )
+            for i in range(total)
+        )
+        db.commit()
+
+        # Um desconto a cada 10 produtos, para a lista aninhada não ficar vazia
+        now = datetime.utcnow()
+        db.add_all(
+            Discount(
+                description="Promoção",
+                discount_percentage=Decimal("10.00"),
+                start_date=now - timedelta(days=1),
+                end_date=now + timedelta(days=1),
+                product_id=product_id,
+            )
+            for product_id in range(1, total + 1, 10)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def measure(client: TestClient, fast: bool, runs: int) -> list[float]:
+    product_controller.FAST_JSON_RESPONSES = fast
+    timings = []
+    for _ in range(runs):
+        # Mede o caminho frio: sem o cache do catálogo
+        catalog_cache.clear()
+        start = time.perf_counter()
+        response = client.get("/products/")
+        timings.append(time.perf_counter() - start)
+        response.raise_for_status()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.products)
+    with TestClient(app) as client:
+        # Aquece imports e conexões antes de medir
+        measure(client, fast=False, runs=1)
+        default = measure(client, fast=False, runs=args.runs)
+        fast = measure(client, fast=True, runs=args.runs)
+
+    default_median = statistics.median(default)
+    fast_median = statistics.median(fast)
+    print(f"{args.products} produtos, mediana de {args.runs} execuções")
+    print(f"  padrão (ORM + ProductResponse): {default_median * 1000:8.1f} ms")
+    print(f"  rápido (colunas + orjson):      {fast_median * 1000:8.1f} ms")
+    print(f"  ganho: {default_median / fast_median:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
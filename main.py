@@ -1,13 +1,49 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
 from app.api_router import api_router
 from fastapi.openapi.utils import get_openapi
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from app.socketio import socketio_app
 import app.socketio.events
+from app.services.pricing_service import discount_window_scheduler
+from app.config import FAST_JSON_RESPONSES, CATALOG_SNAPSHOT_ENABLED, CATALOG_SNAPSHOT_DIR
+from app.services.catalog_snapshot_service import CatalogStaticFiles, catalog_snapshot_worker
+from app.services.cart_store_service import cart_store
+from app.services.stock_reservation_service import stock_reservation_sweeper
+from app.services.email_outbox_service import email_outbox_worker
+from app.services.recommendation_service import recommendation_refresher
 import os
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Tarefas de fundo que vivem junto com a aplicação
+    tasks = [
+        asyncio.create_task(discount_window_scheduler.run()),
+        asyncio.create_task(stock_reservation_sweeper.run()),
+        asyncio.create_task(email_outbox_worker.run()),
+        asyncio.create_task(recommendation_refresher.run()),
+    ]
+    if CATALOG_SNAPSHOT_ENABLED:
+        tasks.append(asyncio.create_task(catalog_snapshot_worker.run()))
+    if cart_store is not None:
+        tasks.append(asyncio.create_task(cart_store.run()))
+    yield
+    for task in tasks:
+        task.cancel()
+    if cart_store is not None:
+        # Grava os carrinhos que ainda estão só no store
+        await asyncio.to_thread(cart_store.flush_all)
+
+
+app = FastAPI(
+    lifespan=lifespan,
+    # orjson serializa bem mais rápido que o json da stdlib (opcional, via .env)
+    default_response_class=ORJSONResponse if FAST_JSON_RESPONSES else JSONResponse,
+)
 
 # Configuração do CORS
 FRONTEND_ORIGINS = os.getenv("FRONTEND_ORIGINS", "http://localhost:8001").split(",")
@@ -25,6 +61,9 @@ app.include_router(api_router)
 
 # Arquivos estáticos
 app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
+# Snapshot estático do catálogo (JSON pré-comprimido), gerado pelo catalog_snapshot_worker
+os.makedirs(CATALOG_SNAPSHOT_DIR, exist_ok=True)
+app.mount("/catalog", CatalogStaticFiles(directory=CATALOG_SNAPSHOT_DIR), name="catalog")
 app.mount("/socket", socketio_app)
 
 # Custom OpenAPI com Bearer Auth
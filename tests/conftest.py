@@ -1,7 +1,16 @@
+from decimal import Decimal
 import pytest
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.database import Base, get_db
+from app.core.cache import favorites_cache, invalidate_catalog
+from app.models.cart_item_model import CartItem
+from app.models.cart_model import Cart
+from app.models.category_model import Category
+from app.models.order_item_model import OrderItem
+from app.models.order_model import Order
+from app.models.product_model import Product
+from app.models.user_model import User, UserRole
 from fastapi.testclient import TestClient
 from main import app
 
@@ -42,3 +51,80 @@ def client():
 def setup_db():
     Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
+    invalidate_catalog()
+    favorites_cache.clear()
+
+
+# Fábricas de dados de teste, todas gravando na test_db_session
+
+
+@pytest.fixture
+def create_user(test_db_session: Session):
+    def create(email: str, role: UserRole = UserRole.CLIENT, with_cart: bool = False) -> User:
+        user = User(name="Cliente", email=email, password="x", role=role)
+        test_db_session.add(user)
+        test_db_session.commit()
+        if with_cart:
+            test_db_session.add(Cart(user_id=user.id))
+            test_db_session.commit()
+        return user
+
+    return create
+
+
+@pytest.fixture
+def create_catalog(test_db_session: Session, create_user):
+    """Admin, uma categoria dele e um produto (estoque 10) para cada preço."""
+
+    def create(prices) -> tuple[Category, list[Product]]:
+        admin = create_user("admin@example.com", role=UserRole.ADMIN)
+        category = Category(name="Periféricos", user_id=admin.id)
+        test_db_session.add(category)
+        test_db_session.commit()
+
+        products = [
+            Product(name=f"Produto {i}", price=Decimal(price), stock=10, category_id=category.id)
+            for i, price in enumerate(prices)
+        ]
+        test_db_session.add_all(products)
+        test_db_session.commit()
+        return category, products
+
+    return create
+
+
+@pytest.fixture
+def create_cart(test_db_session: Session):
+    """Carrinho do primeiro usuário cadastrado com `quantity` de cada produto."""
+
+    def create(products, quantity: int = 1) -> tuple[User, Cart]:
+        user = test_db_session.query(User).first()
+        cart = Cart(user_id=user.id)
+        test_db_session.add(cart)
+        test_db_session.flush()
+        test_db_session.add_all(
+            CartItem(cart_id=cart.id, product_id=product.id, quantity=quantity, unit_price=product.price)
+            for product in products
+        )
+        test_db_session.commit()
+        return user, cart
+
+    return create
+
+
+@pytest.fixture
+def create_order(test_db_session: Session):
+    """Pedido com uma unidade de cada produto, gravado direto (sem checkout)."""
+
+    def create(user_id: int, product_ids: list[int]) -> Order:
+        order = Order(user_id=user_id, address_id=1, total_amount=Decimal("10.00"))
+        test_db_session.add(order)
+        test_db_session.flush()
+        test_db_session.add_all(
+            OrderItem(order_id=order.id, product_id=product_id, quantity=1, unit_price=Decimal("10.00"))
+            for product_id in product_ids
+        )
+        test_db_session.commit()
+        return order
+
+    return create
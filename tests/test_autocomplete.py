@@ -0,0 +1,40 @@
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.models.product_model import Product
+from app.repositories.product_repository import ProductRepository
+from app.services.autocomplete_service import normalize, product_autocomplete
+
+
+def suggestions(client, q: str) -> list[str]:
+    response = client.get("/products/autocomplete", params={"q": q})
+    assert response.status_code == 200
+    return [item["name"] for item in response.json()]
+
+
+def test_normalize_strips_accents_and_case():
+    assert normalize("  Câmera   Ação HD ") == "camera acao hd"
+
+
+def test_autocomplete_matches_word_prefixes_and_follows_writes(client, setup_db, test_db_session: Session, create_catalog):
+    category, _ = create_catalog([])
+    names = ["Câmera Digital", "Cabo HDMI", "Suporte para câmera", "Teclado Mecânico"]
+    products = [
+        Product(name=name, price=Decimal("10.00"), stock=1, category_id=category.id)
+        for name in names
+    ]
+    test_db_session.add_all(products)
+    test_db_session.commit()
+
+    assert suggestions(client, "cam") == ["Câmera Digital", "Suporte para câmera"]
+    assert suggestions(client, "MECÂ") == ["Teclado Mecânico"]
+    assert suggestions(client, "ca") == ["Cabo HDMI", "Câmera Digital", "Suporte para câmera"]
+
+    ProductRepository.update_product(test_db_session, products[1].id, {"name": "Webcam Full HD"})
+    ProductRepository.delete_product(test_db_session, products[0].id)
+
+    assert suggestions(client, "ca") == ["Suporte para câmera"]
+    assert suggestions(client, "web") == ["Webcam Full HD"]
+
+    # Estoque e preço não tocam no índice
+    ProductRepository.update_stock(test_db_session, products[2].id, 5)
+    assert product_autocomplete._dirty == set()
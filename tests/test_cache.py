@@ -0,0 +1,77 @@
+from app.core.cache import TTLCache
+
+
+def test_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_cache_expires_entries():
+    cache = TTLCache(maxsize=10, ttl=-1)
+    cache.set("a", 1)
+
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_cache_counts_hits_and_misses():
+    cache = TTLCache(maxsize=10, ttl=60)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return "value"
+
+    assert cache.get_or_set("key", loader) == "value"
+    assert cache.get_or_set("key", loader) == "value"
+
+    stats = cache.stats()
+    assert len(loads) == 1
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_does_not_store_value_loaded_across_clear():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    def loader():
+        cache.clear()
+        return "stale"
+
+    assert cache.get_or_set("key", loader) == "stale"
+    assert cache.get("key") is None
+
+
+def test_cache_does_not_store_value_loaded_across_delete():
+    cache = TTLCache(maxsize=10, ttl=60)
+
+    def loader():
+        cache.delete("key")
+        return "stale"
+
+    assert cache.get_or_set("key", loader) == "stale"
+    assert cache.get("key") is None
+    # Carregamentos de outras chaves não são afetados
+    assert cache.get_or_set("other", lambda: "fresh") == "fresh"
+    assert cache.get("other") == "fresh"
+
+
+def test_cache_get_or_set_many_loads_only_missing_keys():
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    requested = []
+
+    def loader(keys):
+        requested.append(keys)
+        return {"b": 2}
+
+    assert cache.get_or_set_many(["a", "b", "c"], loader) == {"a": 1, "b": 2, "c": None}
+    assert cache.get_or_set_many(["b", "c"], loader) == {"b": 2, "c": None}
+    assert requested == [["b", "c"]]
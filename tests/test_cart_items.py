@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+from decimal import Decimal
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.cart_item_model import CartItem
+from app.schemas.cart_item_schema import CartItemCreate, CartItemBatch
+from app.services.cart_service import CartService
+
+
+@contextmanager
+def count_queries(db: Session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_get_cart_items_runs_a_single_query(setup_db, test_db_session: Session, create_catalog, create_cart):
+    _, products = create_catalog(["10.00"] * 30)
+    products[0].image_path = "/uploads/products/0.png"
+    products[0].effective_price = Decimal("8.00")
+    user, cart = create_cart(products, quantity=2)
+    test_db_session.expire_all()
+    test_db_session.refresh(user)
+
+    with count_queries(test_db_session) as statements:
+        response = CartService.get_cart_items(test_db_session, user)
+
+    assert len(statements) == 1
+    assert response.cart_id == cart.id
+    assert len(response.items) == 30
+    assert response.total_amount == 600
+    first = response.items[0]
+    assert (first.name, first.image_path, first.effective_price) == (
+        "Produto 0", "/uploads/products/0.png", 8.0
+    )
+
+
+def test_get_cart_items_with_empty_cart(setup_db, test_db_session: Session, create_catalog, create_cart):
+    create_catalog([])
+    user, cart = create_cart([])
+
+    response = CartService.get_cart_items(test_db_session, user)
+
+    assert (response.cart_id, response.items, response.total_amount) == (cart.id, [], 0)
+
+
+def test_add_item_merges_quantity_into_existing_row(setup_db, test_db_session: Session, create_catalog, create_cart):
+    _, products = create_catalog(["10.00"])
+    product = products[0]
+    user, cart = create_cart([])
+
+    CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=product.id, quantity=3, unit_price=1), user)
+    CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=product.id, quantity=4, unit_price=1), user)
+
+    items = test_db_session.query(CartItem).filter_by(cart_id=cart.id).all()
+    assert [(item.quantity, item.unit_price) for item in items] == [(7, Decimal("10.00"))]
+
+    # Estoque é 10: somar mais 4 passaria do limite e não altera o item
+    with pytest.raises(HTTPException) as error:
+        CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=product.id, quantity=4, unit_price=1), user)
+    assert error.value.status_code == 400
+    test_db_session.expire_all()
+    assert test_db_session.query(CartItem.quantity).scalar() == 7
+
+    with pytest.raises(HTTPException) as error:
+        CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=999, quantity=1, unit_price=1), user)
+    assert error.value.status_code == 404
+
+
+def test_apply_batch_in_one_commit(setup_db, test_db_session: Session, create_catalog, create_cart):
+    _, products = create_catalog(["10.00", "20.00", "30.00"])
+    a, b, c = (product.id for product in products)
+    user, cart = create_cart(products[:2], quantity=2)
+    test_db_session.refresh(user)
+
+    batch = CartItemBatch(operations=[
+        {"op": "add", "product_id": a, "quantity": 3},
+        {"op": "remove", "product_id": b},
+        {"op": "add", "product_id": c, "quantity": 1},
+        {"op": "update", "product_id": c, "quantity": 4},
+    ])
+    with count_queries(test_db_session) as statements:
+        response = CartService.apply_batch(test_db_session, batch, user)
+
+    # carrinho, itens, produtos, escrita (update/insert/delete) e a leitura final
+    assert sum(statement.startswith("SELECT") for statement in statements) == 4
+    assert [(item.product_id, item.quantity) for item in response.items] == [(a, 5), (c, 4)]
+    assert response.total_amount == 5 * 10 + 4 * 30
+
+    over_stock = CartItemBatch(operations=[
+        {"op": "remove", "product_id": a},
+        {"op": "add", "product_id": c, "quantity": 7},
+    ])
+    with pytest.raises(HTTPException) as error:
+        CartService.apply_batch(test_db_session, over_stock, user)
+    assert error.value.status_code == 400
+    test_db_session.rollback()
+    assert [(item.product_id, item.quantity) for item in CartService.get_cart_items(test_db_session, user).items] == [(a, 5), (c, 4)]
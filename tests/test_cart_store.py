@@ -0,0 +1,87 @@
+import pytest
+from sqlalchemy.orm import Session
+from app.core.kv_store import InMemoryKeyValueStore
+from app.models.cart_item_model import CartItem
+from app.schemas.cart_item_schema import CartItemCreate, CartItemUpdate, CartItemRemove
+from app.services.cart_service import CartService
+from app.services.cart_store_service import WriteBehindCartStore, DIRTY_CARTS
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = WriteBehindCartStore(InMemoryKeyValueStore())
+    monkeypatch.setattr(CartService, "store", store)
+    return store
+
+
+def db_items(db: Session) -> list[tuple[int, int]]:
+    db.expire_all()
+    return [(item.product_id, item.quantity) for item in db.query(CartItem).order_by(CartItem.product_id)]
+
+
+def test_cart_changes_stay_in_store_until_flush(setup_db, test_db_session: Session, store, create_catalog, create_cart):
+    _, products = create_catalog(["10.00", "20.00", "30.00"])
+    a, b, c = (product.id for product in products)
+    user, _ = create_cart(products[:1], quantity=1)
+    user_id = user.id
+
+    CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=a, quantity=2, unit_price=0), user)
+    CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=b, quantity=1, unit_price=0), user)
+    CartService.update_item_quantity(test_db_session, CartItemUpdate(product_id=b, quantity=5), user)
+    CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=c, quantity=1, unit_price=0), user)
+    CartService.remove_item_from_cart(test_db_session, CartItemRemove(product_id=c), user)
+
+    response = CartService.get_cart_items(test_db_session, user)
+    assert [(item.product_id, item.quantity) for item in response.items] == [(a, 3), (b, 5)]
+    assert response.total_amount == 3 * 10 + 5 * 20
+    # Nada foi gravado ainda
+    assert db_items(test_db_session) == [(a, 1)]
+    assert store.store.members(DIRTY_CARTS) == {str(user_id)}
+
+    assert store.flush_all(test_db_session) == 1
+    assert db_items(test_db_session) == [(a, 3), (b, 5)]
+    assert store.store.members(DIRTY_CARTS) == set()
+    # Após o flush o carrinho sai do store e volta a ser lido do banco
+    assert store.store.get(store.key(user_id)) is None
+    items = CartService.get_cart_items(test_db_session, user).items
+    assert all(item.id is not None for item in items)
+
+
+def test_clear_cart_flushes_immediately(setup_db, test_db_session: Session, store, create_catalog, create_cart):
+    _, products = create_catalog(["10.00"])
+    user, _ = create_cart(products, quantity=2)
+
+    CartService.add_item_to_cart(test_db_session, CartItemCreate(product_id=products[0].id, quantity=1, unit_price=0), user)
+    CartService.clear_cart(test_db_session, user)
+
+    assert db_items(test_db_session) == []
+    assert store.store.members(DIRTY_CARTS) == set()
+
+
+def test_concurrent_updates_are_not_lost(setup_db, test_db_session: Session, store, create_catalog, create_cart):
+    _, products = create_catalog(["10.00", "20.00"])
+    a, b = (product.id for product in products)
+    user, _ = create_cart(products[:1], quantity=1)
+    user_id = user.id
+
+    # Outra requisição grava o carrinho entre a leitura e a gravação desta
+    interleaved = []
+
+    def change(state: dict):
+        if not interleaved:
+            interleaved.append(True)
+            store.update(test_db_session, user_id, lambda other: other["items"][a].update(quantity=4))
+        state["items"][b] = {"id": None, "quantity": 1, "unit_price": products[1].price}
+
+    state = store.update(test_db_session, user_id, change)
+    assert {product_id: item["quantity"] for product_id, item in state["items"].items()} == {a: 4, b: 1}
+    assert store.load(test_db_session, user_id) == state
+
+
+def test_viewing_a_cart_does_not_keep_it_in_store(setup_db, test_db_session: Session, store, create_catalog, create_cart):
+    _, products = create_catalog(["10.00"])
+    user, _ = create_cart(products, quantity=1)
+
+    assert len(CartService.get_cart_items(test_db_session, user).items) == 1
+    assert store.store.get(store.key(user.id)) is None
+    assert store.store.members(DIRTY_CARTS) == set()
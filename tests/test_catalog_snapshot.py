@@ -0,0 +1,75 @@
+import json
+from decimal import Decimal
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.models.category_model import Category
+from app.schemas.product_schema import ProductCreate
+from app.services.catalog_snapshot_service import (
+    CatalogSnapshotService,
+    CatalogSnapshotWorker,
+    CatalogStaticFiles,
+)
+from app.services.product_service import ProductService
+
+
+def test_snapshot_regenerates_only_dirty_categories(setup_db, test_db_session: Session, tmp_path, create_catalog):
+    first, _ = create_catalog(["10.00", "20.00"])
+    second = Category(name="Monitores", user_id=first.user_id)
+    test_db_session.add(second)
+    test_db_session.commit()
+
+    v1 = CatalogSnapshotService.build(test_db_session, None, str(tmp_path))
+    shard = json.loads((tmp_path / v1["products"][str(first.id)]).read_bytes())
+    assert [product["price"] for product in shard] == ["10.00", "20.00"]
+    assert (tmp_path / (v1["categories"] + ".gz")).exists()
+
+    ProductService.create_product(
+        test_db_session,
+        ProductCreate(name="Monitor 27", price=Decimal("999.00"), stock=1, category_id=second.id),
+    )
+    v2 = CatalogSnapshotService.build(test_db_session, {second.id}, str(tmp_path))
+
+    assert v2["version"] == 2
+    assert v2["products"][str(first.id)] == v1["products"][str(first.id)]
+    assert v2["products"][str(second.id)] != v1["products"][str(second.id)]
+    # O shard da versão anterior continua disponível até a próxima geração
+    assert (tmp_path / v1["products"][str(second.id)]).exists()
+
+    CatalogSnapshotService.build(test_db_session, {second.id}, str(tmp_path))
+    assert not (tmp_path / v1["products"][str(second.id)]).exists()
+
+
+def test_snapshot_files_are_served_precompressed(setup_db, test_db_session: Session, tmp_path, create_catalog):
+    create_catalog(["10.00"])
+    manifest = CatalogSnapshotService.build(test_db_session, None, str(tmp_path))
+    app = FastAPI()
+    app.mount("/catalog", CatalogStaticFiles(directory=str(tmp_path)))
+    client = TestClient(app)
+
+    response = client.get(
+        f"/catalog/{manifest['categories']}", headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "application/json"
+    assert "immutable" in response.headers["cache-control"]
+    assert response.json()[0]["name"] == "Periféricos"
+
+    response = client.get("/catalog/manifest.json", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.json()["version"] == 1
+
+
+def test_snapshot_worker_merges_dirty_categories():
+    worker = CatalogSnapshotWorker()
+    assert worker._take_dirty() == (True, None)
+
+    worker.mark_dirty({1})
+    worker.mark_dirty({2})
+    assert worker._take_dirty() == (True, {1, 2})
+    assert worker._take_dirty() == (False, set())
+
+    worker.mark_dirty({1})
+    worker.mark_dirty(None)
+    assert worker._take_dirty() == (True, None)
@@ -0,0 +1,63 @@
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app.models.address_model import Address
+from app.models.cart_item_model import CartItem
+from app.models.email_outbox_model import EmailOutbox, EmailStatus
+from app.models.order_model import Order
+from app.models.product_model import Product
+from app.models.sales_model import ProductSalesDaily
+from app.schemas.order_schema import OrderCreate
+from app.services.order_service import OrderService
+
+
+def checkout_payload(address_id: int, quantities: dict[int, int]) -> OrderCreate:
+    return OrderCreate(
+        address_id=address_id,
+        items=[
+            {"product_id": product_id, "quantity": quantity, "unit_price": "10.00"}
+            for product_id, quantity in quantities.items()
+        ],
+        payment_method="pix",
+        total_amount="50.00",
+        shipping_cost="0.00",
+    )
+
+
+def stocks(db: Session) -> list[int]:
+    db.expire_all()
+    return [stock for (stock,) in db.query(Product.stock).order_by(Product.id)]
+
+
+def test_checkout_commits_once_and_aborts_when_oversold(setup_db, test_db_session: Session, create_catalog, create_cart):
+    _, products = create_catalog(["10.00", "10.00"])
+    a, b = (product.id for product in products)
+    user, _ = create_cart(products, quantity=1)
+    address = Address(
+        user_id=user.id, street="Rua A", number=1, zip="01000000",
+        bairro="Centro", city="São Paulo", state="SP", country="Brasil",
+    )
+    test_db_session.add(address)
+    test_db_session.commit()
+
+    with pytest.raises(HTTPException) as error:
+        OrderService.create_order(test_db_session, checkout_payload(address.id, {a: 2, b: 11}), user)
+    assert error.value.status_code == 400
+    assert stocks(test_db_session) == [10, 10]
+    assert test_db_session.query(Order).count() == 0
+    assert test_db_session.query(CartItem).count() == 2
+    assert test_db_session.query(EmailOutbox).count() == 0
+
+    commits = []
+    event.listen(test_db_session, "after_commit", lambda session: commits.append(session))
+    order = OrderService.create_order(test_db_session, checkout_payload(address.id, {a: 2, b: 3}), user)
+
+    assert len(commits) == 1
+    assert stocks(test_db_session) == [8, 7]
+    assert test_db_session.query(CartItem).count() == 0
+    sales = test_db_session.query(ProductSalesDaily).order_by(ProductSalesDaily.product_id)
+    assert [(row.product_id, row.units) for row in sales] == [(a, 2), (b, 3)]
+    # O e-mail não é enviado no checkout: fica na fila, gravado no mesmo commit
+    email = test_db_session.query(EmailOutbox).one()
+    assert (email.order_id, email.to_email, email.status) == (order.id, user.email, EmailStatus.PENDING)
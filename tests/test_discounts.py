@@ -0,0 +1,60 @@
+import asyncio
+from datetime import datetime, timedelta
+from decimal import Decimal
+from sqlalchemy.orm import Session
+from app.models.discount_model import Discount
+from app.repositories.discount_repository import DiscountRepository
+from app.services.pricing_service import DiscountWindowScheduler, PricingService
+
+
+def test_active_discounts_and_next_window_boundary(setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["100.00"])
+    now = datetime.utcnow()
+    windows = [
+        (now - timedelta(days=2), now - timedelta(days=1)),
+        (now - timedelta(hours=1), now + timedelta(hours=5)),
+        (now + timedelta(hours=2), now + timedelta(hours=3)),
+    ]
+    discounts = [
+        Discount(
+            description=f"Desconto {i}",
+            discount_percentage=Decimal("5.00"),
+            start_date=start,
+            end_date=end,
+            product_id=products[0].id,
+        )
+        for i, (start, end) in enumerate(windows)
+    ]
+    test_db_session.add_all(discounts)
+    test_db_session.commit()
+
+    active = DiscountRepository.get_active_discounts(test_db_session, products[0].id, now)
+    assert [discount.id for discount in active] == [discounts[1].id]
+    assert DiscountRepository.get_next_window_boundary(test_db_session, now) == windows[2][0]
+    assert DiscountRepository.get_next_window_boundary(test_db_session, now + timedelta(days=1)) is None
+
+
+def test_discount_scheduler_wakes_at_boundary_and_on_reschedule(monkeypatch):
+    passes = []
+
+    def refresh_window_changes(since, until):
+        passes.append(until)
+        # Só a primeira passada encontra uma fronteira, 0,2 s à frente
+        return datetime.utcnow() + timedelta(seconds=0.2) if len(passes) == 1 else None
+
+    monkeypatch.setattr(
+        PricingService, "refresh_window_changes", staticmethod(refresh_window_changes)
+    )
+
+    async def scenario():
+        scheduler = DiscountWindowScheduler(max_sleep=30)
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.6)
+        assert len(passes) == 2
+
+        scheduler.reschedule()
+        await asyncio.sleep(0.1)
+        assert len(passes) == 3
+        task.cancel()
+
+    asyncio.run(scenario())
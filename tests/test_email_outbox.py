@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from datetime import datetime
+import pytest
+from sqlalchemy.orm import Session
+from app.models.email_outbox_model import EmailOutbox, EmailStatus
+from app.services import email_outbox_service
+from app.services.email_outbox_service import EmailOutboxService
+from app.utils import email_utils
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    """SMTP falso: registra conexões e envios; `fail` lista destinatários que falham."""
+    state = {"connections": 0, "sent": [], "fail": set(), "down": False}
+
+    @contextmanager
+    def fake_connection():
+        if state["down"]:
+            raise ConnectionError("SMTP indisponível")
+        state["connections"] += 1
+        yield object()
+
+    def fake_send(to_email, subject, body, server=None):
+        if to_email in state["fail"]:
+            raise RuntimeError("recusado")
+        state["sent"].append((to_email, subject))
+
+    monkeypatch.setattr(email_utils, "smtp_connection", fake_connection)
+    monkeypatch.setattr(email_utils, "send_email", fake_send)
+    return state
+
+
+@pytest.fixture
+def enqueue(test_db_session: Session, create_user, create_catalog, create_order):
+    """Um pedido e um e-mail de confirmação na fila para cada endereço."""
+
+    def create(emails: list[str]) -> list[EmailOutbox]:
+        user = create_user("buyer@example.com")
+        _, products = create_catalog(["10.00"])
+        queued = [
+            EmailOutboxService.enqueue_purchase_email(
+                test_db_session, email, create_order(user.id, [products[0].id]).id
+            )
+            for email in emails
+        ]
+        test_db_session.commit()
+        return queued
+
+    return create
+
+
+def make_due(db: Session):
+    db.query(EmailOutbox).update({EmailOutbox.next_attempt_at: datetime.utcnow()})
+    db.commit()
+
+
+def test_process_due_sends_batch_over_one_connection(setup_db, test_db_session: Session, smtp, enqueue):
+    queued = enqueue(["a@example.com", "b@example.com"])
+
+    assert EmailOutboxService.process_due(test_db_session) == 2
+    assert smtp["connections"] == 1
+    assert [to_email for to_email, _ in smtp["sent"]] == ["a@example.com", "b@example.com"]
+    assert f"#{queued[0].order_id}" in smtp["sent"][0][1]
+    assert {email.status for email in queued} == {EmailStatus.SENT}
+
+    # Nada pendente: não abre conexão
+    assert EmailOutboxService.process_due(test_db_session) == 0
+    assert smtp["connections"] == 1
+
+
+def test_failures_retry_with_backoff_then_give_up(setup_db, test_db_session: Session, smtp, monkeypatch, enqueue):
+    monkeypatch.setattr(email_outbox_service, "EMAIL_OUTBOX_MAX_ATTEMPTS", 3)
+    smtp["fail"].add("bad@example.com")
+    ok, bad = enqueue(["ok@example.com", "bad@example.com"])
+
+    before = datetime.utcnow()
+    EmailOutboxService.process_due(test_db_session)
+    assert ok.status == EmailStatus.SENT
+    assert (bad.status, bad.attempts, bad.last_error) == (EmailStatus.PENDING, 1, "recusado")
+    assert bad.next_attempt_at >= before + EmailOutboxService.retry_delay(1)
+
+    # Ainda não venceu: não é reenviado
+    assert EmailOutboxService.process_due(test_db_session) == 0
+
+    make_due(test_db_session)
+    EmailOutboxService.process_due(test_db_session)
+    assert (bad.status, bad.attempts) == (EmailStatus.PENDING, 2)
+    make_due(test_db_session)
+    EmailOutboxService.process_due(test_db_session)
+    assert (bad.status, bad.attempts) == (EmailStatus.FAILED, 3)
+
+    make_due(test_db_session)
+    assert EmailOutboxService.process_due(test_db_session) == 0
+
+
+def test_connection_failure_requeues_batch(setup_db, test_db_session: Session, smtp, enqueue):
+    smtp["down"] = True
+    queued = enqueue(["a@example.com", "b@example.com"])
+
+    EmailOutboxService.process_due(test_db_session)
+    assert [(email.status, email.attempts) for email in queued] == [(EmailStatus.PENDING, 1)] * 2
+    assert smtp["sent"] == []
+
+    smtp["down"] = False
+    make_due(test_db_session)
+    assert EmailOutboxService.process_due(test_db_session) == 2
+    assert {email.status for email in queued} == {EmailStatus.SENT}
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    first = EmailOutboxService.retry_delay(1)
+    assert EmailOutboxService.retry_delay(2) == first * 2
+    assert EmailOutboxService.retry_delay(3) == first * 4
+    assert EmailOutboxService.retry_delay(50) == email_outbox_service.MAX_RETRY_DELAY
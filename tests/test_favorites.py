@@ -0,0 +1,24 @@
+from sqlalchemy.orm import Session
+from app.models.favorite_model import Favorite
+from app.schemas.favorite_schema import FavoriteCreate
+from app.services.favorite_service import FavoriteService
+
+
+def test_add_favorite_is_idempotent_and_refreshes_id_set(setup_db, test_db_session: Session, create_catalog, create_user):
+    _, products = create_catalog(["10.00", "20.00", "30.00"])
+    a, b, c = (product.id for product in products)
+    user = create_user("cliente@example.com")
+
+    assert FavoriteService.get_favorite_ids(test_db_session, user) == frozenset()
+
+    first = FavoriteService.add_favorite(test_db_session, user, FavoriteCreate(product_id=a))
+    again = FavoriteService.add_favorite(test_db_session, user, FavoriteCreate(product_id=a))
+    FavoriteService.add_favorite(test_db_session, user, FavoriteCreate(product_id=c))
+
+    assert again.id == first.id
+    assert again.product.id == a
+    assert test_db_session.query(Favorite).count() == 2
+    assert FavoriteService.filter_favorited(test_db_session, user, [c, b, a]) == [c, a]
+
+    FavoriteService.remove_favorite(test_db_session, user, first.id)
+    assert FavoriteService.get_favorite_ids(test_db_session, user) == frozenset({c})
@@ -0,0 +1,363 @@
+import io
+import json
+from datetime import datetime, timedelta
+from decimal import Decimal
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session
+from app.models.category_model import Category
+from app.models.product_model import Product
+from app.repositories.product_repository import ProductRepository
+from app.schemas.discount_schema import DiscountCreate
+from app.schemas.product_schema import ProductBulkStockUpdate, ProductCreate
+from app.services.discount_service import DiscountService
+from app.services.product_import_service import ProductImportService
+from app.services.product_service import ProductService
+from app.utils.pagination import encode_cursor
+
+
+def test_get_products_without_limit_returns_full_list(client, setup_db, test_db_session: Session, create_catalog):
+    create_catalog(["10.00", "20.00", "30.00"])
+
+    response = client.get("/products/")
+
+    assert response.status_code == 200
+    assert len(response.json()) == 3
+
+
+def test_get_products_keyset_pagination_by_id(client, setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["50.00", "10.00", "30.00", "20.00", "40.00"])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get("/products/", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == sorted(p.id for p in products)
+
+
+def test_get_products_keyset_pagination_by_price(client, setup_db, test_db_session: Session, create_catalog):
+    create_catalog(["50.00", "10.00", "30.00", "10.00", "40.00"])
+
+    first = client.get("/products/", params={"limit": 3, "sort": "price"}).json()
+    second = client.get(
+        "/products/", params={"limit": 3, "sort": "price", "cursor": first["next_cursor"]}
+    ).json()
+
+    prices = [Decimal(item["price"]) for item in first["items"] + second["items"]]
+    assert prices == sorted(prices)
+    assert len(prices) == 5
+    assert second["next_cursor"] is None
+
+
+def test_get_products_rejects_cursor_from_other_sort(client, setup_db, test_db_session: Session, create_catalog):
+    create_catalog(["10.00", "20.00", "30.00"])
+
+    page = client.get("/products/", params={"limit": 1}).json()
+    response = client.get(
+        "/products/", params={"limit": 1, "sort": "price", "cursor": page["next_cursor"]}
+    )
+
+    assert response.status_code == 400
+
+
+def test_get_products_rejects_malformed_cursor(client, setup_db, test_db_session: Session, create_catalog):
+    create_catalog(["10.00", "20.00", "30.00"])
+
+    for sort, position in [
+        ("price", {"sort": "price", "id": 1, "price": "abc"}),
+        ("price", {"sort": "price", "id": 1, "price": "NaN"}),
+        ("price", {"sort": "price", "id": 1, "price": 10}),
+        ("price", {"sort": "price", "id": "1", "price": "10.00"}),
+        ("id", {"sort": "id", "id": "x"}),
+    ]:
+        response = client.get(
+            "/products/", params={"limit": 1, "sort": sort, "cursor": encode_cursor(position)}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_product_dicts_match_product_response_json(setup_db, test_db_session: Session, create_catalog):
+    category, products = create_catalog(["200.00", "35.90"])
+    now = datetime.utcnow()
+    DiscountService.create_discount(
+        test_db_session,
+        DiscountCreate(
+            description="Black Friday",
+            discount_percentage=Decimal("10.00"),
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+            product_id=products[0].id,
+        ),
+    )
+
+    expected = [
+        product.model_dump(mode="json")
+        for product in ProductService.get_all_products(test_db_session)
+    ]
+    fast = ProductService.get_product_dicts(test_db_session)
+
+    assert json.loads(ORJSONResponse(fast).body) == expected
+    assert json.loads(
+        ORJSONResponse(ProductService.get_product_dicts(test_db_session, category.id)).body
+    ) == expected
+
+
+def test_search_products_by_prefix_and_filters(client, setup_db, test_db_session: Session, create_catalog):
+    category, products = create_catalog(["150.00", "90.00", "300.00"])
+    products[0].name = "Teclado Mecânico RGB"
+    products[1].name = "Mouse Gamer"
+    products[2].name = "Monitor Gamer 144Hz"
+    products[2].description = "Painel IPS para jogos"
+    test_db_session.commit()
+
+    response = client.get("/products/search", params={"q": "gam"})
+    assert response.status_code == 200
+    assert {item["name"] for item in response.json()} == {"Mouse Gamer", "Monitor Gamer 144Hz"}
+
+    response = client.get("/products/search", params={"q": "gamer", "max_price": "100"})
+    assert [item["name"] for item in response.json()] == ["Mouse Gamer"]
+
+    response = client.get("/products/search", params={"q": "mecanico"})
+    assert [item["name"] for item in response.json()] == ["Teclado Mecânico RGB"]
+
+    response = client.get("/products/search", params={"q": "jogos"})
+    assert [item["name"] for item in response.json()] == ["Monitor Gamer 144Hz"]
+
+
+def test_effective_price_follows_active_discounts(client, setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["200.00"])
+    product = products[0]
+    now = datetime.utcnow()
+
+    assert client.get(f"/products/{product.id}").json()["effective_price"] == "200.00"
+
+    active = DiscountService.create_discount(
+        test_db_session,
+        DiscountCreate(
+            description="Black Friday",
+            discount_percentage=Decimal("25.00"),
+            start_date=now - timedelta(days=1),
+            end_date=now + timedelta(days=1),
+            product_id=product.id,
+        ),
+    )
+    DiscountService.create_discount(
+        test_db_session,
+        DiscountCreate(
+            description="Encerrado",
+            discount_percentage=Decimal("50.00"),
+            start_date=now - timedelta(days=10),
+            end_date=now - timedelta(days=5),
+            product_id=product.id,
+        ),
+    )
+
+    body = client.get(f"/products/{product.id}").json()
+    assert body["price"] == "200.00"
+    assert body["effective_price"] == "150.00"
+    assert [discount["id"] for discount in body["discounts"]] == [active.id]
+
+    DiscountService.delete_discount(test_db_session, active.id)
+    assert client.get(f"/products/{product.id}").json()["effective_price"] == "200.00"
+
+
+def test_get_products_conditional_get(client, setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["10.00", "20.00"])
+
+    first = client.get("/products/")
+    etag = first.headers["etag"]
+    assert first.headers["last-modified"]
+
+    cached = client.get("/products/", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+
+    ProductRepository.update_product(test_db_session, products[0].id, {"name": "Novo nome"})
+
+    changed = client.get("/products/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_get_products_if_modified_since_never_hides_writes(client, setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["10.00", "20.00"])
+
+    since = client.get("/products/").headers["last-modified"]
+    ProductRepository.update_product(test_db_session, products[0].id, {"name": "Novo nome"})
+
+    # Mesmo segundo da resposta anterior: o Last-Modified não muda, o ETag sim
+    renamed = client.get("/products/", headers={"If-Modified-Since": since})
+    assert renamed.status_code == 200
+    assert renamed.json()[0]["name"] == "Novo nome"
+
+    # Excluir o produto mais antigo não move max(updated_at)
+    since = renamed.headers["last-modified"]
+    ProductRepository.delete_product(test_db_session, products[1].id)
+
+    deleted = client.get("/products/", headers={"If-Modified-Since": since})
+    assert deleted.status_code == 200
+    assert [product["id"] for product in deleted.json()] == [products[0].id]
+
+
+def test_get_categories_conditional_get(client, setup_db, test_db_session: Session, create_catalog):
+    create_catalog(["10.00"])
+
+    etag = client.get("/categories/").headers["etag"]
+
+    assert client.get("/categories/", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_get_products_filters_and_facets(client, setup_db, test_db_session: Session, create_catalog):
+    category, products = create_catalog(["50.00", "150.00", "300.00", "800.00"])
+    other = Category(name="Monitores", user_id=category.user_id)
+    test_db_session.add(other)
+    test_db_session.commit()
+    products[3].category_id = other.id
+    products[2].stock = 0
+    products[1].effective_price = Decimal("120.00")
+    test_db_session.commit()
+
+    body = client.get(
+        "/products/",
+        params={"category_id": category.id, "in_stock": True, "sort": "price_desc", "facets": True},
+    ).json()
+
+    assert [Decimal(item["price"]) for item in body["items"]] == [Decimal("150.00"), Decimal("50.00")]
+    # A faceta de categoria ignora o filtro de categoria, mas respeita o de estoque
+    assert {facet["name"]: facet["count"] for facet in body["facets"]["categories"]} == {
+        "Periféricos": 2,
+        "Monitores": 1,
+    }
+    ranges = {Decimal(facet["min_price"]): facet["count"] for facet in body["facets"]["price_ranges"]}
+    assert ranges[Decimal("0")] == 1
+    assert ranges[Decimal("100")] == 1
+    assert ranges[Decimal("250")] == 0
+
+    on_sale = client.get("/products/", params={"on_sale": True}).json()
+    assert [item["id"] for item in on_sale["items"]] == [products[1].id]
+
+
+def test_get_products_newest_first(client, setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["10.00", "20.00", "30.00"])
+
+    first = client.get("/products/", params={"sort": "newest", "limit": 2}).json()
+    second = client.get(
+        "/products/", params={"sort": "newest", "limit": 2, "cursor": first["next_cursor"]}
+    ).json()
+
+    ids = [item["id"] for item in first["items"] + second["items"]]
+    assert ids == sorted((p.id for p in products), reverse=True)
+
+
+def test_import_products_reports_invalid_rows(setup_db, test_db_session: Session, create_catalog):
+    category, _ = create_catalog([])
+    csv_file = io.BytesIO(
+        (
+            "name,price,stock,category_id,description\n"
+            f"Headset,199.90,5,{category.id},Som surround\n"
+            f"Webcam,abc,5,{category.id},\n"
+            "Cadeira,899.00,2,999,\n"
+            f"Mousepad,49.90,30,{category.id},\n"
+        ).encode()
+    )
+
+    report = ProductImportService.import_products(test_db_session, csv_file, "csv")
+
+    assert report["inserted"] == 2
+    assert report["failed"] == 2
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+    imported = test_db_session.query(Product).order_by(Product.id).all()
+    assert [p.name for p in imported] == ["Headset", "Mousepad"]
+    assert imported[0].effective_price == Decimal("199.90")
+
+
+def test_import_products_from_ndjson(setup_db, test_db_session: Session, create_catalog):
+    category, _ = create_catalog([])
+    ndjson_file = io.BytesIO(
+        (
+            json.dumps({"name": "SSD 1TB", "price": "399.00", "stock": 8, "category_id": category.id})
+            + "\n{quebrado\n"
+        ).encode()
+    )
+
+    report = ProductImportService.import_products(test_db_session, ndjson_file, "ndjson")
+
+    assert report["inserted"] == 1
+    assert report["errors"][0]["line"] == 2
+
+
+def test_import_products_reports_unreadable_files(setup_db, test_db_session: Session, create_catalog):
+    category, _ = create_catalog([])
+    # Exportação do Excel em Windows-1252
+    latin1_file = io.BytesIO(f"name,price,stock,category_id\nCâmera,10.00,1,{category.id}\n".encode("cp1252"))
+    report = ProductImportService.import_products(test_db_session, latin1_file, "csv")
+    assert report["inserted"] == 0
+    assert "UTF-8" in report["errors"][0]["error"]
+
+    # Aspas sem fechamento engolem o resto do arquivo num único campo
+    broken_csv = io.BytesIO(b"name,price,stock,category_id\n\"Mouse,10.00,1,1\n" + b"x" * 200_000)
+    report = ProductImportService.import_products(test_db_session, broken_csv, "csv")
+    assert report["errors"][0]["error"].startswith("CSV inválido")
+
+
+def test_bulk_update_stock_reports_missing_ids(setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["10.00", "20.00"])
+
+    result = ProductService.bulk_update_stock(
+        test_db_session,
+        ProductBulkStockUpdate(stocks={products[0].id: 3, products[1].id: 0, 9999: 7}),
+    )
+
+    assert result == {"updated": sorted(p.id for p in products), "missing": [9999]}
+    test_db_session.expire_all()
+    assert [p.stock for p in test_db_session.query(Product).order_by(Product.id)] == [3, 0]
+
+
+def test_category_product_count_follows_product_writes(client, setup_db, test_db_session: Session, create_catalog):
+    source, _ = create_catalog([])
+    target = Category(name="Monitores", user_id=source.user_id)
+    test_db_session.add(target)
+    test_db_session.commit()
+
+    first = ProductService.create_product(
+        test_db_session,
+        ProductCreate(name="Teclado", price=Decimal("150.00"), stock=3, category_id=source.id),
+    )
+    ProductService.create_product(
+        test_db_session,
+        ProductCreate(name="Mouse", price=Decimal("90.00"), stock=3, category_id=source.id),
+    )
+    ProductImportService.import_products(
+        test_db_session,
+        io.BytesIO(f"name,price,stock,category_id\nMonitor,999.00,1,{target.id}\n".encode()),
+        "csv",
+    )
+    ProductRepository.update_product(test_db_session, first.id, {"category_id": target.id})
+
+    counts = {c["id"]: c["product_count"] for c in client.get("/categories/").json()}
+    assert counts == {source.id: 1, target.id: 2}
+
+    ProductRepository.delete_product(test_db_session, first.id)
+    counts = {c["id"]: c["product_count"] for c in client.get("/categories/").json()}
+    assert counts == {source.id: 1, target.id: 1}
+
+
+def test_get_products_batch_keeps_request_order(client, setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["10.00", "20.00", "30.00"])
+    ids = [products[2].id, 9999, products[0].id, products[2].id]
+
+    response = client.get("/products/batch", params={"ids": ",".join(map(str, ids))})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["id"] for item in body["items"]] == [products[2].id, products[0].id]
+    assert body["missing"] == [9999]
+    assert client.get("/products/batch", params={"ids": "1,abc"}).status_code == 400
@@ -0,0 +1,52 @@
+import numpy as np
+from sqlalchemy.orm import Session
+from app.models.recommendation_model import ProductRecommendation
+from app.services.recommendation_service import RecommendationService
+
+
+def top_k_rows(db: Session) -> list[tuple]:
+    return [
+        (row.product_id, row.rank, row.recommended_product_id, row.score)
+        for row in db.query(ProductRecommendation).order_by(
+            ProductRecommendation.product_id, ProductRecommendation.rank
+        )
+    ]
+
+
+def test_count_pairs_and_top_k():
+    order_ids = np.array([1, 1, 1, 2, 2], dtype=np.int64)
+    product_ids = np.array([10, 20, 30, 10, 30], dtype=np.int64)
+
+    keys, counts = RecommendationService.count_pairs(order_ids, product_ids)
+    products, ranks, others, scores = RecommendationService.top_k(keys, counts, k=1)
+
+    assert dict(zip(keys.tolist(), counts.tolist()))[(10 << 31) | 30] == 2
+    assert list(zip(products.tolist(), others.tolist(), scores.tolist())) == [
+        (10, 30, 2), (20, 10, 1), (30, 10, 2)
+    ]
+    assert ranks.tolist() == [0, 0, 0]
+
+
+def test_incremental_updates_match_full_rebuild(client, setup_db, test_db_session: Session, create_catalog, create_order):
+    category, products = create_catalog(["10.00", "20.00", "30.00", "40.00"])
+    a, b, c, d = (product.id for product in products)
+    baskets = [[a, b], [a, b, c], [a, c], [b, d]]
+
+    for basket in baskets:
+        create_order(category.user_id, basket)
+        RecommendationService.record_order(test_db_session, basket)
+        test_db_session.commit()
+        RecommendationService.refresh_top_k(test_db_session, basket)
+    incremental = top_k_rows(test_db_session)
+
+    RecommendationService.rebuild(test_db_session)
+    assert top_k_rows(test_db_session) == incremental
+
+    response = client.get(f"/products/{a}/recommendations")
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == [b, c]
+    assert client.get("/products/9999/recommendations").status_code == 404
+
+    # Recalcular com um K menor descarta as posições que sobraram
+    RecommendationService.refresh_top_k(test_db_session, [a], k=1)
+    assert [row for row in top_k_rows(test_db_session) if row[0] == a] == [(a, 0, b, 2)]
@@ -0,0 +1,72 @@
+from sqlalchemy.orm import Session
+from app.schemas.review_schema import ReviewCreate, ReviewUpdate
+from app.services.review_service import ReviewService
+from app.utils.pagination import encode_cursor
+
+
+def test_rating_summary_follows_add_update_and_delete(client, setup_db, test_db_session: Session, create_catalog, create_user):
+    _, products = create_catalog(["10.00"])
+    product_id = products[0].id
+    alice = create_user("alice@example.com")
+    bob = create_user("bob@example.com")
+
+    ReviewService.add_review(test_db_session, alice, ReviewCreate(product_id=product_id, rating=5))
+    bob_review = ReviewService.add_review(
+        test_db_session, bob, ReviewCreate(product_id=product_id, rating=2)
+    )
+    summary = ReviewService.get_rating_summary(test_db_session, product_id)
+    assert (summary.review_count, summary.average_rating) == (2, 3.5)
+    assert summary.histogram == {1: 0, 2: 1, 3: 0, 4: 0, 5: 1}
+
+    ReviewService.update_review(test_db_session, bob, bob_review.id, ReviewUpdate(rating=4))
+    summary = ReviewService.get_rating_summary(test_db_session, product_id)
+    assert (summary.review_count, summary.average_rating) == (2, 4.5)
+    assert summary.histogram == {1: 0, 2: 0, 3: 0, 4: 1, 5: 1}
+
+    ReviewService.delete_review(test_db_session, bob, bob_review.id)
+    response = client.get(f"/reviews/product/{product_id}/summary")
+    assert response.status_code == 200
+    assert response.json() == {
+        "product_id": product_id,
+        "review_count": 1,
+        "average_rating": 5.0,
+        "histogram": {"1": 0, "2": 0, "3": 0, "4": 0, "5": 1},
+    }
+
+
+def test_product_reviews_keyset_pagination(client, setup_db, test_db_session: Session, create_catalog, create_user):
+    _, products = create_catalog(["10.00", "20.00"])
+    product_id = products[0].id
+    review_ids = []
+    for i in range(5):
+        user = create_user(f"cliente{i}@example.com")
+        review = ReviewService.add_review(
+            test_db_session, user, ReviewCreate(product_id=product_id, rating=i + 1)
+        )
+        review_ids.append(review.id)
+    ReviewService.add_review(test_db_session, user, ReviewCreate(product_id=products[1].id, rating=3))
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        page = client.get(f"/reviews/product/{product_id}", params=params).json()
+        seen.extend(item["id"] for item in page["items"])
+        cursor = page["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == sorted(review_ids, reverse=True)
+
+
+def test_product_reviews_rejects_malformed_cursor(client, setup_db, test_db_session: Session, create_catalog):
+    _, products = create_catalog(["10.00"])
+
+    for position in [{"id": True}, {"id": "1"}, {"id": 1.5}]:
+        response = client.get(
+            f"/reviews/product/{products[0].id}", params={"cursor": encode_cursor(position)}
+        )
+        assert response.status_code == 400
+        assert response.json()["detail"] == "Invalid cursor"
@@ -0,0 +1,63 @@
+from decimal import Decimal
+import pytest
+from sqlalchemy.orm import Session
+from app.models.category_model import Category
+from app.models.order_model import OrderStatus
+from app.models.sales_model import ProductSalesDaily
+from app.repositories.order_repository import OrderRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.sales_repository import SalesRepository
+from app.services.sales_service import SalesService
+
+
+@pytest.fixture
+def create_sold_order(test_db_session: Session, create_order):
+    """create_order mais o registro das vendas, como faz o checkout."""
+
+    def create(user_id: int, product_ids: list[int]):
+        order = create_order(user_id, product_ids)
+        SalesRepository.add_order_sales(test_db_session, order, order.order_items)
+        test_db_session.commit()
+        return order
+
+    return create
+
+
+def test_sales_rollup_follows_orders_and_status(client, setup_db, test_db_session: Session, create_catalog, create_sold_order):
+    category, products = create_catalog(["10.00", "20.00", "30.00"])
+    a, b, c = (product.id for product in products)
+
+    create_sold_order(category.user_id, [a, b])
+    create_sold_order(category.user_id, [a])
+    cancelled = create_sold_order(category.user_id, [c, c, c])
+
+    ranking = client.get(f"/products/best-sellers/category/{category.id}").json()
+    assert [(row["product_id"], row["units"]) for row in ranking] == [(c, 3), (a, 2), (b, 1)]
+
+    OrderRepository.update_order_status(test_db_session, cancelled.id, OrderStatus.CANCELLED)
+    ranking = client.get(
+        f"/products/best-sellers/category/{category.id}", params={"order_by": "revenue"}
+    ).json()
+    assert [(row["product_id"], row["revenue"]) for row in ranking] == [(a, "20.00"), (b, "10.00")]
+
+    # Reativar o pedido volta a contar as vendas
+    OrderRepository.update_order_status(test_db_session, cancelled.id, OrderStatus.PAID)
+    rows = SalesService.get_best_sellers(test_db_session, 30, 10, admin_id=category.user_id)
+    assert rows[0]["product_id"] == c
+
+
+def test_sales_rollup_follows_category_move(setup_db, test_db_session: Session, create_catalog, create_sold_order):
+    category, products = create_catalog(["10.00"])
+    target = Category(name="Monitores", user_id=category.user_id)
+    test_db_session.add(target)
+    test_db_session.commit()
+    create_sold_order(category.user_id, [products[0].id])
+
+    ProductRepository.update_product(test_db_session, products[0].id, {"category_id": target.id})
+
+    assert SalesService.get_best_sellers(test_db_session, 30, 10, category_id=category.id) == []
+    assert [
+        row["product_id"]
+        for row in SalesService.get_best_sellers(test_db_session, 30, 10, category_id=target.id)
+    ] == [products[0].id]
+    assert test_db_session.query(ProductSalesDaily).one().revenue == Decimal("10.00")
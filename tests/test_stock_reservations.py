@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from app.models.stock_reservation_model import StockReservation
+from app.repositories.product_repository import ProductRepository
+from app.schemas.cart_item_schema import CartItemCreate, CartItemRemove, CartItemUpdate
+from app.services.cart_service import CartService
+from app.services.stock_reservation_service import StockReservationSweeper
+
+
+def add(db: Session, user, product_id: int, quantity: int):
+    CartService.add_item_to_cart(db, CartItemCreate(product_id=product_id, quantity=quantity, unit_price=0), user)
+
+
+def test_reservations_limit_available_stock_until_they_expire(setup_db, test_db_session: Session, create_catalog, create_user):
+    _, products = create_catalog(["10.00"])
+    product_id = products[0].id
+    alice = create_user("alice@example.com", with_cart=True)
+    bob = create_user("bob@example.com", with_cart=True)
+
+    add(test_db_session, alice, product_id, 7)
+    assert ProductRepository.get_stock_rows(test_db_session, [product_id])[product_id][0] == 3
+
+    with pytest.raises(HTTPException) as error:
+        add(test_db_session, bob, product_id, 4)
+    assert error.value.status_code == 400
+    add(test_db_session, bob, product_id, 3)
+
+    # A reserva de alice vence: o estoque volta a ficar disponível para bob
+    test_db_session.query(StockReservation).filter(
+        StockReservation.quantity == 7
+    ).update({"expires_at": datetime.utcnow() - timedelta(minutes=1)})
+    test_db_session.commit()
+    add(test_db_session, bob, product_id, 4)
+
+    assert StockReservationSweeper(batch_size=1).sweep(test_db_session) == 1
+    assert [row.quantity for row in test_db_session.query(StockReservation)] == [7]
+
+
+def test_removing_item_releases_reservation(setup_db, test_db_session: Session, create_catalog, create_user):
+    _, products = create_catalog(["10.00"])
+    product_id = products[0].id
+    alice = create_user("alice@example.com", with_cart=True)
+
+    add(test_db_session, alice, product_id, 10)
+    CartService.remove_item_from_cart(test_db_session, CartItemRemove(product_id=product_id), alice)
+
+    assert test_db_session.query(StockReservation).count() == 0
+
+
+def test_update_quantity_checks_available_stock(setup_db, test_db_session: Session, create_catalog, create_user):
+    _, products = create_catalog(["10.00"])
+    product_id = products[0].id
+    alice = create_user("alice@example.com", with_cart=True)
+    bob = create_user("bob@example.com", with_cart=True)
+    add(test_db_session, alice, product_id, 2)
+    add(test_db_session, bob, product_id, 3)
+
+    with pytest.raises(HTTPException) as error:
+        CartService.update_item_quantity(test_db_session, CartItemUpdate(product_id=product_id, quantity=500), alice)
+    assert error.value.status_code == 400
+
+    # A reserva do próprio carrinho não conta contra ele
+    CartService.update_item_quantity(test_db_session, CartItemUpdate(product_id=product_id, quantity=7), alice)
+    assert sorted(row.quantity for row in test_db_session.query(StockReservation)) == [3, 7]